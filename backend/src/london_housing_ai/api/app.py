@@ -1,20 +1,24 @@
 from __future__ import annotations
 
+import asyncio
 import os
-from typing import List
+from contextlib import asynccontextmanager, suppress
+from typing import AsyncIterator, List
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from london_housing_ai.api.routers.health import router as health_router
+from london_housing_ai.api.routers.jobs import router as jobs_router
+from london_housing_ai.api.routers.metrics import router as metrics_router
 from london_housing_ai.api.routers.mlflow import router as mlflow_router
 from london_housing_ai.api.routers.predict import router as predict_router
-from london_housing_ai.api.services import mlflow_service
-from london_housing_ai.api.services.model_cache import get_or_load_model
-from london_housing_ai.api.services.transformer_cache import warmup_transformer
-from london_housing_ai.utils.logger import get_logger
-
-logger = get_logger()
+from london_housing_ai.api.services import (
+    drift_monitor,
+    jobs,
+    prediction_log,
+    warmup,
+)
 
 
 def _parse_csv_env(name: str, default: List[str]) -> List[str]:
@@ -34,6 +38,10 @@ def _add_cors(app: FastAPI) -> None:
     allow_methods = _parse_csv_env("CORS_ALLOW_METHODS", ["*"])
     allow_headers = _parse_csv_env("CORS_ALLOW_HEADERS", ["*"])
     allow_credentials = os.getenv("CORS_ALLOW_CREDENTIALS", "true").lower() == "true"
+    # Let browser clients read caching/pagination/timing response headers.
+    expose_headers = _parse_csv_env(
+        "CORS_EXPOSE_HEADERS", ["ETag", "X-Next-Cursor", "Server-Timing"]
+    )
 
     app.add_middleware(
         CORSMiddleware,
@@ -42,27 +50,41 @@ def _add_cors(app: FastAPI) -> None:
         allow_credentials=allow_credentials,
         allow_methods=allow_methods,
         allow_headers=allow_headers,
+        expose_headers=expose_headers,
     )
 
 
+@asynccontextmanager
+async def _lifespan(app: FastAPI) -> AsyncIterator[None]:
+    # Warm up in the background so uvicorn accepts connections (and answers
+    # /livez) immediately; /readyz and /predict report "warming" until done.
+    tasks = [
+        asyncio.create_task(warmup.run_warmup()),
+        asyncio.create_task(drift_monitor.run_drift_monitor()),
+    ]
+    try:
+        yield
+    finally:
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            with suppress(asyncio.CancelledError):
+                await task
+        await jobs.shutdown()
+        # Write out buffered prediction records before the worker exits.
+        await asyncio.to_thread(prediction_log.close)
+
+
 def create_app() -> FastAPI:
     title = os.getenv("API_TITLE", "London Housing Price Predictor")
-    app = FastAPI(title=title)
+    app = FastAPI(title=title, lifespan=_lifespan)
 
     _add_cors(app)
 
     app.include_router(health_router)
     app.include_router(predict_router)
     app.include_router(mlflow_router)
-
-    @app.on_event("startup")
-    def _warmup_prediction_dependencies() -> None:
-        try:
-            run_id = mlflow_service.get_latest_finished_run_id()
-            if run_id:
-                get_or_load_model(run_id)
-                warmup_transformer(run_id)
-        except Exception:
-            logger.exception("Failed to preload latest prediction dependencies")
+    app.include_router(metrics_router)
+    app.include_router(jobs_router)
 
     return app
@@ -1,15 +1,51 @@
 from __future__ import annotations
 
-from fastapi import APIRouter
+import datetime as dt
 
-from london_housing_ai.api.schemas import HealthResponse
-from london_housing_ai.api.services import mlflow_service
+from fastapi import APIRouter, Response
+
+from london_housing_ai.api.schemas import (
+    HealthResponse,
+    LivenessResponse,
+    ReadinessResponse,
+)
+from london_housing_ai.api.services import mlflow_service, readiness
 from london_housing_ai.api.services.model_cache import get_or_load_model
 from london_housing_ai.api.services.transformer_cache import get_or_load_transformer
 
 router = APIRouter(tags=["health"])
 
 
+@router.get("/livez", response_model=LivenessResponse)
+def livez() -> LivenessResponse:
+    """Liveness probe: the process is up and serving requests. Never does I/O."""
+    return LivenessResponse(status="alive")
+
+
+@router.get("/readyz", response_model=ReadinessResponse)
+def readyz(response: Response) -> ReadinessResponse:
+    """Readiness probe backed by the snapshot the model/transformer caches keep.
+
+    Returns 503 (status ``warming`` during start-up warm-up) until a model and
+    transformer have been loaded. Reading the snapshot never touches MLflow or
+    the disk, so probes are safe to run often.
+    """
+    snapshot = readiness.get_snapshot()
+    if not snapshot.ready:
+        response.status_code = 503
+    return ReadinessResponse(
+        status=snapshot.status,
+        model_run_id=snapshot.model_run_id,
+        transformer_run_id=snapshot.transformer_run_id,
+        detail=snapshot.detail,
+        updated_at=(
+            dt.datetime.fromtimestamp(snapshot.updated_at, tz=dt.timezone.utc)
+            if snapshot.updated_at
+            else None
+        ),
+    )
+
+
 @router.get("/health", response_model=HealthResponse)
 def health() -> HealthResponse:
     """Report API health for model-serving readiness.
@@ -19,7 +55,9 @@ def health() -> HealthResponse:
     - ``degraded`` when no finished run is available or MLflow lookup fails
 
     Intention: surface whether the API can serve predictions from a trained model,
-    not just whether the web process is alive.
+    not just whether the web process is alive. This may query MLflow and load
+    artifacts, so it is meant for humans; probes should use ``/livez`` and
+    ``/readyz``.
     """
     experiment_name = mlflow_service.get_experiment_name()
     tracking_uri = mlflow_service.get_tracking_uri()
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import datetime as dt
+import shutil
+from pathlib import Path
+from typing import Optional
+
+import anyio
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import FileResponse
+from pydantic import ValidationError
+
+from london_housing_ai.api.schemas import ScoreJobRequest, ScoreJobResponse
+from london_housing_ai.api.services import jobs
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+UPLOAD_SUFFIXES = {
+    "text/csv": ".csv",
+    "application/vnd.apache.parquet": ".parquet",
+    "application/x-parquet": ".parquet",
+}
+PARQUET_MEDIA_TYPE = "application/vnd.apache.parquet"
+
+
+def _to_dt(ts: Optional[float]) -> Optional[dt.datetime]:
+    return dt.datetime.fromtimestamp(ts, tz=dt.timezone.utc) if ts else None
+
+
+def _job_response(job: jobs.Job) -> ScoreJobResponse:
+    return ScoreJobResponse(
+        job_id=job.job_id,
+        status=job.status,
+        rows_done=job.rows_done,
+        rows_scored=job.rows_scored,
+        chunks_done=job.chunks_done,
+        total_rows=job.total_rows,
+        progress=job.progress,
+        run_id=job.run_id,
+        error=job.error,
+        result_url=(
+            f"/jobs/{job.job_id}/result" if job.status == "succeeded" else None
+        ),
+        created_at=_to_dt(job.created_at),
+        started_at=_to_dt(job.started_at),
+        finished_at=_to_dt(job.finished_at),
+    )
+
+
+def _job_not_found(job_id: str) -> HTTPException:
+    return HTTPException(status_code=404, detail=f"Job '{job_id}' not found")
+
+
+def _get_job(job_id: str) -> jobs.Job:
+    job = jobs.get_manager().get(job_id)
+    if job is None:
+        raise _job_not_found(job_id)
+    return job
+
+
+def _upload_too_large(max_bytes: int) -> HTTPException:
+    return HTTPException(
+        status_code=413, detail=f"Upload is larger than {max_bytes} bytes"
+    )
+
+
+def _upload_limit(request: Request) -> int:
+    """Return the upload size limit, rejecting a declared length above it."""
+    max_bytes = jobs.get_max_upload_bytes()
+    content_length = request.headers.get("content-length", "")
+    if content_length.isdigit() and int(content_length) > max_bytes:
+        raise _upload_too_large(max_bytes)
+    return max_bytes
+
+
+async def _save_upload(request: Request, path: Path, max_bytes: int) -> None:
+    # Stream the body to disk so large files are never held in memory; the
+    # writes run in worker threads so the event loop keeps serving.
+    received = 0
+    async with await anyio.open_file(path, "wb") as f:
+        async for chunk in request.stream():
+            received += len(chunk)
+            if received > max_bytes:
+                raise _upload_too_large(max_bytes)
+            await f.write(chunk)
+
+
+async def _input_from_request(
+    request: Request, file_format: Optional[str]
+) -> tuple[str, Path]:
+    manager = jobs.get_manager()
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    if content_type == "application/json":
+        try:
+            body = ScoreJobRequest.model_validate(await request.json())
+            input_path = jobs.resolve_input_path(body.path)
+        except ValidationError as e:
+            raise HTTPException(status_code=422, detail=e.errors())
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid JSON body: {e}")
+        except PermissionError as e:
+            raise HTTPException(status_code=403, detail=str(e))
+        except FileNotFoundError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        job_id, _ = manager.new_job_dir()
+        return job_id, input_path
+
+    suffix = f".{file_format}" if file_format else UPLOAD_SUFFIXES.get(content_type)
+    if suffix is None:
+        raise HTTPException(
+            status_code=415,
+            detail="Upload text/csv or application/vnd.apache.parquet, "
+            "pass ?format=csv|parquet, or send JSON {'path': ...}",
+        )
+    max_bytes = _upload_limit(request)
+    job_id, job_dir = manager.new_job_dir()
+    input_path = job_dir / f"input{suffix}"
+    try:
+        await _save_upload(request, input_path, max_bytes)
+    except BaseException:
+        # A failed or abandoned upload (e.g. the client disconnected) leaves
+        # nothing behind, even when the request is being cancelled.
+        with anyio.CancelScope(shield=True):
+            await anyio.to_thread.run_sync(shutil.rmtree, job_dir, True)
+        raise
+    return job_id, input_path
+
+
+@router.post("/score", response_model=ScoreJobResponse, status_code=202)
+async def create_score_job(
+    request: Request,
+    response: Response,
+    file_format: Optional[str] = Query(
+        default=None,
+        alias="format",
+        pattern="^(csv|parquet)$",
+        description="Format of the uploaded body when Content-Type is generic.",
+    ),
+) -> ScoreJobResponse:
+    """Score a file of properties in the background.
+
+    Send the file itself as the request body (CSV or Parquet, with the same
+    columns as ``/predict``), or JSON ``{"path": ...}`` naming a file under
+    JOBS_INPUT_DIR on the server. Poll ``Location`` for progress.
+    """
+    job_id, input_path = await _input_from_request(request, file_format)
+    manager = jobs.get_manager()
+    job = manager.create(job_id, input_path)
+    manager.submit(job)
+    response.headers["Location"] = f"/jobs/{job.job_id}"
+    return _job_response(job)
+
+
+@router.get("/{job_id}", response_model=ScoreJobResponse)
+def get_job(job_id: str) -> ScoreJobResponse:
+    return _job_response(_get_job(job_id))
+
+
+@router.delete("/{job_id}", response_model=ScoreJobResponse)
+def cancel_job(job_id: str) -> ScoreJobResponse:
+    """Cancel a queued or running job; a running job stops before its next chunk."""
+    job = jobs.get_manager().cancel(job_id)
+    if job is None:
+        raise _job_not_found(job_id)
+    return _job_response(job)
+
+
+@router.get("/{job_id}/result", response_class=FileResponse)
+def job_result(job_id: str) -> FileResponse:
+    job = _get_job(job_id)
+    if job.status != "succeeded":
+        raise HTTPException(
+            status_code=409, detail=f"Job '{job_id}' is {job.status}, no result yet"
+        )
+    return FileResponse(
+        job.result_path,
+        media_type=PARQUET_MEDIA_TYPE,
+        filename=f"{job_id}.parquet",
+    )
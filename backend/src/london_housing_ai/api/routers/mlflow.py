@@ -1,8 +1,8 @@
 from __future__ import annotations
 
-from typing import List
+from typing import Any, Dict, List, Optional, Union
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request, Response
 
 from london_housing_ai.api.schemas import ArtifactsResponse, MlflowRunRecord
 from london_housing_ai.api.services import mlflow_service
@@ -10,9 +10,46 @@ from london_housing_ai.api.services import mlflow_service
 router = APIRouter(prefix="/mlflow", tags=["mlflow"])
 
 
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {tag.strip() for tag in if_none_match.split(",")}
+    # If-None-Match uses weak comparison, so W/"x" and "x" match.
+    return "*" in candidates or etag.removeprefix("W/") in {
+        tag.removeprefix("W/") for tag in candidates
+    }
+
+
 @router.get("/runs", response_model=List[MlflowRunRecord])
-def runs(limit: int = Query(default=30, ge=1, le=200)) -> List[MlflowRunRecord]:
-    return mlflow_service.list_runs_payload(limit=limit)
+def runs(
+    request: Request,
+    response: Response,
+    limit: int = Query(default=30, ge=1, le=200),
+    cursor: Optional[str] = Query(
+        default=None, description="X-Next-Cursor header of the previous page."
+    ),
+    fields: Optional[str] = Query(
+        default=None,
+        description="Comma-separated projection, e.g. metrics.test_r2,params.",
+    ),
+) -> Union[List[Dict[str, Any]], Response]:
+    """Finished runs, newest first, served from a per-run record cache.
+
+    The next page's cursor is returned in the ``X-Next-Cursor`` header, and a
+    matching ``If-None-Match`` gets ``304 Not Modified``.
+    """
+    try:
+        page = mlflow_service.list_runs_page(limit=limit, cursor=cursor, fields=fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    headers = {"ETag": page.etag}
+    if page.next_cursor:
+        headers["X-Next-Cursor"] = page.next_cursor
+    if _etag_matches(request.headers.get("if-none-match"), page.etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return page.records
 
 
 @router.get("/artifacts", response_model=ArtifactsResponse)
@@ -1,25 +1,84 @@
 from __future__ import annotations
 
+import asyncio
 import os
+import time
+from typing import Any, Callable, Tuple, TypeVar
 
 import numpy as np
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Response
 
 from london_housing_ai.api.schemas import PredictionRequest, PredictResponse
-from london_housing_ai.api.services import mlflow_service
+from london_housing_ai.api.services import (
+    admission,
+    drift_monitor,
+    mlflow_service,
+    prediction_log,
+    readiness,
+)
 from london_housing_ai.api.services.model_cache import get_or_load_model
 from london_housing_ai.api.services.transformer_cache import get_or_load_transformer
 from london_housing_ai.services.postcode_service import resolve_district
-from london_housing_ai.utils.logger import get_logger
+from london_housing_ai.utils.logger import PRESAMPLED, get_logger, should_sample
+from london_housing_ai.utils.metrics import StageTimer
 
 router = APIRouter(tags=["prediction"])
-logger = get_logger()
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+
+def _load_timeout_seconds() -> float:
+    return float(os.getenv("PREDICT_LOAD_TIMEOUT_SECONDS", "10"))
+
+
+def _retry_after() -> dict:
+    return {"Retry-After": os.getenv("WARMUP_RETRY_AFTER_SECONDS", "5")}
+
+
+async def _off_loop(fn: Callable[..., T], *args: Any) -> T:
+    """Run blocking MLflow/artifact I/O in a worker thread, bounded in time.
+
+    A load that outlives the timeout keeps going in its thread and fills the
+    caches for later requests; this one gets a 503 instead of stalling.
+    """
+    try:
+        return await asyncio.wait_for(
+            asyncio.to_thread(fn, *args), timeout=_load_timeout_seconds()
+        )
+    except asyncio.TimeoutError:
+        raise HTTPException(
+            status_code=503,
+            detail="Model is loading, retry shortly",
+            headers=_retry_after(),
+        )
+
+
+def _load_artifacts(run_id: str) -> Tuple[Any, Any]:
+    return get_or_load_model(run_id), get_or_load_transformer(run_id)
 
 
 @router.post("/predict", response_model=PredictResponse)
-async def predict(data: PredictionRequest) -> PredictResponse:
+async def predict(data: PredictionRequest, response: Response) -> PredictResponse:
+    snapshot = readiness.get_snapshot()
+    if snapshot.warming and not snapshot.ready:
+        raise HTTPException(
+            status_code=503,
+            detail="Model is warming up, retry shortly",
+            headers=_retry_after(),
+        )
+
+    async with admission.get_controller().admit():
+        return await _predict(data, response)
+
+
+async def _predict(data: PredictionRequest, response: Response) -> PredictResponse:
+    start = time.perf_counter()
+    timer = StageTimer()
+
     # Resolve postcode -> district
-    district = await resolve_district(data.postcode)
+    with timer.stage("postcode"):
+        district = await resolve_district(data.postcode)
     if district is None:
         raise HTTPException(
             status_code=400, detail=f"Postcode '{data.postcode}' not found"
@@ -28,25 +87,47 @@ async def predict(data: PredictionRequest) -> PredictResponse:
     user_input = data.model_dump()
     user_input["district"] = district
 
-    run_id = mlflow_service.get_latest_finished_run_id()
-    if not run_id:
+    with timer.stage("run_resolution"):
+        # Resolved by warm-up and then at most once per SERVING_RUN_TTL_SECONDS.
+        serving = mlflow_service.cached_serving_run()
+        if serving is None:
+            serving = await _off_loop(mlflow_service.resolve_serving_run)
+    if serving is None:
         raise HTTPException(status_code=503, detail="No trained runs available")
+    run_id = serving.run_id
 
-    model = get_or_load_model(run_id)
+    with timer.stage("artifact_load"):
+        model, transformer = await _off_loop(_load_artifacts, run_id)
 
-    transformer = get_or_load_transformer(run_id)
-    features = transformer.transform(user_input)
-    logger.info(features.to_dict(orient="records"))
-    logger.info(features.dtypes)
+    with timer.stage("transform"):
+        features = transformer.transform(user_input)
+    # High-volume payload; thin it out with LOG_SAMPLE_RATES. Sampled before
+    # the payload is built so dropped records cost nothing.
+    if should_sample(logger):
+        logger.debug(
+            "Prediction features",
+            extra={
+                "run_id": run_id,
+                "features": features.to_dict(orient="records"),
+                PRESAMPLED: True,
+            },
+        )
 
-    use_log_target = mlflow_service.run_uses_log_target(run_id, default=True)
     try:
-        preds = model.predict(features)
-        value = float(np.expm1(preds[0])) if use_log_target else float(preds[0])
+        with timer.stage("inference"):
+            preds = model.predict(features)
+        value = float(np.expm1(preds[0])) if serving.log_target else float(preds[0])
     except Exception:
         logger.exception("Prediction failed")
         raise HTTPException(status_code=500, detail="Prediction failed")
 
+    sink = prediction_log.get_sink()
+    if sink is not None:
+        sink.record(run_id, features, value, (time.perf_counter() - start) * 1000)
+    monitor = drift_monitor.get_monitor()
+    if monitor is not None:
+        monitor.observe(user_input, value)
+    response.headers["Server-Timing"] = timer.server_timing()
     predicted_price = round(value, 2)
     ci_margin = round(predicted_price * 0.1, 2)
     confidence_interval = [
@@ -70,6 +70,38 @@ class HealthResponse(BaseModel):
     detail: Optional[str] = None
 
 
+class LivenessResponse(BaseModel):
+    status: str
+
+
+class ReadinessResponse(BaseModel):
+    status: str
+    model_run_id: Optional[str] = None
+    transformer_run_id: Optional[str] = None
+    detail: Optional[str] = None
+    updated_at: Optional[dt.datetime] = None
+
+
+class ScoreJobRequest(BaseModel):
+    path: str  # relative to JOBS_INPUT_DIR on the API host
+
+
+class ScoreJobResponse(BaseModel):
+    job_id: str
+    status: str  # queued/running/succeeded/failed/cancelled
+    rows_done: int = 0
+    rows_scored: int = 0
+    chunks_done: int = 0
+    total_rows: Optional[int] = None
+    progress: Optional[float] = None
+    run_id: Optional[str] = None
+    error: Optional[str] = None
+    result_url: Optional[str] = None
+    created_at: Optional[dt.datetime] = None
+    started_at: Optional[dt.datetime] = None
+    finished_at: Optional[dt.datetime] = None
+
+
 class PredictionRequest(BaseModel):
     postcode: str  # -> resolved to district via postcodes.io
     property_type: str  # D/S/T/F
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+from fastapi import HTTPException
+
+from london_housing_ai.utils.metrics import (
+    ADMISSION_IN_FLIGHT,
+    ADMISSION_QUEUE_DEPTH,
+    ADMISSION_QUEUE_WAIT_SECONDS,
+    ADMISSION_SHED,
+)
+
+# Per-worker admission control for /predict: at most ``max_concurrency``
+# requests execute at once, at most ``max_queue`` wait for a slot, and none
+# waits longer than ``queue_timeout_seconds``. Everything else is shed with
+# 503 + Retry-After so admitted requests keep a bounded latency when an
+# upstream (postcodes.io, MLflow) browns out.
+
+
+class AdmissionController:
+    def __init__(
+        self,
+        max_concurrency: int,
+        max_queue: int,
+        queue_timeout_seconds: float,
+        retry_after_seconds: int = 1,
+    ):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout_seconds = queue_timeout_seconds
+        self.retry_after_seconds = retry_after_seconds
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self._waiting = 0
+
+    def _shed(self, reason: str) -> HTTPException:
+        ADMISSION_SHED.labels(reason=reason).inc()
+        return HTTPException(
+            status_code=503,
+            detail=f"Server overloaded ({reason}), retry shortly",
+            headers={"Retry-After": str(self.retry_after_seconds)},
+        )
+
+    @asynccontextmanager
+    async def admit(self) -> AsyncIterator[None]:
+        if not self._slots.locked():
+            # A free slot is taken without suspending, so nothing can race us.
+            await self._slots.acquire()
+        else:
+            if self._waiting >= self.max_queue:
+                raise self._shed("queue_full")
+            start = time.perf_counter()
+            self._waiting += 1
+            ADMISSION_QUEUE_DEPTH.set(self._waiting)
+            try:
+                await asyncio.wait_for(
+                    self._slots.acquire(), timeout=self.queue_timeout_seconds
+                )
+            except asyncio.TimeoutError:
+                raise self._shed("queue_timeout")
+            finally:
+                self._waiting -= 1
+                ADMISSION_QUEUE_DEPTH.set(self._waiting)
+            ADMISSION_QUEUE_WAIT_SECONDS.observe(time.perf_counter() - start)
+
+        ADMISSION_IN_FLIGHT.inc()
+        try:
+            yield
+        finally:
+            ADMISSION_IN_FLIGHT.dec()
+            self._slots.release()
+
+
+_controller: Optional[AdmissionController] = None
+
+
+def get_controller() -> AdmissionController:
+    global _controller
+    if _controller is None:
+        _controller = AdmissionController(
+            max_concurrency=int(os.getenv("PREDICT_MAX_CONCURRENCY", "8")),
+            max_queue=int(os.getenv("PREDICT_MAX_QUEUE", "32")),
+            queue_timeout_seconds=float(
+                os.getenv("PREDICT_QUEUE_TIMEOUT_SECONDS", "2")
+            ),
+            retry_after_seconds=int(os.getenv("PREDICT_RETRY_AFTER_SECONDS", "1")),
+        )
+    return _controller
+
+
+def reset() -> None:
+    global _controller
+    _controller = None
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+from london_housing_ai.utils.checksum import file_sha256
+from london_housing_ai.utils.logger import get_logger
+
+# A run's artifacts never change, so downloads are cached on local disk under
+# ARTIFACT_CACHE_DIR, keyed by (run_id, artifact_path). The directory can be
+# shared by every worker on the host and survives restarts:
+#
+#     <cache>/<key>/<artifact name>   the downloaded file or directory
+#     <cache>/<key>/MANIFEST          run id, path, per-file size and sha256
+#
+# Entries are assembled in a temp dir and renamed into place, so readers only
+# ever see complete entries. The manifest mtime is the LRU clock used to keep
+# the cache under ARTIFACT_CACHE_MAX_BYTES.
+
+MANIFEST_FILE = "MANIFEST"
+_TMP_PREFIX = ".tmp-"
+
+logger = get_logger(__name__)
+
+
+def get_cache_dir() -> Path:
+    default = Path(tempfile.gettempdir()) / "london_housing_ai_artifacts"
+    return Path(os.getenv("ARTIFACT_CACHE_DIR", str(default)))
+
+
+def get_max_bytes() -> int:
+    return int(os.getenv("ARTIFACT_CACHE_MAX_BYTES", str(2 * 1024**3)))
+
+
+def _verify_checksums() -> bool:
+    # Size checks are free; hashing a large model on every start is not.
+    return os.getenv("ARTIFACT_CACHE_VERIFY", "size").lower() == "sha256"
+
+
+def cache_key(run_id: str, artifact_path: str) -> str:
+    normalized = artifact_path.strip("/")
+    return hashlib.sha256(f"{run_id}\0{normalized}".encode("utf-8")).hexdigest()[:32]
+
+
+def _artifact_name(artifact_path: str) -> str:
+    return Path(artifact_path.strip("/")).name or "artifact"
+
+
+def _describe_files(root: Path) -> Dict[str, Dict[str, Any]]:
+    paths = [root] if root.is_file() else sorted(p for p in root.rglob("*"))
+    files: Dict[str, Dict[str, Any]] = {}
+    for path in paths:
+        if path.is_file():
+            rel = path.name if path == root else str(path.relative_to(root))
+            files[rel] = {"size": path.stat().st_size, "sha256": file_sha256(path)}
+    return files
+
+
+def _is_valid(entry_dir: Path, artifact_path: str) -> bool:
+    try:
+        with (entry_dir / MANIFEST_FILE).open(encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return False
+    target = entry_dir / _artifact_name(artifact_path)
+    verify_checksums = _verify_checksums()
+    for rel, expected in manifest.get("files", {}).items():
+        path = target if target.is_file() else target / rel
+        try:
+            if path.stat().st_size != expected["size"]:
+                return False
+        except OSError:
+            return False
+        if verify_checksums and file_sha256(path) != expected["sha256"]:
+            return False
+    return target.exists()
+
+
+def _entries(cache_dir: Path) -> List[Tuple[float, int, Path]]:
+    entries = []
+    for entry_dir in cache_dir.iterdir():
+        if entry_dir.name.startswith(_TMP_PREFIX):
+            continue
+        manifest_path = entry_dir / MANIFEST_FILE
+        try:
+            with manifest_path.open(encoding="utf-8") as f:
+                total = int(json.load(f).get("total_size", 0))
+            entries.append((manifest_path.stat().st_mtime, total, entry_dir))
+        except (OSError, ValueError):
+            continue
+    return entries
+
+
+def _evict(cache_dir: Path, keep: Path) -> None:
+    entries = sorted(_entries(cache_dir))
+    total = sum(size for _, size, _ in entries)
+    budget = get_max_bytes()
+    for _, size, entry_dir in entries:
+        if total <= budget:
+            break
+        if entry_dir == keep:
+            continue
+        shutil.rmtree(entry_dir, ignore_errors=True)
+        total -= size
+        logger.info(f"Evicted cached artifact {entry_dir.name} ({size} bytes)")
+
+
+def get_cached_artifact(
+    run_id: str, artifact_path: str, download: Callable[[str], str]
+) -> str:
+    """Return a local path to ``artifact_path`` of ``run_id``, downloading once.
+
+    ``download(dst_dir)`` fetches the artifact and returns its local path; it is
+    only called on a cache miss or when the cached copy fails verification.
+    """
+    cache_dir = get_cache_dir()
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    entry_dir = cache_dir / cache_key(run_id, artifact_path)
+    name = _artifact_name(artifact_path)
+
+    if _is_valid(entry_dir, artifact_path):
+        # Touch the manifest so LRU eviction sees the hit.
+        os.utime(entry_dir / MANIFEST_FILE)
+        return str(entry_dir / name)
+
+    tmp_dir = cache_dir / f"{_TMP_PREFIX}{uuid.uuid4().hex}"
+    tmp_dir.mkdir()
+    try:
+        download_dir = tmp_dir / "download"
+        download_dir.mkdir()
+        downloaded = Path(download(str(download_dir)))
+        target = tmp_dir / name
+        if downloaded.is_relative_to(download_dir):
+            downloaded.rename(target)
+        elif downloaded.is_dir():
+            # e.g. a local file store returning its own artifact path
+            shutil.copytree(downloaded, target)
+        else:
+            shutil.copy2(downloaded, target)
+        shutil.rmtree(download_dir, ignore_errors=True)
+
+        files = _describe_files(target)
+        manifest = {
+            "run_id": run_id,
+            "artifact_path": artifact_path,
+            "created_at": time.time(),
+            "total_size": sum(f["size"] for f in files.values()),
+            "files": files,
+        }
+        with (tmp_dir / MANIFEST_FILE).open("w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+
+        if entry_dir.exists():
+            # Either a corrupt entry or another worker won the race.
+            if _is_valid(entry_dir, artifact_path):
+                return str(entry_dir / name)
+            shutil.rmtree(entry_dir, ignore_errors=True)
+        try:
+            os.rename(tmp_dir, entry_dir)
+        except OSError:
+            if not _is_valid(entry_dir, artifact_path):
+                raise
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    _evict(cache_dir, keep=entry_dir)
+    return str(entry_dir / name)
@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+from london_housing_ai.serving_bundle import ServingBundle
+
+
+def get_bundle_dir() -> Optional[str]:
+    return os.getenv("SERVING_BUNDLE_DIR")
+
+
+@lru_cache(maxsize=4)
+def _load_bundle(bundle_dir: str) -> ServingBundle:
+    return ServingBundle.load(Path(bundle_dir))
+
+
+def get_bundle() -> Optional[ServingBundle]:
+    """Return the configured serving bundle, or None when serving from MLflow."""
+    bundle_dir = get_bundle_dir()
+    if not bundle_dir:
+        return None
+    return _load_bundle(bundle_dir)
@@ -0,0 +1,269 @@
+from __future__ import annotations
+
+import asyncio
+import bisect
+import json
+import math
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from london_housing_ai.api.services import artifact_cache, mlflow_service
+from london_housing_ai.utils.logger import get_logger
+from london_housing_ai.utils.metrics import DRIFT_KS, DRIFT_OBSERVATIONS, DRIFT_PSI
+
+# Compares live /predict traffic with the training data-quality profile
+# (``data_quality_<checksum>_<ts>.json``, logged with every run by
+# ``generate_data_quality_report``). ``observe`` only bumps a few counters and
+# one histogram bin, so memory is fixed by the number of categories (capped)
+# and price bins. A lifespan task recomputes PSI per feature and PSI/KS for
+# the predicted price every DRIFT_EVAL_SECONDS and publishes them as gauges,
+# then decays the counts so the gauges follow recent traffic.
+
+DATA_QUALITY_PREFIX = "data_quality_"
+OTHER_CATEGORY = "__other__"
+_EPSILON = 1e-4
+
+# Request field -> training column in the raw dataset.
+_CATEGORICAL_COLUMNS = {
+    "district": "district",
+    "property_type": "property_type",
+    "is_new_build": "old/new",
+    "is_leasehold": "duration",
+}
+# ``DataFrame.describe()`` row order; the report keeps rows but drops labels.
+_DESCRIBE_ROWS = ("count", "mean", "std", "min", "25%", "50%", "75%", "max")
+
+# Log-spaced price bins from £10k to £100m, plus under/overflow bins.
+PRICE_BIN_EDGES: List[float] = list(np.logspace(4, 8, 161))
+
+logger = get_logger(__name__)
+
+
+def _psi(live: Dict[str, float], expected: Dict[str, float]) -> float:
+    """Population stability index of ``live`` counts against expected shares."""
+    total = sum(live.values())
+    keys = set(expected) | set(live)
+    psi = 0.0
+    for key in keys:
+        actual = max(live.get(key, 0.0) / total, _EPSILON)
+        share = max(expected.get(key, 0.0), _EPSILON)
+        psi += (actual - share) * math.log(actual / share)
+    return psi
+
+
+class TrainingProfile:
+    """The parts of a data-quality report the monitor compares against."""
+
+    def __init__(
+        self,
+        categories: Dict[str, Dict[str, float]],
+        price_quantiles: Optional[List[Tuple[float, float]]],
+    ):
+        self.categories = categories
+        # (cumulative share, price) points of the training price CDF.
+        self.price_quantiles = price_quantiles
+
+    @classmethod
+    def from_report(cls, report: Dict[str, Any]) -> "TrainingProfile":
+        distributions = report.get("category_distribution", {})
+        categories = {
+            field: {str(k): float(v) for k, v in distributions[column].items()}
+            for field, column in _CATEGORICAL_COLUMNS.items()
+            if column in distributions
+        }
+        price_quantiles = None
+        rows = report.get("numeric_stats", [])
+        if len(rows) == len(_DESCRIBE_ROWS) and all("price" in r for r in rows):
+            stats = {name: rows[i]["price"] for i, name in enumerate(_DESCRIBE_ROWS)}
+            price_quantiles = [
+                (0.0, stats["min"]),
+                (0.25, stats["25%"]),
+                (0.5, stats["50%"]),
+                (0.75, stats["75%"]),
+                (1.0, stats["max"]),
+            ]
+        return cls(categories, price_quantiles)
+
+    def price_cdf(self, price: float) -> float:
+        assert self.price_quantiles is not None
+        shares, prices = zip(*self.price_quantiles)
+        return float(np.interp(price, prices, shares))
+
+
+class DriftMonitor:
+    def __init__(self, max_categories: int = 256, decay: float = 0.5):
+        self.max_categories = max_categories
+        self.decay = decay
+        self.profile: Optional[TrainingProfile] = None
+        self.profile_run_id: Optional[str] = None
+        self._lock = threading.Lock()
+        self._counts: Dict[str, Dict[str, float]] = {
+            field: {} for field in _CATEGORICAL_COLUMNS
+        }
+        self._price_bins = [0.0] * (len(PRICE_BIN_EDGES) + 1)
+        self._observations = 0.0
+
+    def observe(self, request: Dict[str, Any], predicted_price: float) -> None:
+        """Count one request; O(1) in the number of requests seen."""
+        bin_index = bisect.bisect_right(PRICE_BIN_EDGES, predicted_price)
+        with self._lock:
+            for field, counts in self._counts.items():
+                value = request.get(field)
+                if value is None:
+                    continue
+                key = self._category_key(field, str(value))
+                if key not in counts and len(counts) >= self.max_categories:
+                    key = OTHER_CATEGORY
+                counts[key] = counts.get(key, 0.0) + 1.0
+            self._price_bins[bin_index] += 1.0
+            self._observations += 1.0
+
+    @staticmethod
+    def _category_key(field: str, value: str) -> str:
+        if field == "is_leasehold":
+            return "L" if value == "Y" else "F"
+        return value
+
+    def set_profile(self, run_id: str, profile: TrainingProfile) -> None:
+        with self._lock:
+            self.profile_run_id = run_id
+            self.profile = profile
+
+    @staticmethod
+    def _live_price_cdf(
+        cumulative: np.ndarray, bins: List[float], price: float
+    ) -> float:
+        # cumulative[i] is the count in bins[0..i-1].
+        index = bisect.bisect_right(PRICE_BIN_EDGES, price)
+        below = float(cumulative[index])
+        if 0 < index < len(PRICE_BIN_EDGES):
+            # Interpolate inside the bin in log space.
+            lo, hi = PRICE_BIN_EDGES[index - 1], PRICE_BIN_EDGES[index]
+            below += bins[index] * math.log(price / lo) / math.log(hi / lo)
+        return below / float(cumulative[-1])
+
+    def evaluate(self, min_observations: int = 1) -> Dict[str, float]:
+        """Compute distances and publish them as gauges.
+
+        Counts are decayed after each evaluation that reports, so the gauges
+        follow recent traffic; quiet periods accumulate until there are
+        ``min_observations`` to compare.
+        """
+        with self._lock:
+            profile = self.profile
+            observations = self._observations
+            DRIFT_OBSERVATIONS.set(observations)
+            if profile is None or observations < min_observations:
+                return {}
+            counts = {field: dict(c) for field, c in self._counts.items()}
+            bins = list(self._price_bins)
+            for field_counts in self._counts.values():
+                for key in field_counts:
+                    field_counts[key] *= self.decay
+            self._price_bins = [count * self.decay for count in self._price_bins]
+            self._observations *= self.decay
+
+        results: Dict[str, float] = {}
+        for field, expected in profile.categories.items():
+            if counts.get(field):
+                psi = _psi(counts[field], expected)
+                DRIFT_PSI.labels(feature=field).set(psi)
+                results[f"psi_{field}"] = psi
+
+        if profile.price_quantiles is not None and sum(bins) > 0:
+            cumulative = np.concatenate([[0.0], np.cumsum(bins)])
+            points = PRICE_BIN_EDGES + [p for _, p in profile.price_quantiles]
+            ks = max(
+                abs(self._live_price_cdf(cumulative, bins, p) - profile.price_cdf(p))
+                for p in points
+                if p > 0
+            )
+            quartiles = [p for _, p in profile.price_quantiles[1:-1]]
+            cdf = [self._live_price_cdf(cumulative, bins, p) for p in quartiles]
+            cdf = [0.0] + cdf + [1.0]
+            live = {str(i): cdf[i + 1] - cdf[i] for i in range(4)}
+            psi = _psi(live, {str(i): 0.25 for i in range(4)})
+            DRIFT_KS.labels(feature="predicted_price").set(ks)
+            DRIFT_PSI.labels(feature="predicted_price").set(psi)
+            results["ks_predicted_price"] = ks
+            results["psi_predicted_price"] = psi
+        return results
+
+
+def _eval_seconds() -> float:
+    return float(os.getenv("DRIFT_EVAL_SECONDS", "60"))
+
+
+def _min_observations() -> int:
+    return int(os.getenv("DRIFT_MIN_OBSERVATIONS", "50"))
+
+
+_monitor: Optional[DriftMonitor] = None
+_monitor_lock = threading.Lock()
+
+
+def get_monitor() -> Optional[DriftMonitor]:
+    """The process-wide monitor, or None when DRIFT_MONITOR_ENABLED is false."""
+    global _monitor
+    if _monitor is not None:
+        return _monitor
+    if os.getenv("DRIFT_MONITOR_ENABLED", "true").lower() != "true":
+        return None
+    with _monitor_lock:
+        if _monitor is None:
+            _monitor = DriftMonitor(
+                decay=float(os.getenv("DRIFT_DECAY", "0.5")),
+            )
+        return _monitor
+
+
+def reset() -> None:
+    global _monitor
+    with _monitor_lock:
+        _monitor = None
+
+
+def load_training_profile(run_id: str) -> TrainingProfile:
+    """Read the newest data-quality report logged with ``run_id``."""
+    names = sorted(
+        artifact.path
+        for artifact in mlflow_service.list_artifacts(run_id)
+        if not artifact.is_dir
+        and Path(artifact.path).name.startswith(DATA_QUALITY_PREFIX)
+        and artifact.path.endswith(".json")
+    )
+    if not names:
+        raise RuntimeError(f"Run '{run_id}' has no data quality report")
+    name = names[-1]
+    local_path = artifact_cache.get_cached_artifact(
+        run_id,
+        name,
+        lambda dst: mlflow_service.download_artifact_for_run(run_id, name, dst),
+    )
+    with open(local_path, encoding="utf-8") as f:
+        return TrainingProfile.from_report(json.load(f))
+
+
+def _refresh_profile(monitor: DriftMonitor) -> None:
+    run_id = mlflow_service.get_latest_finished_run_id()
+    if run_id and run_id != monitor.profile_run_id:
+        monitor.set_profile(run_id, load_training_profile(run_id))
+        logger.info(f"Drift monitor compares against run '{run_id}'")
+
+
+async def run_drift_monitor() -> None:
+    """Re-evaluate drift on a timer until the app shuts down."""
+    monitor = get_monitor()
+    if monitor is None:
+        return
+    while True:
+        await asyncio.sleep(_eval_seconds())
+        try:
+            await asyncio.to_thread(_refresh_profile, monitor)
+        except Exception as e:
+            logger.warning(f"Could not load training profile for drift: {e}")
+        monitor.evaluate(min_observations=_min_observations())
@@ -0,0 +1,286 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import pyarrow.parquet as pq
+
+from london_housing_ai.api.services import mlflow_service
+from london_housing_ai.api.services.model_cache import get_or_load_model
+from london_housing_ai.api.services.transformer_cache import get_or_load_transformer
+from london_housing_ai.score import (
+    ParquetSink,
+    check_columns,
+    read_chunks,
+    requests_frame,
+    resolve_districts,
+    score_requests,
+)
+from london_housing_ai.utils.logger import get_logger
+
+# Batch-scoring jobs run inside the API process so they reuse the model and
+# transformer already cached for /predict. Geocoding (async, bulk postcodes.io)
+# runs on the event loop; reading, scoring and writing each chunk run on a
+# small dedicated thread pool so /predict keeps its own threads. Jobs live in
+# memory, per worker process, with their input and result files under
+# JOBS_DIR/<job_id>/.
+
+RESULT_FILE = "result.parquet"
+FINISHED_STATUSES = frozenset({"succeeded", "failed", "cancelled"})
+
+logger = get_logger(__name__)
+
+
+class JobCancelled(Exception):
+    pass
+
+
+@dataclass
+class Job:
+    job_id: str
+    input_path: Path
+    result_path: Path
+    status: str = "queued"
+    total_rows: Optional[int] = None
+    rows_done: int = 0
+    rows_scored: int = 0
+    chunks_done: int = 0
+    run_id: Optional[str] = None
+    error: Optional[str] = None
+    cancel_requested: bool = False
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATUSES
+
+    @property
+    def progress(self) -> Optional[float]:
+        if self.status == "succeeded":
+            return 1.0
+        if not self.total_rows:
+            return None
+        return min(1.0, self.rows_done / self.total_rows)
+
+
+def _load_serving_artifacts() -> Tuple[str, Any, Any, bool]:
+    run_id = mlflow_service.get_latest_finished_run_id()
+    if not run_id:
+        raise RuntimeError("No trained runs available")
+    model = get_or_load_model(run_id)
+    transformer = get_or_load_transformer(run_id)
+    log_target = mlflow_service.run_uses_log_target(run_id, default=True)
+    return run_id, model, transformer, log_target
+
+
+def _count_rows(path: Path) -> Optional[int]:
+    # Parquet footers carry the row count; CSV would need a full pass.
+    if path.suffix == ".parquet":
+        return pq.ParquetFile(path).metadata.num_rows
+    return None
+
+
+class JobManager:
+    def __init__(
+        self,
+        root: Path,
+        max_concurrent: int = 1,
+        chunk_size: int = 50_000,
+        thread_count: int = 1,
+        max_retained: int = 100,
+    ):
+        self.root = Path(root)
+        self.max_concurrent = max_concurrent
+        self.chunk_size = chunk_size
+        self.thread_count = thread_count
+        self.max_retained = max_retained
+        self._jobs: Dict[str, Job] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._lock = threading.Lock()
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrent, thread_name_prefix="score-job"
+        )
+
+    def new_job_dir(self) -> Tuple[str, Path]:
+        job_id = uuid.uuid4().hex
+        job_dir = self.root / job_id
+        job_dir.mkdir(parents=True)
+        return job_id, job_dir
+
+    def create(self, job_id: str, input_path: Path) -> Job:
+        job = Job(
+            job_id=job_id,
+            input_path=Path(input_path),
+            result_path=self.root / job_id / RESULT_FILE,
+        )
+        with self._lock:
+            self._jobs[job_id] = job
+            self._evict_finished()
+        return job
+
+    def _evict_finished(self) -> None:
+        finished = [j for j in self._jobs.values() if j.finished]
+        for job in finished[: max(0, len(self._jobs) - self.max_retained)]:
+            del self._jobs[job.job_id]
+            shutil.rmtree(self.root / job.job_id, ignore_errors=True)
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def submit(self, job: Job) -> None:
+        """Schedule ``job`` on the running event loop."""
+        task = asyncio.create_task(self._run(job))
+        self._tasks[job.job_id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(job.job_id, None))
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """Ask a job to stop; a running job stops before its next chunk."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.finished:
+                return job
+            job.cancel_requested = True
+            if job.status == "queued":
+                job.status = "cancelled"
+                job.finished_at = time.time()
+        return job
+
+    def _finish(self, job: Job, status: str, error: Optional[str] = None) -> None:
+        with self._lock:
+            job.status = status
+            job.error = error
+            job.finished_at = time.time()
+
+    async def _run(self, job: Job) -> None:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_concurrent)
+        async with self._slots:
+            with self._lock:
+                if job.finished:
+                    return
+                job.status = "running"
+                job.started_at = time.time()
+            try:
+                await self._score(job)
+            except (JobCancelled, asyncio.CancelledError) as e:
+                self._finish(job, "cancelled")
+                if isinstance(e, asyncio.CancelledError):
+                    raise
+            except Exception as e:
+                logger.exception(f"Scoring job '{job.job_id}' failed")
+                self._finish(job, "failed", str(e))
+            else:
+                self._finish(job, "succeeded")
+            finally:
+                # A finished job keeps no half-written result; on success it
+                # has already been renamed to result_path.
+                job.result_path.with_suffix(".partial").unlink(missing_ok=True)
+
+    async def _score(self, job: Job) -> None:
+        loop = asyncio.get_running_loop()
+
+        def in_pool(fn, *args):
+            return loop.run_in_executor(self._executor, fn, *args)
+
+        run_id, model, transformer, log_target = await in_pool(_load_serving_artifacts)
+        job.run_id = run_id
+        job.total_rows = await in_pool(_count_rows, job.input_path)
+        chunks = read_chunks(job.input_path, self.chunk_size)
+        cache: Dict[str, Optional[str]] = {}
+        partial = job.result_path.with_suffix(".partial")
+        sink = ParquetSink(partial)
+        try:
+            while (chunk := await in_pool(next, chunks, None)) is not None:
+                if job.cancel_requested:
+                    raise JobCancelled()
+                check_columns(chunk)
+                chunk = chunk.reset_index(drop=True)
+                districts = await resolve_districts(chunk["postcode"], cache)
+                requests = requests_frame(chunk, districts)
+                prices = await in_pool(
+                    score_requests,
+                    model,
+                    transformer,
+                    requests,
+                    log_target,
+                    self.thread_count,
+                )
+                await in_pool(sink.write, chunk, districts, prices)
+                with self._lock:
+                    job.rows_done = sink.rows
+                    job.rows_scored = sink.scored
+                    job.chunks_done += 1
+        finally:
+            sink.close()
+        if sink.rows == 0:
+            raise ValueError("Input file has no rows")
+        os.replace(partial, job.result_path)
+
+    async def shutdown(self) -> None:
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def get_jobs_dir() -> Path:
+    default = Path(tempfile.gettempdir()) / "london_housing_ai_jobs"
+    return Path(os.getenv("JOBS_DIR", str(default)))
+
+
+def get_max_upload_bytes() -> int:
+    return int(os.getenv("JOBS_MAX_UPLOAD_BYTES", str(1024**3)))
+
+
+def resolve_input_path(path: str) -> Path:
+    """Validate a server-side input path against JOBS_INPUT_DIR."""
+    allowed_root = os.getenv("JOBS_INPUT_DIR")
+    if not allowed_root:
+        raise PermissionError("Server-side input paths are disabled")
+    root = Path(allowed_root).resolve()
+    resolved = (root / path).resolve()
+    if not resolved.is_relative_to(root):
+        raise PermissionError(f"Input path must be inside {root}")
+    if not resolved.is_file():
+        raise FileNotFoundError(f"Input file not found: {path}")
+    return resolved
+
+
+_manager: Optional[JobManager] = None
+_manager_lock = threading.Lock()
+
+
+def get_manager() -> JobManager:
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = JobManager(
+                get_jobs_dir(),
+                max_concurrent=int(os.getenv("JOBS_MAX_CONCURRENT", "1")),
+                chunk_size=int(os.getenv("JOBS_CHUNK_SIZE", "50000")),
+                thread_count=int(os.getenv("JOBS_THREAD_COUNT", "1")),
+                max_retained=int(os.getenv("JOBS_MAX_RETAINED", "100")),
+            )
+        return _manager
+
+
+async def shutdown() -> None:
+    global _manager
+    with _manager_lock:
+        manager, _manager = _manager, None
+    if manager is not None:
+        await manager.shutdown()
@@ -1,17 +1,29 @@
 from __future__ import annotations
 
+import base64
+import bisect
 import datetime as dt
+import hashlib
+import json
 import os
+import threading
+import time
+from dataclasses import dataclass
 from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple
 from urllib.parse import urlparse
 
-import mlflow.catboost as mlflow_catboost
-from mlflow.entities import Experiment, Run, RunStatus
-from mlflow.tracking import MlflowClient
-
 from london_housing_ai.api.schemas import ArtifactSummary, RunSummary
+from london_housing_ai.api.services import artifact_cache, bundle_service, model_index
+from london_housing_ai.run_kinds import RUN_KIND_TAG, TUNE_RUN_KIND
+
+if TYPE_CHECKING:
+    from mlflow.entities import Experiment, Run
+    from mlflow.tracking import MlflowClient
+
+# MLflow is imported lazily inside the functions that talk to it, so the API can
+# boot from a serving bundle (SERVING_BUNDLE_DIR) without ever importing mlflow.
 
 
 def _normalize_tracking_uri(uri: Optional[str]) -> Optional[str]:
@@ -50,25 +62,7 @@ def _model_artifacts_dir_for_run(run_id: str) -> Optional[Path]:
     root = _tracking_local_path()
     if root is None:
         return None
-    models_dir = root / "models"
-    if not models_dir.exists():
-        return None
-
-    for model_dir in models_dir.iterdir():
-        if not model_dir.is_dir():
-            continue
-        artifacts_dir = model_dir / "artifacts"
-        mlmodel_path = artifacts_dir / "MLmodel"
-        if not mlmodel_path.exists():
-            continue
-        try:
-            content = mlmodel_path.read_text(encoding="utf-8")
-        except Exception:
-            continue
-        for line in content.splitlines():
-            if line.startswith("run_id:") and line.split(":", 1)[1].strip() == run_id:
-                return artifacts_dir
-    return None
+    return model_index.find_model_artifacts_dir(root, run_id)
 
 
 def get_experiment_name() -> str:
@@ -85,6 +79,8 @@ def get_model_dir() -> Optional[str]:
 
 @lru_cache(maxsize=1)
 def get_client() -> MlflowClient:
+    from mlflow.tracking import MlflowClient
+
     tracking_uri = get_tracking_uri()
     if tracking_uri:
         return MlflowClient(tracking_uri=tracking_uri)
@@ -104,6 +100,10 @@ def get_experiment(client: MlflowClient, name: str) -> Optional[Experiment]:
         return None
 
 
+def is_tune_run(run: Run) -> bool:
+    return (run.data.tags or {}).get(RUN_KIND_TAG) == TUNE_RUN_KIND
+
+
 def list_recent_finished_runs(
     client: MlflowClient, experiment_id: str, limit: int = 30
 ) -> List[Run]:
@@ -112,17 +112,36 @@ def list_recent_finished_runs(
     In MLflow, one experiment contains many runs. ``experiment_id`` identifies
     that single experiment, and ``search_runs`` expects a list of experiment IDs,
     so we pass ``[experiment_id]``.
+
+    Hyperparameter search runs have no model and are skipped. They are
+    filtered here rather than in the filter string because a ``!=`` on a tag
+    also drops runs that do not have the tag at all.
     """
+    from mlflow.entities import RunStatus
+
     finished_status = RunStatus.to_string(RunStatus.FINISHED)
-    return client.search_runs(
-        experiment_ids=[experiment_id],
-        filter_string=f"attributes.status = '{finished_status}'",
-        order_by=["start_time DESC"],
-        max_results=limit,
-    )
+    runs: List[Run] = []
+    page_token = None
+    while len(runs) < limit:
+        page = client.search_runs(
+            experiment_ids=[experiment_id],
+            filter_string=f"attributes.status = '{finished_status}'",
+            order_by=["start_time DESC"],
+            max_results=limit,
+            page_token=page_token,
+        )
+        runs.extend(run for run in page if not is_tune_run(run))
+        page_token = getattr(page, "token", None)
+        if not page_token:
+            break
+    return runs[:limit]
 
 
 def get_latest_finished_run_id() -> Optional[str]:
+    bundle = bundle_service.get_bundle()
+    if bundle is not None:
+        return bundle.run_id
+
     # Allow hardcoding for Railway deployment where no MLflow server exists
     hardcoded = os.getenv("MLFLOW_RUN_ID")
     if hardcoded:
@@ -168,45 +187,245 @@ def list_artifacts_payload(run_id: str):
     return [artifact.model_dump() for artifact in list_artifacts(run_id)]
 
 
-def list_runs_payload(limit: int = 30):
+RUN_DATA_SECTIONS = ("metrics", "params", "tags")
+
+# Finished runs are immutable, so their records are cached by run_id and only
+# runs that finished since the last refresh are fetched from MLflow.
+_runs_lock = threading.Lock()
+_run_records: Dict[str, Dict[str, Any]] = {}
+_run_keys: List[Tuple[int, str]] = []  # (-start_time, run_id), newest first
+_runs_experiment_id: Optional[str] = None
+_runs_max_end_time: Optional[int] = None
+_runs_refreshed_at = 0.0
+_runs_resynced_at = 0.0
+
+
+@dataclass(frozen=True)
+class RunsPage:
+    records: List[Dict[str, Any]]
+    next_cursor: Optional[str]
+    etag: str
+
+
+def _runs_cache_ttl_seconds() -> float:
+    return float(os.getenv("MLFLOW_RUNS_CACHE_TTL_SECONDS", "15"))
+
+
+def _runs_resync_seconds() -> float:
+    return float(os.getenv("MLFLOW_RUNS_RESYNC_SECONDS", "3600"))
+
+
+def _run_record(run: Run) -> Dict[str, Any]:
+    info = run.info
+    data = run.data
+    return {
+        "data": {
+            "metrics": dict(data.metrics or {}),
+            "params": dict(data.params or {}),
+            "tags": dict(data.tags or {}),
+        },
+        "info": {
+            "artifact_uri": getattr(info, "artifact_uri", None),
+            "end_time": info.end_time,
+            "experiment_id": info.experiment_id,
+            "lifecycle_stage": getattr(info, "lifecycle_stage", None),
+            "run_id": info.run_id,
+            "run_uuid": getattr(info, "run_uuid", info.run_id),
+            "start_time": info.start_time,
+            "status": info.status,
+            "user_id": getattr(info, "user_id", None),
+        },
+    }
+
+
+def _search_finished_runs(
+    client: MlflowClient, experiment_id: str, since_end_time: Optional[int]
+) -> List[Run]:
+    from mlflow.entities import RunStatus
+
+    filter_string = f"attributes.status = '{RunStatus.to_string(RunStatus.FINISHED)}'"
+    if since_end_time is not None:
+        # >= so runs ending in the same millisecond are not missed; duplicates
+        # are dropped by run_id.
+        filter_string += f" AND attributes.end_time >= {since_end_time}"
+
+    runs: List[Run] = []
+    page_token = None
+    while True:
+        page = client.search_runs(
+            experiment_ids=[experiment_id],
+            filter_string=filter_string,
+            order_by=["start_time DESC"],
+            max_results=1000,
+            page_token=page_token,
+        )
+        runs.extend(page)
+        page_token = getattr(page, "token", None)
+        if not page_token:
+            return runs
+
+
+def _add_runs_to_cache(runs: Iterable[Run]) -> None:
+    global _runs_max_end_time
+    for run in runs:
+        run_id = run.info.run_id
+        end_time = run.info.end_time
+        if end_time is not None:
+            _runs_max_end_time = max(_runs_max_end_time or end_time, end_time)
+        # Search runs have no model or test metrics to compare.
+        if run_id in _run_records or is_tune_run(run):
+            continue
+        _run_records[run_id] = _run_record(run)
+        bisect.insort(_run_keys, (-(run.info.start_time or 0), run_id))
+
+
+def _refresh_run_cache() -> None:
+    global _runs_experiment_id, _runs_max_end_time
+    global _runs_refreshed_at, _runs_resynced_at
+
+    now = time.monotonic()
+    if (
+        _runs_experiment_id is not None
+        and now - _runs_refreshed_at < _runs_cache_ttl_seconds()
+    ):
+        return
+
     client = get_client()
     experiment = get_experiment(client, get_experiment_name())
     if experiment is None:
-        return []
-    runs = list_recent_finished_runs(client, experiment.experiment_id, limit=limit)
-
-    payload = []
-    for run in runs:
-        info = run.info
-        data = run.data
-        payload.append(
-            {
-                "data": {
-                    "metrics": dict(data.metrics or {}),
-                    "params": dict(data.params or {}),
-                    "tags": dict(data.tags or {}),
-                },
-                "info": {
-                    "artifact_uri": getattr(info, "artifact_uri", None),
-                    "end_time": info.end_time,
-                    "experiment_id": info.experiment_id,
-                    "lifecycle_stage": getattr(info, "lifecycle_stage", None),
-                    "run_id": info.run_id,
-                    "run_uuid": getattr(info, "run_uuid", info.run_id),
-                    "start_time": info.start_time,
-                    "status": info.status,
-                    "user_id": getattr(info, "user_id", None),
-                },
-            }
+        _run_records.clear()
+        _run_keys.clear()
+        _runs_experiment_id = None
+        return
+
+    # A periodic full resync drops runs that were deleted from MLflow.
+    resync = (
+        experiment.experiment_id != _runs_experiment_id
+        or now - _runs_resynced_at >= _runs_resync_seconds()
+    )
+    if resync:
+        runs = _search_finished_runs(client, experiment.experiment_id, None)
+        _run_records.clear()
+        _run_keys.clear()
+        _runs_max_end_time = None
+        _runs_experiment_id = experiment.experiment_id
+        _runs_resynced_at = now
+    else:
+        runs = _search_finished_runs(
+            client, experiment.experiment_id, _runs_max_end_time
         )
-    return payload
+    _add_runs_to_cache(runs)
+    _runs_refreshed_at = now
+
+
+def _encode_cursor(key: Tuple[int, str]) -> str:
+    raw = json.dumps([key[0], key[1]]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def _decode_cursor(cursor: str) -> Tuple[int, str]:
+    try:
+        neg_start_time, run_id = json.loads(base64.urlsafe_b64decode(cursor))
+        return int(neg_start_time), str(run_id)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+
+
+def _parse_fields(fields: Optional[str]) -> Optional[Dict[str, Optional[set]]]:
+    """Parse ``metrics.test_r2,params`` into ``{section: keys or None (all)}``."""
+    if not fields:
+        return None
+    selection: Dict[str, Optional[set]] = {}
+    for field in filter(None, (part.strip() for part in fields.split(","))):
+        section, _, key = field.partition(".")
+        if section not in RUN_DATA_SECTIONS:
+            raise ValueError(
+                f"Unknown field {field!r}; expected one of {RUN_DATA_SECTIONS} "
+                "optionally followed by '.<key>'."
+            )
+        if not key:
+            selection[section] = None
+            continue
+        keys = selection.setdefault(section, set())
+        if keys is not None:
+            keys.add(key)
+    return selection
+
+
+def _project(
+    record: Dict[str, Any], selection: Optional[Dict[str, Optional[set]]]
+) -> Dict[str, Any]:
+    data = record["data"]
+    if selection is None:
+        projected = {section: dict(data[section]) for section in RUN_DATA_SECTIONS}
+    else:
+        projected = {}
+        for section in RUN_DATA_SECTIONS:
+            keys = selection.get(section, set())
+            values = data[section]
+            projected[section] = (
+                dict(values)
+                if keys is None
+                else {k: values[k] for k in keys if k in values}
+            )
+    return {"data": projected, "info": dict(record["info"])}
+
+
+def list_runs_page(
+    limit: int = 30, cursor: Optional[str] = None, fields: Optional[str] = None
+) -> RunsPage:
+    """Return one page of finished runs, newest first.
+
+    ``cursor`` is the ``next_cursor`` of the previous page and ``fields``
+    restricts ``data`` to e.g. ``metrics.test_r2,metrics.test_rmse``. Raises
+    ``ValueError`` for a malformed cursor or field.
+    """
+    selection = _parse_fields(fields)
+    after = _decode_cursor(cursor) if cursor else None
+
+    with _runs_lock:
+        _refresh_run_cache()
+        start = bisect.bisect_right(_run_keys, after) if after else 0
+        keys = _run_keys[start : start + limit]
+        records = [_project(_run_records[run_id], selection) for _, run_id in keys]
+        has_more = start + limit < len(_run_keys)
+
+    next_cursor = _encode_cursor(keys[-1]) if keys and has_more else None
+    # Records are immutable, so ids + projection + cursor identify the page.
+    fingerprint = json.dumps(
+        [
+            [run_id for _, run_id in keys],
+            sorted(
+                (section, sorted(k) if k is not None else None)
+                for section, k in (selection or {}).items()
+            ),
+            next_cursor,
+        ]
+    )
+    etag = f'W/"{hashlib.sha256(fingerprint.encode("utf-8")).hexdigest()[:32]}"'
+    return RunsPage(records=records, next_cursor=next_cursor, etag=etag)
+
+
+def list_runs_payload(limit: int = 30):
+    return list_runs_page(limit=limit).records
 
 
 def load_model_for_run(run_id: str):
+    bundle = bundle_service.get_bundle()
+    if bundle is not None and bundle.run_id == run_id:
+        return bundle.load_model()
+
+    import mlflow.catboost as mlflow_catboost
+
     artifact_path = get_artifact_path()
-    model_uri = f"runs:/{run_id}/{artifact_path}"
     try:
-        return mlflow_catboost.load_model(model_uri)
+        # Run artifacts are immutable, so reuse a copy any worker already pulled.
+        local_dir = artifact_cache.get_cached_artifact(
+            run_id,
+            artifact_path,
+            lambda dst: get_client().download_artifacts(run_id, artifact_path, dst),
+        )
+        return mlflow_catboost.load_model(local_dir)
     except Exception:
         configured_model_dir = get_model_dir()
         if configured_model_dir and Path(configured_model_dir).exists():
@@ -235,6 +454,9 @@ def download_artifact_for_run(
 
 def run_uses_log_target(run_id: str, default: bool = True) -> bool:
     """Read log_target from run params; fallback to default for older runs."""
+    bundle = bundle_service.get_bundle()
+    if bundle is not None and bundle.run_id == run_id:
+        return bundle.log_target
     try:
         run = get_client().get_run(run_id)
         raw = (run.data.params or {}).get("log_target")
@@ -243,3 +465,48 @@ def run_uses_log_target(run_id: str, default: bool = True) -> bool:
         return str(raw).strip().lower() in {"1", "true", "yes", "y"}
     except Exception:
         return default
+
+
+@dataclass(frozen=True)
+class ServingRun:
+    run_id: str
+    log_target: bool
+
+
+# (run, monotonic time it was resolved); one tuple so readers on the event loop
+# never see a run paired with another run's timestamp.
+_serving_lock = threading.Lock()
+_serving_run: Tuple[Optional[ServingRun], float] = (None, 0.0)
+
+
+def _serving_run_ttl_seconds() -> float:
+    return float(os.getenv("SERVING_RUN_TTL_SECONDS", "15"))
+
+
+def cached_serving_run() -> Optional[ServingRun]:
+    """The serving run if it was resolved within the TTL; never calls MLflow."""
+    run, resolved_at = _serving_run
+    if run is not None and time.monotonic() - resolved_at < _serving_run_ttl_seconds():
+        return run
+    return None
+
+
+def resolve_serving_run() -> Optional[ServingRun]:
+    """Resolve the run to serve and its log_target, asking MLflow once per TTL."""
+    global _serving_run
+    with _serving_lock:
+        run = cached_serving_run()
+        if run is not None:
+            return run
+        run_id = get_latest_finished_run_id()
+        if not run_id:
+            return None
+        run = ServingRun(run_id, run_uses_log_target(run_id, default=True))
+        _serving_run = (run, time.monotonic())
+        return run
+
+
+def reset_serving_run() -> None:
+    global _serving_run
+    with _serving_lock:
+        _serving_run = (None, 0.0)
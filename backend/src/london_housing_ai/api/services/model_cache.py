@@ -3,7 +3,9 @@ from __future__ import annotations
 import threading
 from typing import Any, Optional, Tuple
 
+from london_housing_ai.api.services import readiness
 from london_housing_ai.api.services.mlflow_service import load_model_for_run
+from london_housing_ai.utils.metrics import ARTIFACT_RELOADS
 
 _lock = threading.Lock()
 _cached_run_id: Optional[str] = None
@@ -15,7 +17,13 @@ def get_or_load_model(run_id: str):
     with _lock:
         if _cached_model is not None and _cached_run_id == run_id:
             return _cached_model
-        model = load_model_for_run(run_id)
+        try:
+            model = load_model_for_run(run_id)
+        except Exception as e:
+            readiness.mark_load_failed("Model", run_id, e)
+            raise
+        ARTIFACT_RELOADS.labels(component="model").inc()
+        readiness.mark_model_loaded(run_id)
         _cached_run_id = run_id
         _cached_model = model
         return model
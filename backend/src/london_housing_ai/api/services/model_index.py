@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+# Index of run_id -> logged model artifacts dir under ``<tracking_root>/models``,
+# persisted next to the models so restarts and other workers reuse it. Listing
+# ``models/`` only happens when its mtime moves, and an ``MLmodel`` is only
+# re-read for new dirs or unresolved ones whose ``artifacts/`` mtime changed.
+
+INDEX_FILE = ".run_model_index.json"
+INDEX_VERSION = 1
+
+_lock = threading.Lock()
+_indexes: Dict[Path, "RunModelIndex"] = {}
+
+
+def _read_mlmodel_run_id(mlmodel_path: Path) -> Optional[str]:
+    try:
+        content = mlmodel_path.read_text(encoding="utf-8")
+    except Exception:
+        return None
+    for line in content.splitlines():
+        if line.startswith("run_id:"):
+            return line.split(":", 1)[1].strip()
+    return None
+
+
+class RunModelIndex:
+    def __init__(self, tracking_root: Path):
+        self.models_dir = tracking_root / "models"
+        self.index_path = tracking_root / INDEX_FILE
+        self.models_mtime_ns: Optional[int] = None
+        # model dir name -> {"mtime_ns": int, "run_id": str | None}
+        self.entries: Dict[str, Dict[str, object]] = {}
+        self.by_run_id: Dict[str, str] = {}
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            with self.index_path.open(encoding="utf-8") as f:
+                payload = json.load(f)
+        except (OSError, ValueError):
+            return
+        if payload.get("version") != INDEX_VERSION:
+            return
+        self.models_mtime_ns = payload.get("models_mtime_ns")
+        self.entries = payload.get("entries", {})
+        self._rebuild_reverse_map()
+
+    def _rebuild_reverse_map(self) -> None:
+        self.by_run_id = {
+            str(entry["run_id"]): name
+            for name, entry in self.entries.items()
+            if entry.get("run_id")
+        }
+
+    def _save(self) -> None:
+        payload = {
+            "version": INDEX_VERSION,
+            "models_mtime_ns": self.models_mtime_ns,
+            "entries": self.entries,
+        }
+        tmp_path = self.index_path.with_name(f"{INDEX_FILE}.{os.getpid()}.tmp")
+        try:
+            with tmp_path.open("w", encoding="utf-8") as f:
+                json.dump(payload, f)
+            os.replace(tmp_path, self.index_path)
+        except OSError:
+            # A read-only tracking root still gets the in-memory index.
+            tmp_path.unlink(missing_ok=True)
+
+    def refresh(self) -> None:
+        """Re-read only model dirs that are new, gone, changed or still unresolved."""
+        try:
+            models_mtime_ns = self.models_dir.stat().st_mtime_ns
+        except OSError:
+            self.entries, self.by_run_id, self.models_mtime_ns = {}, {}, None
+            return
+
+        listing_changed = models_mtime_ns != self.models_mtime_ns
+        names = (
+            {entry.name for entry in os.scandir(self.models_dir) if entry.is_dir()}
+            if listing_changed
+            else set(self.entries)
+        )
+        changed = listing_changed
+        for name in set(self.entries) - names:
+            del self.entries[name]
+        for name in names:
+            entry = self.entries.get(name)
+            if entry is not None and entry.get("run_id"):
+                continue
+            artifacts_dir = self.models_dir / name / "artifacts"
+            try:
+                mtime_ns = artifacts_dir.stat().st_mtime_ns
+            except OSError:
+                continue
+            if entry is not None and entry.get("mtime_ns") == mtime_ns:
+                continue
+            run_id = _read_mlmodel_run_id(artifacts_dir / "MLmodel")
+            self.entries[name] = {"mtime_ns": mtime_ns, "run_id": run_id}
+            changed = True
+
+        self.models_mtime_ns = models_mtime_ns
+        if changed:
+            self._rebuild_reverse_map()
+            self._save()
+
+    def lookup(self, run_id: str) -> Optional[Path]:
+        name = self.by_run_id.get(run_id)
+        if name is not None:
+            artifacts_dir = self.models_dir / name / "artifacts"
+            if (artifacts_dir / "MLmodel").exists():
+                return artifacts_dir
+        self.refresh()
+        name = self.by_run_id.get(run_id)
+        return self.models_dir / name / "artifacts" if name is not None else None
+
+
+def find_model_artifacts_dir(tracking_root: Path, run_id: str) -> Optional[Path]:
+    """Return ``<tracking_root>/models/<id>/artifacts`` logged by ``run_id``."""
+    with _lock:
+        index = _indexes.get(tracking_root)
+        if index is None:
+            index = _indexes[tracking_root] = RunModelIndex(tracking_root)
+        return index.lookup(run_id)
@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Deque, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from london_housing_ai.utils.logger import get_logger
+from london_housing_ai.utils.metrics import PREDICTION_LOG_RECORDS
+
+# Records what /predict was asked and answered, for drift analysis and replay.
+# ``record`` only appends a tuple to a bounded in-memory buffer (the features
+# frame is kept as-is, not converted); a background thread swaps the buffer
+# out every PREDICTION_LOG_FLUSH_SECONDS and writes it as Parquet:
+#
+#     <PREDICTION_LOG_DIR>/date=YYYY-MM-DD/hour=HH/part-<ms>-<id>.parquet
+#
+# The buffer is a ring bounded by PREDICTION_LOG_MAX_BYTES: once it is over
+# budget the oldest records are dropped (and counted) rather than growing memory
+# or waiting for the disk, so what survives an overload is the latest traffic.
+
+logger = get_logger(__name__)
+
+# (unix timestamp, run_id, one-row features frame, prediction, latency_ms,
+#  estimated bytes)
+_Record = Tuple[float, str, pd.DataFrame, float, float, int]
+
+
+class PredictionLogSink:
+    def __init__(
+        self,
+        root: Path,
+        max_bytes: int = 32 * 1024 * 1024,
+        flush_interval_seconds: float = 10.0,
+    ):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.flush_interval_seconds = flush_interval_seconds
+        self._buffer: Deque[_Record] = deque()
+        self._buffered_bytes = 0
+        self._record_width = -1
+        self._record_bytes = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def record(
+        self,
+        run_id: str,
+        features: pd.DataFrame,
+        prediction: float,
+        latency_ms: float,
+    ) -> int:
+        """Buffer one prediction; returns how many older records it evicted."""
+        dropped = 0
+        with self._lock:
+            nbytes = self._estimate_bytes(features)
+            self._buffer.append(
+                (time.time(), run_id, features, prediction, latency_ms, nbytes)
+            )
+            self._buffered_bytes += nbytes
+            while self._buffered_bytes > self.max_bytes and len(self._buffer) > 1:
+                self._buffered_bytes -= self._buffer.popleft()[5]
+                dropped += 1
+        PREDICTION_LOG_RECORDS.labels(outcome="buffered").inc()
+        if dropped:
+            PREDICTION_LOG_RECORDS.labels(outcome="dropped").inc(dropped)
+        if self._thread is None:
+            self.start()
+        return dropped
+
+    def _estimate_bytes(self, features: pd.DataFrame) -> int:
+        # Measuring a frame deeply costs more than the rest of ``record``, and
+        # every record from one model has the same columns, so one measurement
+        # stands in for all of them until the width changes.
+        if features.shape[1] != self._record_width:
+            self._record_width = features.shape[1]
+            self._record_bytes = int(features.memory_usage(deep=True).sum())
+        return self._record_bytes
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="prediction-log-flusher", daemon=True
+            )
+            self._thread.start()
+
+    def close(self) -> None:
+        """Stop the flusher thread after writing whatever is still buffered."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._stop.set()
+            thread.join()
+        self.flush()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.flush_interval_seconds):
+            self.flush()
+
+    def flush(self) -> int:
+        """Write buffered records to Parquet; returns the number written."""
+        with self._lock:
+            batch, self._buffer = self._buffer, deque()
+            self._buffered_bytes = 0
+        if not batch:
+            return 0
+        try:
+            self._write(batch)
+        except Exception:
+            PREDICTION_LOG_RECORDS.labels(outcome="failed").inc(len(batch))
+            logger.exception(f"Failed to write {len(batch)} prediction log records")
+            return 0
+        PREDICTION_LOG_RECORDS.labels(outcome="written").inc(len(batch))
+        return len(batch)
+
+    def _write(self, batch: Sequence[_Record]) -> None:
+        features = pd.concat([r[2] for r in batch], ignore_index=True)
+        meta = pd.DataFrame(
+            {
+                "timestamp": pd.to_datetime([r[0] for r in batch], unit="s", utc=True),
+                "run_id": [r[1] for r in batch],
+                "prediction": [r[3] for r in batch],
+                "latency_ms": [r[4] for r in batch],
+            }
+        )
+        frame = pd.concat(
+            [meta, features.drop(columns=meta.columns, errors="ignore")], axis=1
+        )
+        hours = frame["timestamp"].dt.floor("h")
+        for hour, part in frame.groupby(hours, sort=True):
+            directory = self.root / f"date={hour:%Y-%m-%d}" / f"hour={hour:%H}"
+            directory.mkdir(parents=True, exist_ok=True)
+            stamp = int(datetime.now(timezone.utc).timestamp() * 1000)
+            name = f"part-{stamp}-{uuid.uuid4().hex[:8]}.parquet"
+            tmp = directory / f".{name}.tmp"
+            part.to_parquet(tmp, index=False)
+            # Readers globbing *.parquet never see a half-written file.
+            os.replace(tmp, directory / name)
+
+
+_sink: Optional[PredictionLogSink] = None
+_sink_lock = threading.Lock()
+
+
+def get_sink() -> Optional[PredictionLogSink]:
+    """The process-wide sink, or None when PREDICTION_LOG_DIR is unset."""
+    global _sink
+    if _sink is not None:
+        return _sink
+    root = os.getenv("PREDICTION_LOG_DIR")
+    if not root:
+        return None
+    with _sink_lock:
+        if _sink is None:
+            _sink = PredictionLogSink(
+                Path(root),
+                max_bytes=int(
+                    os.getenv("PREDICTION_LOG_MAX_BYTES", str(32 * 1024 * 1024))
+                ),
+                flush_interval_seconds=float(
+                    os.getenv("PREDICTION_LOG_FLUSH_SECONDS", "10")
+                ),
+            )
+        return _sink
+
+
+def close() -> None:
+    global _sink
+    with _sink_lock:
+        sink, _sink = _sink, None
+    if sink is not None:
+        sink.close()
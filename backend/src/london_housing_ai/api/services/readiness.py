@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, replace
+from typing import Optional
+
+# Updated by the model/transformer caches whenever they load (or fail to load)
+# an artifact, so probes can read it without touching MLflow or the disk.
+
+
+@dataclass(frozen=True)
+class ReadinessSnapshot:
+    model_run_id: Optional[str] = None
+    transformer_run_id: Optional[str] = None
+    detail: Optional[str] = "Prediction dependencies not loaded yet"
+    warming: bool = False
+    updated_at: float = 0.0
+
+    @property
+    def ready(self) -> bool:
+        return self.model_run_id is not None and self.transformer_run_id is not None
+
+    @property
+    def status(self) -> str:
+        if self.ready:
+            return "ready"
+        return "warming" if self.warming else "not_ready"
+
+
+_lock = threading.Lock()
+_snapshot = ReadinessSnapshot()
+
+
+def get_snapshot() -> ReadinessSnapshot:
+    return _snapshot
+
+
+def _update(**changes) -> None:
+    global _snapshot
+    with _lock:
+        _snapshot = replace(_snapshot, updated_at=time.time(), **changes)
+
+
+def mark_model_loaded(run_id: str) -> None:
+    _update(model_run_id=run_id, detail=None)
+
+
+def mark_transformer_loaded(run_id: str) -> None:
+    _update(transformer_run_id=run_id, detail=None)
+
+
+def mark_warming(warming: bool, detail: Optional[str] = None) -> None:
+    if detail is None:
+        _update(warming=warming)
+    else:
+        _update(warming=warming, detail=detail)
+
+
+def mark_unavailable(detail: str) -> None:
+    # A failed reload keeps the previously loaded artifacts serving, so only the
+    # detail changes; readiness is lost only if nothing was ever loaded.
+    _update(detail=detail)
+
+
+def mark_load_failed(component: str, run_id: Optional[str], error: Exception) -> None:
+    mark_unavailable(f"{component} not loaded for run '{run_id}': {error}")
+
+
+def reset() -> None:
+    global _snapshot
+    with _lock:
+        _snapshot = ReadinessSnapshot()
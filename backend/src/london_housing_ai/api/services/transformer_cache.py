@@ -1,22 +1,35 @@
 from __future__ import annotations
 
 import os
-import tempfile
 import threading
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 from urllib.parse import urlparse
 
-from london_housing_ai.api.services import mlflow_service
+from london_housing_ai.api.services import (
+    artifact_cache,
+    bundle_service,
+    mlflow_service,
+    readiness,
+)
+from london_housing_ai.lookup_tables import (
+    BINARY_LOOKUP_TABLE_FILE,
+    LOOKUP_TABLE_FILE,
+)
 from london_housing_ai.serve_transformer import ServingTransformer
+from london_housing_ai.utils.metrics import ARTIFACT_RELOADS
 
 _lock = threading.Lock()
 _cached_run_id: Optional[str] = None
 _cached_transformer: Optional[ServingTransformer] = None
 
 
-def _lookup_artifact_name() -> str:
-    return os.getenv("LOOKUP_TABLE_ARTIFACT", "lookup_tables.json")
+def _lookup_artifact_names() -> List[str]:
+    configured = os.getenv("LOOKUP_TABLE_ARTIFACT")
+    if configured:
+        return [configured]
+    # Prefer the memory-mapped binary tables; older runs only logged JSON.
+    return [BINARY_LOOKUP_TABLE_FILE, LOOKUP_TABLE_FILE]
 
 
 def _tracking_root_path() -> Optional[Path]:
@@ -29,12 +42,11 @@ def _tracking_root_path() -> Optional[Path]:
     return Path(parsed.path)
 
 
-def _local_lookup_path(run_id: str) -> Path:
+def _local_lookup_path(run_id: str, lookup_name: str) -> Path:
     configured_file = os.getenv("LOOKUP_TABLE_FILE")
     if configured_file:
         return Path(configured_file)
 
-    lookup_name = _lookup_artifact_name()
     tracking_root = _tracking_root_path()
     if tracking_root is not None:
         return tracking_root / run_id / "artifacts" / lookup_name
@@ -42,20 +54,33 @@ def _local_lookup_path(run_id: str) -> Path:
 
 
 def _download_lookup_table(run_id: str) -> str:
-    lookup_name = _lookup_artifact_name()
-    try:
-        return mlflow_service.download_artifact_for_run(
-            run_id, lookup_name, tempfile.gettempdir()
-        )
-    except Exception as mlflow_error:
-        local_path = _local_lookup_path(run_id)
+    bundle = bundle_service.get_bundle()
+    if bundle is not None and bundle.run_id == run_id:
+        return str(bundle.lookup_path)
+
+    lookup_names = _lookup_artifact_names()
+    mlflow_error: Optional[Exception] = None
+    for lookup_name in lookup_names:
+        try:
+            return artifact_cache.get_cached_artifact(
+                run_id,
+                lookup_name,
+                lambda dst: mlflow_service.download_artifact_for_run(
+                    run_id, lookup_name, dst
+                ),
+            )
+        except Exception as e:
+            mlflow_error = e
+
+    local_paths = [_local_lookup_path(run_id, name) for name in lookup_names]
+    for local_path in local_paths:
         if local_path.exists():
             return str(local_path)
-        raise RuntimeError(
-            "Failed to load lookup table artifact "
-            f"'{lookup_name}' for run '{run_id}': {mlflow_error}; "
-            f"local fallback '{local_path}' not found"
-        ) from mlflow_error
+    raise RuntimeError(
+        "Failed to load lookup table artifact "
+        f"{lookup_names} for run '{run_id}': {mlflow_error}; "
+        f"local fallback {[str(p) for p in local_paths]} not found"
+    ) from mlflow_error
 
 
 def get_or_load_transformer(run_id: str) -> ServingTransformer:
@@ -63,8 +88,14 @@ def get_or_load_transformer(run_id: str) -> ServingTransformer:
     with _lock:
         if _cached_transformer is not None and _cached_run_id == run_id:
             return _cached_transformer
-        lookup_path = _download_lookup_table(run_id)
-        transformer = ServingTransformer(lookup_path)
+        try:
+            lookup_path = _download_lookup_table(run_id)
+            transformer = ServingTransformer(lookup_path)
+        except Exception as e:
+            readiness.mark_load_failed("Transformer", run_id, e)
+            raise
+        ARTIFACT_RELOADS.labels(component="transformer").inc()
+        readiness.mark_transformer_loaded(run_id)
         _cached_run_id = run_id
         _cached_transformer = transformer
         return transformer
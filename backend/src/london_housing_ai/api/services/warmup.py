@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import random
+
+from london_housing_ai.api.services import mlflow_service, readiness
+from london_housing_ai.api.services.model_cache import get_or_load_model
+from london_housing_ai.api.services.transformer_cache import get_or_load_transformer
+from london_housing_ai.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def _max_attempts() -> int:
+    # 0 keeps retrying until the app shuts down.
+    return int(os.getenv("WARMUP_MAX_ATTEMPTS", "0"))
+
+
+def _initial_backoff_seconds() -> float:
+    return float(os.getenv("WARMUP_INITIAL_BACKOFF_SECONDS", "1"))
+
+
+def _max_backoff_seconds() -> float:
+    return float(os.getenv("WARMUP_MAX_BACKOFF_SECONDS", "60"))
+
+
+def _synthetic_request(transformer) -> dict:
+    districts = getattr(transformer, "districts", None) or ["Westminster"]
+    return {
+        "district": districts[0],
+        "property_type": "F",
+        "is_new_build": "N",
+        "is_leasehold": "N",
+    }
+
+
+def warm_up_once() -> str:
+    """Load the latest run's model and transformer and run one prediction.
+
+    The synthetic prediction pays CatBoost's and pandas' lazy initialisation
+    so the first real request does not. Returns the warmed run id.
+    """
+    # Also primes the serving run cache that /predict reads without I/O.
+    serving = mlflow_service.resolve_serving_run()
+    if serving is None:
+        raise RuntimeError("No finished runs found")
+    model = get_or_load_model(serving.run_id)
+    transformer = get_or_load_transformer(serving.run_id)
+    model.predict(transformer.transform(_synthetic_request(transformer)))
+    return serving.run_id
+
+
+async def run_warmup() -> None:
+    """Warm up in the background, retrying with capped exponential backoff."""
+    backoff = _initial_backoff_seconds()
+    max_attempts = _max_attempts()
+    attempt = 0
+    readiness.mark_warming(True, detail="Warming up prediction dependencies")
+    try:
+        while True:
+            attempt += 1
+            try:
+                run_id = await asyncio.to_thread(warm_up_once)
+                logger.info(f"Warm-up finished for run '{run_id}' (attempt {attempt})")
+                return
+            except Exception as e:
+                readiness.mark_unavailable(f"Warm-up attempt {attempt} failed: {e}")
+                if max_attempts and attempt >= max_attempts:
+                    logger.exception(f"Warm-up gave up after {attempt} attempts")
+                    return
+                delay = backoff * random.uniform(0.5, 1.0)
+                logger.warning(
+                    f"Warm-up attempt {attempt} failed ({e}); retrying in {delay:.1f}s"
+                )
+                await asyncio.sleep(delay)
+                backoff = min(backoff * 2, _max_backoff_seconds())
+    finally:
+        readiness.mark_warming(False)
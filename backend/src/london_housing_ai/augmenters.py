@@ -5,7 +5,7 @@ from pandas import DataFrame
 
 from london_housing_ai.utils.logger import get_logger
 
-logger = get_logger()
+logger = get_logger(__name__)
 """
     Add median floor-area (ft²) from EPC data to the main PPD DataFrame.
 
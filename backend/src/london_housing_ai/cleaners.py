@@ -6,7 +6,7 @@ from pandas import DataFrame, Series
 from london_housing_ai.utils.logger import get_logger
 
 POSTCODE_CLEAN = "postcode_clean"
-logger = get_logger()
+logger = get_logger(__name__)
 
 
 def canon_postcode(series: Series) -> Series:
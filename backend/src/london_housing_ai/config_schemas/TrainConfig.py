@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import List
+from typing import List, Optional
 
 
 @dataclass(frozen=True)
@@ -16,3 +16,9 @@ class TrainConfig:
     depth: int = 8
     lr: float = 0.05
     early_stop: int = 200
+    l2_leaf_reg: float = 3.0
+    # Rows sampled for train metrics; None scores the whole train split.
+    train_metrics_sample: Optional[int] = None
+    # Train from quantized pools on disk instead of in-memory DataFrames.
+    quantized_pools: bool = False
+    border_count: Optional[int] = None
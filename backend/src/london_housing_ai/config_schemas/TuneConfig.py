@@ -0,0 +1,18 @@
+from dataclasses import dataclass, field
+from typing import List
+
+
+@dataclass(frozen=True)
+class TuneConfig:
+    num_samples: int = 16
+    depth: List[int] = field(default_factory=lambda: [6, 8, 10])
+    lr_min: float = 0.02
+    lr_max: float = 0.2
+    l2_leaf_reg_min: float = 1.0
+    l2_leaf_reg_max: float = 10.0
+    cpus_per_trial: int = 2
+    # ASHA: trials report every report_every boosting iterations and may be
+    # stopped from grace_period iterations on.
+    report_every: int = 50
+    grace_period: int = 500
+    reduction_factor: int = 3
@@ -9,7 +9,7 @@ from pandas import DataFrame
 from london_housing_ai.models import PriceModel
 from london_housing_ai.utils.logger import get_logger
 
-logger = get_logger()
+logger = get_logger(__name__)
 
 
 class ExperimentLogger:
@@ -16,7 +16,7 @@ BACKOFF_FACTOR = 2
 
 # create concurrent async coroutine
 _sem = asyncio.Semaphore(MAX_CONCURRENCY)
-logger = get_logger()
+logger = get_logger(__name__)
 
 
 async def get_district_from_postcode(
@@ -203,7 +203,7 @@ def extract_borough_price_trend(
     Returns:
         pd.DataFrame: data frame which "bourouch_price_trend" column is added.
     """
-    district_medians = df.groupby(extract_from)["price"].median()
+    district_medians = price_medians_by(df, extract_from)
 
     df[new_col] = df[extract_from].map(district_medians)
     return df
@@ -238,8 +238,7 @@ def extract_yearly_district_price_trend(
     """
     district_yearly_medians = (
         # create a new grouped object prices grouped by district and years sold
-        df.groupby(by=[district_col, years_col])["price"]
-        .median()  # median of each group
+        price_medians_by(df, [district_col, years_col])
         .reset_index()
         .rename(columns={"price": new_col})
     )
@@ -312,7 +311,7 @@ def extract_avg_price_last_6months(
     """
     df_sorted_by_date = df.sort_values(date_col)
     # median price grouped by district (e.g. {"camden": 400k, "hackney": 350k, ...})
-    district_medians = df.groupby("district")["price"].median()
+    district_medians = price_medians_by(df, "district")
 
     df_sorted_by_date[new_col] = (
         df_sorted_by_date.groupby(district_col, group_keys=False)
@@ -335,6 +334,45 @@ def _rolling_median(group: pd.DataFrame, date_col: str) -> pd.Series:
     return group.set_index(date_col)["price"].rolling("180D", closed="left").median()
 
 
+def price_medians_by(df: pd.DataFrame, by: str | List[str]) -> pd.Series:
+    """Median price per group; the aggregation behind every price-trend feature."""
+    return df.groupby(by, observed=True)["price"].median()
+
+
+def recent_price_medians(
+    df: pd.DataFrame, date_col: str, district_col: str, months: int = 6
+) -> pd.Series:
+    """Median price per district over the last ``months`` of the dataset."""
+    cutoff = df[date_col].max() - pd.DateOffset(months=months)
+    return price_medians_by(df[df[date_col] >= cutoff], district_col)
+
+
+def build_lookup_tables(
+    df: pd.DataFrame,
+    district_col: str = "district",
+    years_col: str = "sold_year",
+    date_col: str = "date",
+) -> Dict[str, Dict[str, float]]:
+    """The serving ``lookup_tables.json`` payload for an engineered frame."""
+    yearly = price_medians_by(df, [district_col, years_col])
+    return {
+        "borough_price_trend": {
+            str(district): float(median)
+            for district, median in price_medians_by(df, district_col).items()
+        },
+        "district_yearly_medians": {
+            f"{district}_{int(year)}": float(median)
+            for (district, year), median in yearly.items()
+        },
+        "avg_price_last_half": {
+            str(district): float(median)
+            for district, median in recent_price_medians(
+                df, date_col, district_col
+            ).items()
+        },
+    }
+
+
 def extract_interaction_features(
     df: pd.DataFrame, combi_col_name: str, col1: str, col2: str, sep: str = "_"
 ) -> pd.DataFrame:
@@ -11,7 +11,7 @@ from google.cloud import storage
 
 from london_housing_ai.utils.logger import get_logger
 
-logger = get_logger()
+logger = get_logger(__name__)
 
 
 def write_df_to_partitioned_parquet(
@@ -0,0 +1,184 @@
+"""Declared Postgres schema for the gold (feature-engineered) dataset tables.
+
+Known columns get explicit, compact types instead of whatever pandas infers:
+dates are DATE, year/month are SMALLINT and categorical columns are coded as
+enum types built from the values actually loaded. Tables are range
+partitioned by ``sold_year`` and indexed on (district, date), so the lookup
+table exports and district/date filters only touch the partitions they need.
+Columns this module does not know about keep a type inferred from the frame.
+"""
+
+import uuid
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+from pandas.api import types as ptypes
+
+MAX_POSTGRES_IDENTIFIER_LENGTH = 63
+MAX_ENUM_LABEL_BYTES = 63
+
+GOLD_COLUMN_TYPES: Dict[str, str] = {
+    "price": "DOUBLE PRECISION",
+    "date": "DATE",
+    "sold_year": "SMALLINT",
+    "sold_month": "SMALLINT",
+    "postcode": "TEXT",
+    "county": "TEXT",
+    "borough_price_trend": "DOUBLE PRECISION",
+    "district_yearly_medians": "DOUBLE PRECISION",
+    "avg_price_last_half": "DOUBLE PRECISION",
+}
+CATEGORICAL_COLUMNS = frozenset(
+    {
+        "property_type",
+        "is_new_build",
+        "is_leasehold",
+        "district",
+        "advanced_property_type",
+        "property_type_and_tenure",
+        "property_type_and_district",
+    }
+)
+PARTITION_COLUMN = "sold_year"
+INDEX_COLUMNS = ("district", "date")
+
+# A declared type only applies when the frame's column can be loaded into it.
+_COMPATIBLE: Dict[str, Callable[[pd.Series], bool]] = {
+    "DATE": ptypes.is_datetime64_any_dtype,
+    "SMALLINT": ptypes.is_integer_dtype,
+    "DOUBLE PRECISION": ptypes.is_numeric_dtype,
+    "TEXT": lambda series: True,
+}
+
+
+def quote_ident(identifier: str) -> str:
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def _quote_literal(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
+
+
+def _with_suffix(name: str, suffix: str) -> str:
+    return name[: MAX_POSTGRES_IDENTIFIER_LENGTH - len(suffix)] + suffix
+
+
+def partition_suffix(year: Optional[int]) -> str:
+    return "_pdefault" if year is None else f"_p{year}"
+
+
+def partition_name(table_name: str, year: Optional[int]) -> str:
+    """Name of the ``sold_year`` partition of ``table_name`` (None: default)."""
+    return _with_suffix(table_name, partition_suffix(year))
+
+
+def index_name(table_name: str, partition: str = "") -> str:
+    """Name of the (district, date) index of ``table_name`` or one partition.
+
+    ``partition`` is that partition's ``partition_suffix``; keeping it whole
+    keeps the partitions' index names apart when the table name is truncated.
+    """
+    return _with_suffix(table_name, f"{partition}_idx")
+
+
+def _inferred_type(series: pd.Series) -> str:
+    if ptypes.is_bool_dtype(series):
+        return "BOOLEAN"
+    if ptypes.is_integer_dtype(series):
+        return "BIGINT"
+    if ptypes.is_float_dtype(series):
+        return "DOUBLE PRECISION"
+    if ptypes.is_datetime64_any_dtype(series):
+        return "TIMESTAMP"
+    return "TEXT"
+
+
+def _enum_labels(series: pd.Series) -> Optional[List[str]]:
+    if ptypes.is_numeric_dtype(series) or ptypes.is_datetime64_any_dtype(series):
+        return None
+    labels = sorted({str(v) for v in series.dropna().unique()})
+    if any(len(label.encode()) > MAX_ENUM_LABEL_BYTES for label in labels):
+        return None
+    return labels
+
+
+@dataclass
+class GoldTableLayout:
+    table_name: str
+    column_types: Dict[str, str]
+    enum_labels: Dict[str, List[str]] = field(default_factory=dict)
+    partition_years: List[Optional[int]] = field(default_factory=list)
+    index_columns: List[str] = field(default_factory=list)
+
+    @property
+    def partitioned(self) -> bool:
+        return bool(self.partition_years)
+
+    @property
+    def partition_names(self) -> List[str]:
+        return [partition_name(self.table_name, y) for y in self.partition_years]
+
+    def create_statements(self, unlogged: bool = True) -> List[str]:
+        """DDL for the enum types, the table and its partitions."""
+        statements = [
+            f"CREATE TYPE {quote_ident(name)} AS ENUM "
+            f"({', '.join(_quote_literal(label) for label in labels)})"
+            for name, labels in self.enum_labels.items()
+        ]
+        columns = ", ".join(
+            f"{quote_ident(col)} {sql_type}"
+            for col, sql_type in self.column_types.items()
+        )
+        table = quote_ident(self.table_name)
+        kind = "UNLOGGED TABLE" if unlogged else "TABLE"
+        if not self.partitioned:
+            return statements + [f"CREATE {kind} {table} ({columns})"]
+
+        statements.append(
+            f"CREATE TABLE {table} ({columns}) "
+            f"PARTITION BY RANGE ({quote_ident(PARTITION_COLUMN)})"
+        )
+        # Only partitions hold rows, so only they can be UNLOGGED.
+        for year, name in zip(self.partition_years, self.partition_names):
+            bounds = (
+                "DEFAULT"
+                if year is None
+                else f"FOR VALUES FROM ({year}) TO ({year + 1})"
+            )
+            statements.append(
+                f"CREATE {kind} {quote_ident(name)} PARTITION OF {table} {bounds}"
+            )
+        return statements
+
+    def index_statements(self) -> List[str]:
+        if not self.index_columns:
+            return []
+        columns = ", ".join(quote_ident(c) for c in self.index_columns)
+        return [f"CREATE INDEX ON {quote_ident(self.table_name)} ({columns})"]
+
+
+def plan_gold_table(df: pd.DataFrame, table_name: str) -> GoldTableLayout:
+    """Work out the declared layout of ``df`` stored as ``table_name``."""
+    layout = GoldTableLayout(table_name=table_name, column_types={})
+    # Enum types outlive table renames, so they get names of their own.
+    enum_prefix = f"london_housing_enum_{uuid.uuid4().hex[:16]}_"
+    for position, col in enumerate(df.columns):
+        series = df[col]
+        declared = GOLD_COLUMN_TYPES.get(col)
+        labels = _enum_labels(series) if col in CATEGORICAL_COLUMNS else None
+        if labels is not None:
+            type_name = f"{enum_prefix}{position}"
+            layout.enum_labels[type_name] = labels
+            layout.column_types[col] = quote_ident(type_name)
+        elif declared is not None and _COMPATIBLE[declared](series):
+            layout.column_types[col] = declared
+        else:
+            layout.column_types[col] = _inferred_type(series)
+
+    if layout.column_types.get(PARTITION_COLUMN) == "SMALLINT":
+        years = df[PARTITION_COLUMN].dropna().unique().tolist()
+        layout.partition_years = [*sorted(int(y) for y in years), None]
+    if all(c in layout.column_types for c in INDEX_COLUMNS):
+        layout.index_columns = list(INDEX_COLUMNS)
+    return layout
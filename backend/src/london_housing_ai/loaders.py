@@ -10,6 +10,7 @@ from london_housing_ai.config_schemas.CleaningConfig import CleaningConfig
 from london_housing_ai.config_schemas.FeatureConfig import CityFilter, FeatureConfig
 from london_housing_ai.config_schemas.ParquetConfig import ParquetConfig
 from london_housing_ai.config_schemas.TrainConfig import TrainConfig
+from london_housing_ai.config_schemas.TuneConfig import TuneConfig
 
 
 def load_dataset(
@@ -78,6 +79,17 @@ def load_train_config(path: Path) -> TrainConfig:
         raise KeyError(f"train configuration field missing. {e}")
 
 
+def load_tune_config(path: Path) -> TuneConfig:
+    raw_config = _load_config(path).get("tune") or {}
+
+    # Remove keys with None values so dataclass uses its defaults
+    config_args = {k: v for k, v in raw_config.items() if v is not None}
+    try:
+        return TuneConfig(**config_args)
+    except Exception as e:
+        raise KeyError(f"tune configuration field missing. {e}")
+
+
 def load_fe_config(path: Path) -> FeatureConfig:
     raw_config = _load_config(path)
     try:
@@ -0,0 +1,215 @@
+"""Serving lookup tables in JSON or compact binary form.
+
+``lookup_tables.json`` keys its medians by strings such as ``"Camden_2024"``.
+The binary form stores the same values as dense little-endian float64 arrays
+indexed by an integer district code (and year offset), preceded by a small
+JSON header holding the district vocabulary:
+
+    magic "LHLT" | version u16 | reserved u16 | header length u32 | pad to 16
+    header JSON (districts, year_min, n_years, global median)
+    float64 data, 8-byte aligned: borough_price_trend[district],
+        avg_price_last_half[district], district_yearly_medians[district, year]
+
+Missing cells are NaN. Binary files are opened with ``np.memmap`` in read-only
+mode, so forked uvicorn workers share the same page-cache pages instead of each
+holding its own parsed dicts.
+"""
+
+import json
+import struct
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from london_housing_ai.utils.create_files import generate_artifact_from_payload
+
+LOOKUP_TABLE_FILE = "lookup_tables.json"
+BINARY_LOOKUP_TABLE_FILE = "lookup_tables.bin"
+
+BINARY_MAGIC = b"LHLT"
+BINARY_FORMAT_VERSION = 1
+_PREAMBLE = struct.Struct("<4sHHI")
+_HEADER_OFFSET = 16
+_DTYPE = np.dtype("<f8")
+
+
+def _split_district_year(key: str) -> Tuple[str, int]:
+    district, sep, year = key.rpartition("_")
+    if not sep or not year.lstrip("-").isdigit():
+        raise ValueError(f"Malformed district_yearly_medians key: {key!r}")
+    return district, int(year)
+
+
+def _align(offset: int, alignment: int = 8) -> int:
+    return (offset + alignment - 1) // alignment * alignment
+
+
+class LookupTables:
+    """Array-backed view of the three serving lookup tables."""
+
+    def __init__(
+        self,
+        districts: List[str],
+        year_min: int,
+        borough_price_trend: np.ndarray,
+        avg_price_last_half: np.ndarray,
+        district_yearly_medians: np.ndarray,
+        global_price_median: float,
+    ):
+        self.districts = districts
+        self.year_min = year_min
+        self.district_codes = {name: code for code, name in enumerate(districts)}
+        self.borough_price_trend = borough_price_trend
+        self.avg_price_last_half = avg_price_last_half
+        self.district_yearly_medians = district_yearly_medians
+        self.global_price_median = global_price_median
+
+    @classmethod
+    def from_dict(cls, tables: Mapping[str, Mapping[str, float]]) -> "LookupTables":
+        borough = tables["borough_price_trend"]
+        recent = tables["avg_price_last_half"]
+        yearly = {
+            _split_district_year(key): value
+            for key, value in tables["district_yearly_medians"].items()
+        }
+
+        districts = sorted(set(borough) | set(recent) | {d for d, _ in yearly})
+        codes = {name: code for code, name in enumerate(districts)}
+        years = [year for _, year in yearly]
+        year_min = min(years, default=0)
+        n_years = max(years, default=-1) - year_min + 1
+
+        borough_arr = np.full(len(districts), np.nan, dtype=_DTYPE)
+        recent_arr = np.full(len(districts), np.nan, dtype=_DTYPE)
+        yearly_arr = np.full((len(districts), n_years), np.nan, dtype=_DTYPE)
+        for name, value in borough.items():
+            borough_arr[codes[name]] = value
+        for name, value in recent.items():
+            recent_arr[codes[name]] = value
+        for (name, year), value in yearly.items():
+            yearly_arr[codes[name], year - year_min] = value
+
+        return cls(
+            districts=districts,
+            year_min=year_min,
+            borough_price_trend=borough_arr,
+            avg_price_last_half=recent_arr,
+            district_yearly_medians=yearly_arr,
+            # Same fallback the JSON transformer has always used.
+            global_price_median=float(np.median(list(borough.values()))),
+        )
+
+    @classmethod
+    def from_json(cls, path: Path) -> "LookupTables":
+        with Path(path).open(encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+    @classmethod
+    def from_binary(cls, path: Path) -> "LookupTables":
+        path = Path(path)
+        with path.open("rb") as f:
+            magic, version, _, header_len = _PREAMBLE.unpack(f.read(_PREAMBLE.size))
+            if magic != BINARY_MAGIC:
+                raise RuntimeError(f"Not a binary lookup table file: {path}")
+            if version != BINARY_FORMAT_VERSION:
+                raise RuntimeError(
+                    f"Unsupported binary lookup table version={version}; "
+                    f"expected {BINARY_FORMAT_VERSION}."
+                )
+            f.seek(_HEADER_OFFSET)
+            header = json.loads(f.read(header_len).decode("utf-8"))
+
+        n_districts = len(header["districts"])
+        n_years = header["n_years"]
+        data_offset = _align(_HEADER_OFFSET + header_len)
+        count = n_districts * (2 + n_years)
+        data: np.ndarray
+        if count:
+            data = np.memmap(
+                path, dtype=_DTYPE, mode="r", offset=data_offset, shape=(count,)
+            )
+        else:
+            data = np.empty(0, dtype=_DTYPE)
+
+        return cls(
+            districts=header["districts"],
+            year_min=header["year_min"],
+            borough_price_trend=data[:n_districts],
+            avg_price_last_half=data[n_districts : 2 * n_districts],
+            district_yearly_medians=data[2 * n_districts :].reshape(
+                n_districts, n_years
+            ),
+            global_price_median=header["global_price_median"],
+        )
+
+    @classmethod
+    def load(cls, path: Path) -> "LookupTables":
+        """Load either format, telling them apart by the binary magic bytes."""
+        with Path(path).open("rb") as f:
+            is_binary = f.read(len(BINARY_MAGIC)) == BINARY_MAGIC
+        return cls.from_binary(path) if is_binary else cls.from_json(path)
+
+    def write_binary(self, path: Path) -> Path:
+        path = Path(path)
+        header: Dict[str, Any] = {
+            "districts": self.districts,
+            "year_min": self.year_min,
+            "n_years": int(self.district_yearly_medians.shape[1]),
+            "global_price_median": self.global_price_median,
+        }
+        header_bytes = json.dumps(header).encode("utf-8")
+        data_offset = _align(_HEADER_OFFSET + len(header_bytes))
+
+        with path.open("wb") as f:
+            f.write(
+                _PREAMBLE.pack(
+                    BINARY_MAGIC, BINARY_FORMAT_VERSION, 0, len(header_bytes)
+                )
+            )
+            f.write(b"\0" * (_HEADER_OFFSET - _PREAMBLE.size))
+            f.write(header_bytes)
+            f.write(b"\0" * (data_offset - _HEADER_OFFSET - len(header_bytes)))
+            for array in (
+                self.borough_price_trend,
+                self.avg_price_last_half,
+                self.district_yearly_medians,
+            ):
+                f.write(np.ascontiguousarray(array, dtype=_DTYPE).tobytes())
+        return path
+
+    def _value(self, array: np.ndarray, code: Optional[int]) -> Optional[float]:
+        if code is None:
+            return None
+        value = array[code]
+        return None if np.isnan(value) else float(value)
+
+    def borough_trend(self, district: str) -> Optional[float]:
+        return self._value(self.borough_price_trend, self.district_codes.get(district))
+
+    def recent_median(self, district: str) -> Optional[float]:
+        return self._value(self.avg_price_last_half, self.district_codes.get(district))
+
+    def yearly_median(self, district: str, year: int) -> Optional[float]:
+        code = self.district_codes.get(district)
+        offset = year - self.year_min
+        if code is None or not 0 <= offset < self.district_yearly_medians.shape[1]:
+            return None
+        return self._value(self.district_yearly_medians[code], offset)
+
+
+def write_binary_lookup_tables(json_path: Path, out_path: Path) -> Path:
+    """Convert a ``lookup_tables.json`` file to the binary format."""
+    return LookupTables.from_json(json_path).write_binary(out_path)
+
+
+def write_lookup_artifacts(
+    payload: Mapping[str, Mapping[str, Optional[float]]],
+) -> Tuple[Path, Path]:
+    """Write the JSON lookup tables and their binary copy to the artifact dir."""
+    json_path = generate_artifact_from_payload(LOOKUP_TABLE_FILE, dict(payload))
+    # Memory-mappable copy of the same tables for the API.
+    binary_path = write_binary_lookup_tables(
+        json_path, json_path.with_name(BINARY_LOOKUP_TABLE_FILE)
+    )
+    return json_path, binary_path
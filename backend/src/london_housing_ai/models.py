@@ -1,18 +1,25 @@
+from dataclasses import dataclass
 from enum import Enum
-from typing import Any, Dict, Tuple, Union
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 
 import numpy as np
 import pandas as pd
-from catboost import CatBoostRegressor
+from catboost import CatBoostRegressor, Pool
 from numpy.typing import NDArray
 from sklearn.metrics import mean_squared_error, r2_score, root_mean_squared_error
 from sklearn.model_selection import StratifiedShuffleSplit
 
 from london_housing_ai.config_schemas.TrainConfig import TrainConfig
+from london_housing_ai.quantized_pools import (
+    ChunkSource,
+    build_quantized_pools,
+    feature_columns,
+)
 from london_housing_ai.utils.create_files import generate_artifact_from_df
 from london_housing_ai.utils.logger import get_logger
 
-logger = get_logger()
+logger = get_logger(__name__)
 
 YType = Union[pd.Series, NDArray[np.float64]]
 
@@ -23,6 +30,23 @@ class MetricType(Enum):
     TEST = "test"
 
 
+@dataclass
+class SplitPool:
+    pool: Pool
+    prices: NDArray[np.float64]  # unclipped label, for metrics
+
+
+@dataclass
+class SplitFrame:
+    features: pd.DataFrame
+    labels: NDArray[np.float64]  # clipped (and logged) training label
+    prices: NDArray[np.float64]
+
+    def to_pool(self, cat_features: List[str]) -> SplitPool:
+        pool = Pool(self.features, label=self.labels, cat_features=cat_features)
+        return SplitPool(pool=pool, prices=self.prices)
+
+
 class PriceModel:
     def __init__(self, cfg: TrainConfig):
         self.cfg = cfg
@@ -33,6 +57,7 @@ class PriceModel:
             "learning_rate": cfg.lr,
             "early_stopping_rounds": cfg.early_stop,
             "random_seed": cfg.random_state,
+            "l2_leaf_reg": cfg.l2_leaf_reg,
         }
         self.model = CatBoostRegressor(**params)
         self.log_data: dict[str, Any] = {
@@ -58,22 +83,24 @@ class PriceModel:
             labels=[1, 2, 3, 4, 5],
         )
 
-    def _train_test_split(
-        self, df: pd.DataFrame
-    ) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    def _split_indices(
+        self, prices: YType
+    ) -> Tuple[NDArray[np.intp], NDArray[np.intp], NDArray[np.intp]]:
+        """Row positions of the train, test and validation splits."""
         testset_ratio = self.cfg.test_size
         valset_ratio = self.cfg.val_size
         trainset_ratio = 1 - testset_ratio
 
-        y_band = self._make_price_band(df["price"])
+        y_band = self._make_price_band(pd.Series(prices).reset_index(drop=True))
         train_test_splitter = StratifiedShuffleSplit(
             n_splits=1, test_size=testset_ratio, random_state=self.cfg.random_state
         )
         # split into train and test sets
-        train_val_idx, test_idx = next(train_test_splitter.split(df, y_band))
+        train_val_idx, test_idx = next(
+            train_test_splitter.split(np.zeros(len(y_band)), y_band)
+        )
 
         # split train sets further to train set and validation set
-        train_val_df = df.iloc[train_val_idx]  # train_val features
         y_band_train_val = y_band.iloc[train_val_idx]  # train_val labels
 
         train_val_splitter = StratifiedShuffleSplit(
@@ -82,63 +109,72 @@ class PriceModel:
             random_state=self.cfg.random_state,
         )
         train_idx, val_idx = next(
-            train_val_splitter.split(train_val_df, y_band_train_val)
+            train_val_splitter.split(np.zeros(len(train_val_idx)), y_band_train_val)
         )
+        return train_val_idx[train_idx], test_idx, train_val_idx[val_idx]
 
-        return (
-            train_val_df.iloc[train_idx].copy(),
-            df.iloc[test_idx].copy(),
-            train_val_df.iloc[val_idx].copy(),
-        )
+    def _split_positions(self, df: pd.DataFrame) -> Dict[MetricType, NDArray[np.intp]]:
+        train_idx, test_idx, val_idx = self._split_indices(df[self.cfg.label])
+        return {
+            MetricType.TRAIN: train_idx,
+            MetricType.VALIDATION: val_idx,
+            MetricType.TEST: test_idx,
+        }
 
-    def _split_feature_and_label(
-        self, df: pd.DataFrame, feature_col: str
-    ) -> Tuple[pd.DataFrame, pd.Series | NDArray[Any]]:
-        features = df.drop(columns=feature_col)
+    def _split_frame(self, df: pd.DataFrame, idx: NDArray[np.intp]) -> SplitFrame:
+        """The ``idx`` rows of ``df`` as features and labels, copied once."""
+        label = self.cfg.label
+        prices = np.asarray(df[label].to_numpy()[idx], dtype=np.float64)
         # clipping: if the value > threshold, value = threshold to avoid outliers
-        labels = df[feature_col].clip(
-            upper=df[feature_col].quantile(self.cfg.clip_target_q)
-        )
+        labels = np.minimum(prices, np.nanquantile(prices, self.cfg.clip_target_q))
         if self.cfg.log_target:
             labels = np.log1p(labels)
-        return features, labels
+        features = [i for i, col in enumerate(df.columns) if col != label]
+        return SplitFrame(features=df.iloc[idx, features], labels=labels, prices=prices)
+
+    def _make_pools(self, df: pd.DataFrame) -> Dict[MetricType, SplitPool]:
+        # Each split's frame is dropped as soon as CatBoost has its own copy.
+        return {
+            metric_type: self._split_frame(df, idx).to_pool(self.cfg.cat_features)
+            for metric_type, idx in self._split_positions(df).items()
+        }
 
-    def _train_model(
-        self, train_set: pd.DataFrame, validation_set: pd.DataFrame
-    ) -> Tuple[YType, YType]:
+    def _train_model(self, train_set: SplitPool, validation_set: SplitPool) -> None:
         """
         Teach the model to learn patterns
         Student's practice problem:
         If models were student, they can look up solutions and learn from them.
         Model learns the relationship between input features and target labels here
         """
-        # train set
-        X_train, y_train = self._split_feature_and_label(train_set, self.cfg.label)
-        # validation set
-        X_val, y_val = self._split_feature_and_label(validation_set, self.cfg.label)
-
-        self.model.fit(
-            X_train,
-            y_train,
-            cat_features=self.cfg.cat_features,
-            eval_set=(X_val, y_val),
-        )
-
-        y_train_true, y_train_pred = self.predict(train_set)
-
-        # Feature importances
+        self.model.fit(train_set.pool, eval_set=validation_set.pool)
+        self._log_feature_importance(train_set.pool.get_feature_names())
+
+    def _train_metrics_rows(self, n_rows: int) -> Optional[NDArray[np.intp]]:
+        sample = self.cfg.train_metrics_sample
+        if sample is None or sample >= n_rows:
+            return None
+        rng = np.random.default_rng(self.cfg.random_state)
+        return np.sort(rng.choice(n_rows, size=sample, replace=False))
+
+    def _predict_split(
+        self, split: SplitPool, rows: Optional[NDArray[np.intp]] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        if rows is None:
+            return split.prices, self._to_price(self.model.predict(split.pool))
+        y_pred = self.model.predict(split.pool.slice(rows))
+        return split.prices[rows], self._to_price(y_pred)
+
+    def _log_feature_importance(self, columns: List[str]) -> None:
         importances = self.model.get_feature_importance()
-        logger.info(f"columns: {X_train.columns}")
+        logger.info(f"columns: {columns}")
         feature_importance_df = pd.DataFrame(
-            {"feature": X_train.columns, "importance": importances}
+            {"feature": columns, "importance": importances}
         ).sort_values("importance", ascending=False)
 
         # Save to a file inside your output directory
         generate_artifact_from_df("feature_importance.json", feature_importance_df)
 
-        return y_train_true, y_train_pred
-
-    def _validate_model(self, validation_set: pd.DataFrame) -> Tuple[YType, YType]:
+    def _validate_model(self, validation_set: SplitPool) -> Tuple[YType, YType]:
         """
         Check how well model generalizes during development
         The mock exam:
@@ -147,10 +183,10 @@ class PriceModel:
         """
         # validation - tuning / model selection for evalution performance to know which model is best
         # inference validation set
-        y_val_true, y_val_pred = self.predict(validation_set)
+        y_val_true, y_val_pred = self._predict_split(validation_set)
         return y_val_true, y_val_pred
 
-    def _test_model(self, test_set: pd.DataFrame) -> Tuple[YType, YType]:
+    def _test_model(self, test_set: SplitPool) -> Tuple[YType, YType]:
         """
         Simulate real-world, unseen data performance
         The real exam:
@@ -159,7 +195,7 @@ class PriceModel:
         """
 
         # inference test set
-        y_true, y_pred = self.predict(test_set)
+        y_true, y_pred = self._predict_split(test_set)
         return y_true, y_pred
 
     def _evaluate_regression_metrics(
@@ -188,11 +224,16 @@ class PriceModel:
     def train_and_evaluate(self, df: pd.DataFrame, checksum: str):
         self.log_data["text"]["columns_used"] = df.columns
 
-        train, test, val = self._train_test_split(df)
+        # One pool per split, shared by fit, eval_set and the metric predictions.
+        pools = self._make_pools(df)
+        train, val = pools[MetricType.TRAIN], pools[MetricType.VALIDATION]
 
-        y_train_true, y_train_pred = self._train_model(train, val)
+        self._train_model(train, val)
+        y_train_true, y_train_pred = self._predict_split(
+            train, self._train_metrics_rows(train.pool.num_row())
+        )
         y_val_true, y_val_pred = self._validate_model(val)
-        y_true, y_pred = self._test_model(test)
+        y_true, y_pred = self._test_model(pools[MetricType.TEST])
 
         train_metrics = self._evaluate_regression_metrics(
             y_train_true, y_train_pred, MetricType.TRAIN
@@ -208,11 +249,69 @@ class PriceModel:
 
         self.log_data["params"]["raw_csv_sha256"] = checksum
 
+    def train_and_evaluate_quantized(
+        self, source: ChunkSource, checksum: str, pool_root: Path, dataset_key: str
+    ):
+        """Like ``train_and_evaluate`` but fits on quantized pools built on disk.
+
+        Only the label column of ``source`` is ever loaded whole; metrics are
+        computed by predicting one source chunk at a time.
+        """
+        columns = [*feature_columns(self.cfg), self.cfg.label]
+        self.log_data["text"]["columns_used"] = columns
+
+        train_idx, test_idx, val_idx = self._split_indices(
+            source.labels(self.cfg.label)
+        )
+        pools = build_quantized_pools(
+            source,
+            self.cfg,
+            {"train": train_idx, "validation": val_idx, "test": test_idx},
+            pool_root,
+            dataset_key,
+            border_count=self.cfg.border_count,
+        )
+        train_pool, val_pool = pools.fit_pools()
+        self.model.fit(train_pool, eval_set=val_pool)
+        del train_pool, val_pool
+        self._log_feature_importance(feature_columns(self.cfg))
+
+        y_true, y_pred = self._predict_chunks(source, columns)
+        metrics: Dict[str, float] = {}
+        for metric_type in MetricType:
+            idx = pools.indices[metric_type.value]
+            metrics.update(
+                self._evaluate_regression_metrics(y_true[idx], y_pred[idx], metric_type)
+            )
+        self._log_all_metrics(metrics)
+
+        self.log_data["params"]["raw_csv_sha256"] = checksum
+        self.log_data["params"]["quantized_pools"] = str(pools.directory)
+
+    def _predict_chunks(
+        self, source: ChunkSource, columns: List[str]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        # Quantized pools with categorical features cannot be predicted on,
+        # so metrics are computed from the raw rows, chunk by chunk.
+        parts = [self.predict(chunk[columns]) for chunk in source.chunks()]
+        return (
+            np.concatenate([true for true, _ in parts]),
+            np.concatenate([pred for _, pred in parts]),
+        )
+
+    def split_frames(
+        self, df: pd.DataFrame, metric_types: Sequence[MetricType]
+    ) -> Dict[MetricType, SplitFrame]:
+        """The requested splits of ``df``, e.g. to share them between processes."""
+        positions = self._split_positions(df)
+        return {t: self._split_frame(df, positions[t]) for t in metric_types}
+
     def predict(self, df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
         X = df.drop(columns="price")
         y_true = np.asarray(df["price"].values)
-        y_pred = self.model.predict(X)
+        return y_true, self._to_price(self.model.predict(X))
+
+    def _to_price(self, y_pred: YType) -> np.ndarray:
         if self.cfg.log_target:
             y_pred = np.expm1(y_pred)
-        y_pred = np.asarray(y_pred)
-        return y_true, y_pred
+        return np.asarray(y_pred)
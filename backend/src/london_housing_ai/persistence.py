@@ -1,15 +1,47 @@
+import io
 import os
+import tempfile
+from typing import IO, Dict, Iterable, List, Optional
 
 import pandas as pd
-from psycopg2.errors import UndefinedTable
-from sqlalchemy import Engine, create_engine, text
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+from sqlalchemy import Connection, Engine, create_engine, text
 
+from london_housing_ai.gold_schema import (
+    MAX_POSTGRES_IDENTIFIER_LENGTH,
+    GoldTableLayout,
+    index_name,
+    partition_name,
+    partition_suffix,
+    plan_gold_table,
+    quote_ident,
+)
 from london_housing_ai.utils.logger import get_logger
 
-logger = get_logger()
+logger = get_logger(__name__)
 
-MAX_POSTGRES_IDENTIFIER_LENGTH = 63
 TABLE_NAME_PREFIX = "london_housing_"
+STAGING_TABLE_PREFIX = f"{TABLE_NAME_PREFIX}stg_"
+COPY_CHUNK_ROWS = 100_000
+COPY_NULL = "\\N"
+
+# Postgres column types (as named by information_schema) to the Arrow types
+# used to parse ``COPY ... TO STDOUT`` output. Anything else is read as text.
+ARROW_TYPES: Dict[str, pa.DataType] = {
+    "smallint": pa.int64(),
+    "integer": pa.int64(),
+    "bigint": pa.int64(),
+    "real": pa.float64(),
+    "double precision": pa.float64(),
+    "numeric": pa.float64(),
+    "boolean": pa.bool_(),
+    "date": pa.timestamp("s"),
+    "timestamp without time zone": pa.timestamp("us"),
+}
+# Enum-coded gold columns (see gold_schema) show up as USER-DEFINED.
+ENUM_DATA_TYPE = "USER-DEFINED"
+ENUM_TYPE_PREFIX = f"{TABLE_NAME_PREFIX}enum_"
 
 
 def _require_env(name: str) -> str:
@@ -37,31 +69,215 @@ def get_engine() -> Engine:
     return create_engine(db_url)
 
 
-def persist_dataset(df: pd.DataFrame, engine: Engine, checksum: str):
+def persist_dataset(
+    df: pd.DataFrame,
+    engine: Engine,
+    checksum: str,
+    chunk_rows: int = COPY_CHUNK_ROWS,
+):
+    """Bulk load ``df`` with COPY and publish it under the checksum table name.
+
+    The table follows the declared gold schema (see ``gold_schema``). Rows
+    stream into UNLOGGED staging partitions, which are indexed and then made
+    LOGGED in the same load transaction. A second, short transaction only
+    renames them in as the gold table and records the checksum, so readers
+    never see a half-written table, are not blocked while the data is written
+    to WAL, and a failed load leaves nothing behind.
+    """
     if checksum is None:
         raise RuntimeError("checksum table name is not provided.")
     table_name = _table_name_from_checksum(checksum)
+    layout = plan_gold_table(df, _staging_table_name(checksum))
+    try:
+        with engine.begin() as conn:
+            _create_staging_table(conn, layout)
+            cursor = conn.connection.cursor()
+            try:
+                copy_dataframe(cursor, df, layout.table_name, chunk_rows)
+            finally:
+                cursor.close()
+            for statement in layout.index_statements():
+                conn.exec_driver_sql(statement)
+            # SET LOGGED rewrites each partition through WAL; done here it
+            # holds no lock on the live gold table.
+            for staged in layout.partition_names or [layout.table_name]:
+                conn.exec_driver_sql(f"ALTER TABLE {quote_ident(staged)} SET LOGGED")
+        with engine.begin() as conn:
+            _swap_in(conn, layout, table_name)
+            _upsert_checksum(conn, checksum, table_name)
+    except Exception as e:
+        _drop_staging_quietly(engine, layout)
+        raise RuntimeError(f"failed to persist table {table_name} to db.") from e
+    logger.info(f"Persisted {len(df)} rows to {table_name}")
+
+
+def _staging_table_name(checksum: str) -> str:
+    suffix_len = MAX_POSTGRES_IDENTIFIER_LENGTH - len(STAGING_TABLE_PREFIX)
+    return f"{STAGING_TABLE_PREFIX}{checksum[:suffix_len]}"
+
+
+def _create_staging_table(conn: Connection, layout: GoldTableLayout) -> None:
+    conn.exec_driver_sql(f"DROP TABLE IF EXISTS {quote_ident(layout.table_name)}")
+    for statement in layout.create_statements(unlogged=True):
+        conn.exec_driver_sql(statement)
+
+
+def _swap_in(conn: Connection, layout: GoldTableLayout, table_name: str) -> None:
+    """Replace ``table_name`` (and its enum types) with the staged table."""
+    old_enum_types = _enum_types_of(conn, table_name)
+    conn.exec_driver_sql(f"DROP TABLE IF EXISTS {quote_ident(table_name)}")
+    for type_name in old_enum_types:
+        conn.exec_driver_sql(f"DROP TYPE IF EXISTS {quote_ident(type_name)}")
+
+    for year, staged in zip(layout.partition_years, layout.partition_names):
+        suffix = partition_suffix(year)
+        _rename_indexes(conn, staged, index_name(table_name, suffix))
+        final = partition_name(table_name, year)
+        conn.exec_driver_sql(
+            f"ALTER TABLE {quote_ident(staged)} RENAME TO {quote_ident(final)}"
+        )
+    _rename_indexes(conn, layout.table_name, index_name(table_name))
+    conn.exec_driver_sql(
+        f"ALTER TABLE {quote_ident(layout.table_name)} "
+        f"RENAME TO {quote_ident(table_name)}"
+    )
+
+
+def _rename_indexes(conn: Connection, staged: str, final: str) -> None:
+    # Postgres named the index after the staging table; each table has one.
+    sql = """
+        SELECT indexname FROM pg_indexes
+        WHERE schemaname = current_schema() AND tablename = :t
+    """
+    for (index,) in conn.execute(text(sql), {"t": staged}).fetchall():
+        conn.exec_driver_sql(
+            f"ALTER INDEX {quote_ident(index)} RENAME TO {quote_ident(final)}"
+        )
+
+
+def _enum_types_of(conn: Connection, table_name: str) -> List[str]:
+    sql = """
+        SELECT DISTINCT udt_name FROM information_schema.columns
+        WHERE table_schema = current_schema() AND table_name = :t
+          AND data_type = :enum
+    """
+    rows = conn.execute(text(sql), {"t": table_name, "enum": ENUM_DATA_TYPE})
+    return [name for (name,) in rows if name.startswith(ENUM_TYPE_PREFIX)]
+
+
+def copy_dataframe(cursor, df: pd.DataFrame, table_name: str, chunk_rows: int) -> None:
+    """Stream ``df`` into ``table_name`` with ``COPY ... FROM STDIN`` in chunks."""
+    columns = ", ".join(quote_ident(str(c)) for c in df.columns)
+    sql = (
+        f"COPY {quote_ident(table_name)} ({columns}) FROM STDIN "
+        f"WITH (FORMAT csv, NULL '{COPY_NULL}')"
+    )
+    for start in range(0, len(df), chunk_rows):
+        buffer = io.StringIO()
+        df.iloc[start : start + chunk_rows].to_csv(
+            buffer, index=False, header=False, na_rep=COPY_NULL
+        )
+        buffer.seek(0)
+        cursor.copy_expert(sql, buffer)
+
+
+def _drop_staging_quietly(engine: Engine, layout: GoldTableLayout) -> None:
     try:
-        df.to_sql(table_name, engine, index=False)
+        with engine.begin() as conn:
+            conn.exec_driver_sql(
+                f"DROP TABLE IF EXISTS {quote_ident(layout.table_name)}"
+            )
+            for type_name in layout.enum_labels:
+                conn.exec_driver_sql(f"DROP TYPE IF EXISTS {quote_ident(type_name)}")
     except Exception:
-        raise RuntimeError(f"failed to persist table {table_name} to db.")
+        logger.exception(f"Could not drop staging table {layout.table_name}")
+
 
+def get_dataset_from_db(
+    engine: Engine,
+    checksum: str | None = None,
+    columns: Optional[List[str]] = None,
+    categorical: Iterable[str] = (),
+) -> pd.DataFrame:
+    """Read a persisted dataset back with ``COPY ... TO STDOUT`` and pyarrow.
 
-def get_dataset_from_db(engine: Engine, checksum: str | None = None) -> pd.DataFrame:
+    Only ``columns`` (all when None) are transferred; those missing from the
+    table are skipped so callers such as ``df_with_required_cols`` can report
+    them. Column types come from the table definition rather than from Python
+    objects; enum-coded columns and ``categorical`` ones come back as pandas
+    categories.
+    """
     if checksum is None:
         raise RuntimeError(
             "checksum is not provided hence table name wouldn't be known."
         )
 
     table_name = _table_name_from_checksum(checksum)
-    try:
-        return pd.read_sql_query(f"SELECT * FROM {table_name}", engine)
-    except UndefinedTable as e:
+    column_types = _column_types(engine, table_name)
+    if not column_types:
         raise ValueError(
             "table doesn't exist but dataset is already seen."
             + "If you are ingesting the same csv again for development purpose,"
-            + f"please remove your checksum record in 'dataset_hashes' table. Error: {e}"
+            + f"please remove your checksum record in 'dataset_hashes' table. Table: {table_name}"
         )
+    if columns is not None:
+        column_types = {c: column_types[c] for c in columns if c in column_types}
+
+    quoted_columns = ", ".join(quote_ident(c) for c in column_types)
+    sql = (
+        f"COPY {quote_ident(table_name)} ({quoted_columns}) TO STDOUT WITH (FORMAT csv)"
+    )
+    with engine.connect() as conn, tempfile.TemporaryFile() as buffer:
+        cursor = conn.connection.cursor()
+        try:
+            cursor.copy_expert(sql, buffer)
+        finally:
+            cursor.close()
+        buffer.seek(0)
+        df = read_copy_csv(buffer, column_types)
+    enum_columns = [c for c, t in column_types.items() if t == ENUM_DATA_TYPE]
+    return restore_dtypes(df, [*categorical, *enum_columns])
+
+
+def _column_types(engine: Engine, table_name: str) -> Dict[str, str]:
+    sql = """
+        SELECT column_name, data_type FROM information_schema.columns
+        WHERE table_schema = current_schema() AND table_name = :t
+        ORDER BY ordinal_position
+    """
+    with engine.connect() as conn:
+        return dict(conn.execute(text(sql), {"t": table_name}).all())
+
+
+def read_copy_csv(source: IO[bytes], column_types: Dict[str, str]) -> pd.DataFrame:
+    """Parse headerless ``COPY ... (FORMAT csv)`` output into typed columns."""
+    table = pa_csv.read_csv(
+        source,
+        read_options=pa_csv.ReadOptions(column_names=list(column_types)),
+        convert_options=pa_csv.ConvertOptions(
+            column_types={
+                c: ARROW_TYPES.get(t, pa.string()) for c, t in column_types.items()
+            },
+            # COPY writes NULL unquoted and empty strings as "".
+            null_values=[""],
+            strings_can_be_null=True,
+            quoted_strings_can_be_null=False,
+            true_values=["t"],
+            false_values=["f"],
+        ),
+    )
+    return table.to_pandas()
+
+
+def restore_dtypes(df: pd.DataFrame, categorical: Iterable[str] = ()) -> pd.DataFrame:
+    """Match the dtypes the feature pipeline produces before persisting."""
+    for col in df.columns:
+        if pd.api.types.is_datetime64_any_dtype(df[col]):
+            df[col] = df[col].astype("datetime64[ns]")
+    for col in categorical:
+        if col in df:
+            df[col] = df[col].astype("category")
+    return df
 
 
 def _table_name_from_checksum(checksum: str) -> str:
@@ -94,13 +310,17 @@ def dataset_already_persisted(engine: Engine, checksum: str) -> bool:
 
 def record_checksum(engine: Engine, checksum: str) -> None:
     table_name = _table_name_from_checksum(checksum)
+    with engine.begin() as conn:
+        _upsert_checksum(conn, checksum, table_name)
+
+
+def _upsert_checksum(conn: Connection, checksum: str, table_name: str) -> None:
     sql = """
         INSERT INTO dataset_hashes(hash, table_name)
         VALUES (:h, :t)
         ON CONFLICT (hash) DO UPDATE SET table_name = EXCLUDED.table_name
     """
-    with engine.begin() as conn:
-        conn.execute(text(sql), {"h": checksum, "t": table_name})
+    conn.execute(text(sql), {"h": checksum, "t": table_name})
 
 
 def reset_postgres(engine: Engine):
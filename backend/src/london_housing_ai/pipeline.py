@@ -1,3 +1,5 @@
+from typing import List
+
 from pandas import DataFrame
 
 from london_housing_ai.cleaners import (
@@ -23,7 +25,7 @@ from london_housing_ai.feature_engineering import (
 )
 from london_housing_ai.utils.logger import get_logger
 
-logger = get_logger()
+logger = get_logger(__name__)
 
 
 def clean_dataset(df: DataFrame, cfg: CleaningConfig) -> DataFrame:
@@ -42,6 +44,15 @@ def clean_dataset(df: DataFrame, cfg: CleaningConfig) -> DataFrame:
 
 async def feature_engineer_dataset(
     df: DataFrame, fe_cfg: FeatureConfig, postcode_col: str
+) -> DataFrame:
+    df = await geocode_dataset(df, fe_cfg, postcode_col)
+    if df.empty:
+        return df
+    return extract_features(df, fe_cfg)
+
+
+async def geocode_dataset(
+    df: DataFrame, fe_cfg: FeatureConfig, postcode_col: str
 ) -> DataFrame:
     # level 1 extractions
     if fe_cfg.city_filter:
@@ -54,7 +65,10 @@ async def feature_engineer_dataset(
             return df
     if fe_cfg.use_district:
         df = await get_district_from_postcode(df, postcode_col, fe_cfg.district_col)
+    return df
 
+
+def extract_features(df: DataFrame, fe_cfg: FeatureConfig) -> DataFrame:
     # level 2 extractions
     df = extract_borough_price_trend(
         df=df, extract_from=fe_cfg.timestamp_col, new_col="borough_price_trend"
@@ -100,15 +114,18 @@ def build_aug_dataset(df: DataFrame, cfg: AugmentConfig) -> DataFrame:
     return df
 
 
-def df_with_required_cols(df: DataFrame, train_cfg: TrainConfig) -> DataFrame:
-    copied_df = df.copy()
-    required_cols = [
+def required_columns(train_cfg: TrainConfig) -> List[str]:
+    return [
         *train_cfg.cat_features,
         *train_cfg.numeric_features,
         train_cfg.label,
     ]
+
+
+def df_with_required_cols(df: DataFrame, train_cfg: TrainConfig) -> DataFrame:
+    required_cols = required_columns(train_cfg)
     required_cols_set = set(required_cols)
-    original_cols_set = set(copied_df.columns)
+    original_cols_set = set(df.columns)
     intersection = original_cols_set.intersection(required_cols)
 
     if intersection != required_cols_set:
@@ -0,0 +1,265 @@
+"""Out-of-core training data for CatBoost as quantized pools on disk.
+
+The gold frame is streamed chunk by chunk into a TSV file of train rows
+followed by validation rows, which CatBoost reads and quantizes into one pool
+(one byte per feature value) without a DataFrame of either split ever being
+built. The pool is saved next to the split indices and a ``meta.json`` and is
+reused as-is by later runs with the same dataset key and split settings.
+Feature borders are computed once per dataset key and feature list and reused
+whenever the pool has to be rebuilt, e.g. for a different split.
+
+Layout under the pool directory:
+
+    borders/<dataset+features hash>.tsv
+    <dataset+split hash>/fit.qpool, {train,validation,test}_index.npy, meta.json
+"""
+
+import hashlib
+import json
+import os
+import shutil
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Protocol, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+from catboost import Pool
+
+from london_housing_ai.config_schemas.TrainConfig import TrainConfig
+from london_housing_ai.utils.logger import get_logger
+from london_housing_ai.utils.paths import get_project_root
+
+SPLITS = ("train", "validation", "test")
+FIT_SPLITS = ("train", "validation")
+FIT_POOL = "fit.qpool"
+CHUNK_ROWS = 200_000
+META_FILE = "meta.json"
+
+logger = get_logger(__name__)
+
+
+class ChunkSource(Protocol):
+    """Training rows read in a fixed order, whole labels or chunk by chunk."""
+
+    def labels(self, label: str) -> np.ndarray:
+        """The whole label column, in chunk order."""
+
+    def chunks(self) -> Iterator[pd.DataFrame]:
+        """Every row, in the same order on every call."""
+
+
+class FrameSource:
+    """Chunks of an in-memory frame."""
+
+    def __init__(self, df: pd.DataFrame, chunk_rows: int = CHUNK_ROWS):
+        self.df = df
+        self.chunk_rows = chunk_rows
+
+    def labels(self, label: str) -> np.ndarray:
+        return self.df[label].to_numpy(dtype=np.float64)
+
+    def chunks(self) -> Iterator[pd.DataFrame]:
+        for start in range(0, len(self.df), self.chunk_rows):
+            yield self.df.iloc[start : start + self.chunk_rows]
+
+
+class ParquetSource:
+    """Row batches of a Parquet file, e.g. a cached training frame."""
+
+    def __init__(self, path: Path, chunk_rows: int = CHUNK_ROWS):
+        self.path = Path(path)
+        self.chunk_rows = chunk_rows
+
+    def labels(self, label: str) -> np.ndarray:
+        column = pq.read_table(self.path, columns=[label]).column(label)
+        return column.to_numpy().astype(np.float64)
+
+    def chunks(self) -> Iterator[pd.DataFrame]:
+        parquet = pq.ParquetFile(self.path)
+        for batch in parquet.iter_batches(batch_size=self.chunk_rows):
+            yield batch.to_pandas()
+
+
+def feature_columns(cfg: TrainConfig) -> List[str]:
+    # Same order df_with_required_cols gives the DataFrame training path.
+    return [*cfg.cat_features, *cfg.numeric_features]
+
+
+def _digest(*parts: object) -> str:
+    payload = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()[:24]
+
+
+def column_description(cfg: TrainConfig) -> str:
+    lines = ["0\tLabel"]
+    for i, col in enumerate(feature_columns(cfg), start=1):
+        kind = "Categ" if col in cfg.cat_features else "Num"
+        lines.append(f"{i}\t{kind}\t{col}")
+    return "\n".join(lines) + "\n"
+
+
+def to_pool_rows(
+    chunk: pd.DataFrame, cfg: TrainConfig, label_clip: float
+) -> pd.DataFrame:
+    """Label-first rows in the numeric form CatBoost derives from a DataFrame."""
+    label = chunk[cfg.label].clip(upper=label_clip)
+    if cfg.log_target:
+        label = np.log1p(label)
+    rows = {"label": label}
+    for col in feature_columns(cfg):
+        values = chunk[col]
+        if pd.api.types.is_datetime64_any_dtype(values):
+            # CatBoost reads datetime columns as int64 nanoseconds.
+            values = values.astype("int64")
+        elif col in cfg.cat_features:
+            values = values.astype(str)
+        rows[col] = values
+    return pd.DataFrame(rows)
+
+
+@dataclass
+class QuantizedPools:
+    directory: Path
+    indices: Dict[str, np.ndarray]
+
+    @property
+    def path(self) -> Path:
+        return self.directory / FIT_POOL
+
+    def fit_pools(self) -> Tuple[Pool, Pool]:
+        """The train and validation pools, sliced out of the shared fit pool."""
+        pool = Pool(f"quantized://{self.path}")
+        n_train = len(self.indices["train"])
+        n_val = len(self.indices["validation"])
+        return (
+            pool.slice(np.arange(n_train)),
+            pool.slice(np.arange(n_train, n_train + n_val)),
+        )
+
+
+def _load_existing(directory: Path) -> Optional[QuantizedPools]:
+    if not (directory / META_FILE).exists():
+        return None
+    logger.info(f"Reusing quantized pools in {directory}")
+    return QuantizedPools(
+        directory=directory,
+        indices={s: np.load(directory / f"{s}_index.npy") for s in SPLITS},
+    )
+
+
+def _write_fit_tsvs(
+    source: ChunkSource,
+    cfg: TrainConfig,
+    indices: Dict[str, np.ndarray],
+    clips: Dict[str, float],
+    work_dir: Path,
+) -> None:
+    split_of = np.full(sum(len(i) for i in indices.values()), -1, dtype=np.int8)
+    for code, split in enumerate(FIT_SPLITS):
+        split_of[indices[split]] = code
+    offset = 0
+    for chunk in source.chunks():
+        codes = split_of[offset : offset + len(chunk)]
+        offset += len(chunk)
+        for code, split in enumerate(FIT_SPLITS):
+            rows = chunk[codes == code]
+            if len(rows):
+                to_pool_rows(rows, cfg, clips[split]).to_csv(
+                    work_dir / f"{split}.tsv",
+                    sep="\t",
+                    header=False,
+                    index=False,
+                    mode="a",
+                )
+
+
+def build_quantized_pools(
+    source: ChunkSource,
+    cfg: TrainConfig,
+    split_indices: Dict[str, np.ndarray],
+    pool_root: Path,
+    dataset_key: str,
+    border_count: Optional[int] = None,
+) -> QuantizedPools:
+    """Quantize the train and validation rows of ``source``, or reuse them.
+
+    ``split_indices`` maps each of ``SPLITS`` to row positions in ``source``
+    order. They only matter on the first build; a later run with the same
+    dataset key and split settings loads the saved pool and indices instead.
+    Test rows are not quantized, their metrics come from the raw rows.
+    """
+    features = feature_columns(cfg)
+    directory = Path(pool_root) / _digest(
+        dataset_key,
+        features,
+        cfg.label,
+        cfg.log_target,
+        cfg.clip_target_q,
+        cfg.test_size,
+        cfg.val_size,
+        cfg.random_state,
+        border_count,
+    )
+    existing = _load_existing(directory)
+    if existing is not None:
+        return existing
+
+    # Saved borders override border_count when passed back to CatBoost, so a
+    # different border count gets borders of its own.
+    borders_key = _digest(dataset_key, features, border_count)
+    borders = Path(pool_root) / "borders" / f"{borders_key}.tsv"
+    indices = {split: np.asarray(split_indices[split]) for split in SPLITS}
+    labels = source.labels(cfg.label)
+    # Each split's label is clipped at its own quantile, as in the DataFrame path.
+    clips = {
+        s: float(np.quantile(labels[indices[s]], cfg.clip_target_q)) for s in FIT_SPLITS
+    }
+    del labels
+
+    work_dir = directory.with_name(directory.name + ".partial")
+    shutil.rmtree(work_dir, ignore_errors=True)
+    work_dir.mkdir(parents=True)
+    try:
+        (work_dir / "columns.cd").write_text(column_description(cfg))
+        _write_fit_tsvs(source, cfg, indices, clips, work_dir)
+        # Pools quantized separately get their own categorical value mapping,
+        # so train and validation rows share one pool: train first.
+        with open(work_dir / "train.tsv", "ab") as fit, open(
+            work_dir / "validation.tsv", "rb"
+        ) as validation:
+            shutil.copyfileobj(validation, fit)
+        (work_dir / "validation.tsv").unlink()
+        # Block quantization (catboost.utils.quantize) rejects categorical
+        # features, so CatBoost reads the file and quantizes it in place.
+        pool = Pool(
+            str(work_dir / "train.tsv"),
+            column_description=str(work_dir / "columns.cd"),
+        )
+        pool.quantize(
+            border_count=border_count,
+            input_borders=str(borders) if borders.exists() else None,
+        )
+        if not borders.exists():
+            borders.parent.mkdir(parents=True, exist_ok=True)
+            pool.save_quantization_borders(str(borders))
+        pool.save(str(work_dir / FIT_POOL))
+        del pool
+        (work_dir / "train.tsv").unlink()
+        for split in SPLITS:
+            np.save(work_dir / f"{split}_index.npy", indices[split])
+        (work_dir / META_FILE).write_text(
+            json.dumps({"dataset_key": dataset_key, "features": features})
+        )
+        shutil.rmtree(directory, ignore_errors=True)
+        os.replace(work_dir, directory)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    logger.info(f"Built quantized pools in {directory}")
+    return QuantizedPools(directory=directory, indices=indices)
+
+
+def get_quantized_pool_dir() -> Path:
+    default = get_project_root() / "data_lake" / "quantized_pools"
+    return Path(os.getenv("QUANTIZED_POOL_DIR", str(default)))
@@ -0,0 +1,6 @@
+"""MLflow tags shared by the training side and the serving API."""
+
+# Tag marking the parent and trial runs of a hyperparameter search, which have
+# no model and must never be served.
+RUN_KIND_TAG = "run_kind"
+TUNE_RUN_KIND = "tune"
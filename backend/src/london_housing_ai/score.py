@@ -0,0 +1,281 @@
+"""Score a large file of properties without going through the API.
+
+Reads a CSV or Parquet file in chunks, resolves postcodes with the bulk
+postcodes.io geocoder, builds features with ``ServingTransformer.transform_batch``
+and scores each chunk with a single CatBoost call in a process pool. Results
+stream to a Parquet file in input order: every input column plus ``district``
+and ``predicted_price`` (null where the postcode could not be resolved).
+
+Input columns match ``POST /predict``: ``postcode``, ``property_type`` and
+optionally ``is_new_build`` / ``is_leasehold`` (Y/N, default N).
+
+Usage:
+    python -m london_housing_ai.score --input properties.csv --output scored.parquet
+    python -m london_housing_ai.score --input properties.parquet \\
+        --output scored.parquet --model-dir artifacts/model \\
+        --lookup-file artifacts/lookup_tables.json --workers 8
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from argparse import Namespace
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterator, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from london_housing_ai.feature_engineering import get_district_from_postcode
+from london_housing_ai.serve_transformer import ServingTransformer
+from london_housing_ai.utils.logger import get_logger
+
+DEFAULT_CHUNK_SIZE = 100_000
+REQUIRED_COLUMNS = ("postcode", "property_type")
+
+logger = get_logger(__name__)
+
+# (input chunk, resolved districts, pending predictions)
+_InFlight = Tuple[pd.DataFrame, pd.Series, "asyncio.Future[np.ndarray]"]
+
+# Per-process state of pool workers, set once by ``_init_worker``.
+_worker_model: Any = None
+_worker_transformer: Optional[ServingTransformer] = None
+_worker_log_target = True
+_worker_thread_count = 1
+
+
+def _init_worker(
+    model_path: str, lookup_path: str, log_target: bool, thread_count: int
+) -> None:
+    from catboost import CatBoostRegressor
+
+    global _worker_model, _worker_transformer, _worker_log_target
+    global _worker_thread_count
+    _worker_model = CatBoostRegressor()
+    _worker_model.load_model(model_path)
+    _worker_transformer = ServingTransformer(lookup_path)
+    _worker_log_target = log_target
+    _worker_thread_count = thread_count
+
+
+def score_requests(
+    model: Any,
+    transformer: ServingTransformer,
+    requests: pd.DataFrame,
+    log_target: bool = True,
+    thread_count: int = -1,
+) -> np.ndarray:
+    """Predict prices for one chunk; NaN where ``district`` is missing."""
+    prices = np.full(len(requests), np.nan)
+    known = requests["district"].notna().to_numpy()
+    if known.any():
+        features = transformer.transform_batch(requests[known])
+        preds = model.predict(features, thread_count=thread_count)
+        prices[known] = np.expm1(preds) if log_target else preds
+    return prices
+
+
+def _score_chunk(requests: pd.DataFrame) -> np.ndarray:
+    assert _worker_transformer is not None, "worker not initialised"
+    return score_requests(
+        _worker_model,
+        _worker_transformer,
+        requests,
+        _worker_log_target,
+        _worker_thread_count,
+    )
+
+
+def read_chunks(path: Path, chunk_size: int) -> Iterator[pd.DataFrame]:
+    if path.suffix == ".parquet":
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    else:
+        # Strings throughout keep the output schema identical across chunks.
+        yield from pd.read_csv(path, chunksize=chunk_size, dtype="string")
+
+
+def check_columns(chunk: pd.DataFrame) -> None:
+    missing = [c for c in REQUIRED_COLUMNS if c not in chunk]
+    if missing:
+        raise ValueError(f"Input is missing columns {missing}")
+
+
+async def resolve_districts(
+    postcodes: pd.Series, cache: Dict[str, Optional[str]]
+) -> pd.Series:
+    """Map postcodes to districts, only querying ones not seen in ``cache``."""
+    normalized = postcodes.fillna("").astype(str).str.strip().str.upper()
+    unseen = [pc for pc in normalized.unique() if pc and pc not in cache]
+    if unseen:
+        resolved = await get_district_from_postcode(
+            pd.DataFrame({"postcode": unseen}), "postcode", "district"
+        )
+        cache.update(dict.fromkeys(unseen))
+        cache.update(zip(resolved["postcode"], resolved["district"]))
+    return normalized.map(lambda pc: cache.get(pc)).astype("string")
+
+
+def requests_frame(chunk: pd.DataFrame, districts: pd.Series) -> pd.DataFrame:
+    """The ``ServingTransformer.transform_batch`` input for one input chunk."""
+    requests = pd.DataFrame(
+        {
+            "district": districts,
+            "property_type": chunk["property_type"].astype(str).str.upper(),
+        }
+    )
+    for flag in ("is_new_build", "is_leasehold"):
+        values = chunk[flag] if flag in chunk else pd.Series("N", index=chunk.index)
+        requests[flag] = values.fillna("N").astype(str).str.upper()
+    return requests
+
+
+class ParquetSink:
+    """Appends scored chunks to one Parquet file with a fixed schema."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._writer: Optional[pq.ParquetWriter] = None
+        self.rows = 0
+        self.scored = 0
+
+    def write(
+        self, chunk: pd.DataFrame, districts: pd.Series, prices: np.ndarray
+    ) -> None:
+        frame = chunk.assign(district=districts, predicted_price=prices)
+        schema = self._writer.schema if self._writer is not None else None
+        table = pa.Table.from_pandas(frame, schema=schema, preserve_index=False)
+        if self._writer is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._writer = pq.ParquetWriter(self.path, table.schema)
+        self._writer.write_table(table)
+        self.rows += len(frame)
+        self.scored += int(np.count_nonzero(~np.isnan(prices)))
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+
+
+async def score_file(
+    input_path: Path,
+    output_path: Path,
+    model_path: str,
+    lookup_path: str,
+    log_target: bool = True,
+    workers: int = 1,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Dict[str, Any]:
+    """Score ``input_path`` into ``output_path``; returns a summary.
+
+    Geocoding of the next chunk overlaps with scoring of earlier ones; at most
+    ``workers`` chunks are in flight so memory stays bounded.
+    """
+    start = time.perf_counter()
+    loop = asyncio.get_running_loop()
+    cache: Dict[str, Optional[str]] = {}
+    pending: Deque[_InFlight] = deque()
+    sink = ParquetSink(output_path)
+    thread_count = max(1, (os.cpu_count() or 1) // workers)
+    initargs = (model_path, lookup_path, log_target, thread_count)
+    try:
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=initargs
+        ) as pool:
+            for chunk in read_chunks(input_path, chunk_size):
+                check_columns(chunk)
+                chunk = chunk.reset_index(drop=True)
+                districts = await resolve_districts(chunk["postcode"], cache)
+                requests = requests_frame(chunk, districts)
+                future = loop.run_in_executor(pool, _score_chunk, requests)
+                pending.append((chunk, districts, future))
+                while len(pending) > workers:
+                    chunk, districts, future = pending.popleft()
+                    sink.write(chunk, districts, await future)
+            while pending:
+                chunk, districts, future = pending.popleft()
+                sink.write(chunk, districts, await future)
+    finally:
+        sink.close()
+
+    elapsed = time.perf_counter() - start
+    return {
+        "rows": sink.rows,
+        "scored": sink.scored,
+        "unresolved": sink.rows - sink.scored,
+        "seconds": round(elapsed, 3),
+        "rows_per_second": round(sink.rows / elapsed, 1) if elapsed else 0.0,
+    }
+
+
+def _prepare_model(args: Namespace, workdir: Path) -> Tuple[str, str, bool]:
+    """Resolve the model and lookup tables to local files workers can load."""
+    from london_housing_ai.api.services import mlflow_service
+    from london_housing_ai.api.services.transformer_cache import (
+        _download_lookup_table,
+    )
+
+    if args.model_dir:
+        import mlflow.catboost as mlflow_catboost
+
+        if not args.lookup_file:
+            raise RuntimeError("--lookup-file is required with --model-dir.")
+        model = mlflow_catboost.load_model(args.model_dir)
+        lookup_path = args.lookup_file
+        log_target = True
+    else:
+        run_id = args.run_id or mlflow_service.get_latest_finished_run_id()
+        if not run_id:
+            raise RuntimeError("No finished run found and --run-id was not provided.")
+        model = mlflow_service.load_model_for_run(run_id)
+        lookup_path = args.lookup_file or _download_lookup_table(run_id)
+        log_target = mlflow_service.run_uses_log_target(run_id, default=True)
+    if args.log_target is not None:
+        log_target = args.log_target == "true"
+
+    # Workers load a plain .cbm file rather than importing MLflow each.
+    model_path = workdir / "model.cbm"
+    model.save_model(str(model_path))
+    return str(model_path), str(lookup_path), log_target
+
+
+def main(args: Namespace) -> None:
+    with tempfile.TemporaryDirectory(prefix="london_housing_score_") as workdir:
+        model_path, lookup_path, log_target = _prepare_model(args, Path(workdir))
+        summary = asyncio.run(
+            score_file(
+                Path(args.input),
+                Path(args.output),
+                model_path,
+                lookup_path,
+                log_target=log_target,
+                workers=args.workers,
+                chunk_size=args.chunk_size,
+            )
+        )
+    logger.info(f"Scored {args.input} into {args.output}", extra=summary)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--input", type=str, required=True)
+    parser.add_argument("--output", type=str, required=True)
+    parser.add_argument("--run-id", type=str)
+    parser.add_argument("--model-dir", type=str)
+    parser.add_argument("--lookup-file", type=str)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument(
+        "--log-target",
+        type=str,
+        choices=["true", "false"],
+        help="Override log_target when the run's params are unavailable.",
+    )
+    main(parser.parse_args())
@@ -1,72 +1,150 @@
+"""Export the serving lookup tables for a persisted gold dataset.
+
+Training runs log their own lookup tables; this backfills older runs or
+re-exports a specific gold table.
+
+The three medians are computed inside Postgres with
+``percentile_cont(0.5) WITHIN GROUP`` so only one row per district (or
+district-year) leaves the database. The JSON and binary lookup files are
+written under the artifacts directory and logged to the latest finished
+MLflow run unless ``--run-id`` or ``--no-log`` say otherwise.
+
+Usage:
+    python -m london_housing_ai.scripts.export_lookup_tables
+    python -m london_housing_ai.scripts.export_lookup_tables \\
+        --table london_housing_<checksum> --run-id <run_id>
+"""
+
+import argparse
 import os
-from typing import Optional
+from argparse import Namespace
+from typing import Dict, Optional
 
 import mlflow
-import pandas as pd
-from mlflow.entities import RunStatus
-from mlflow.tracking import MlflowClient
-from sqlalchemy import text
+from sqlalchemy import Connection, text
 
+from london_housing_ai.api.services import mlflow_service
+from london_housing_ai.gold_schema import quote_ident
+from london_housing_ai.lookup_tables import write_lookup_artifacts
 from london_housing_ai.persistence import get_engine
-from london_housing_ai.utils.create_files import generate_artifact_from_payload
+from london_housing_ai.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+RECENT_WINDOW = "6 months"
+
+# Median price per district, over all sales.
+BOROUGH_TREND_SQL = """
+    SELECT CAST(district AS text), percentile_cont(0.5) WITHIN GROUP (ORDER BY price)
+    FROM {table}
+    WHERE district IS NOT NULL
+    GROUP BY district
+"""
+
+# Median price per district and sale year.
+DISTRICT_YEARLY_SQL = """
+    SELECT CAST(district AS text), sold_year,
+           percentile_cont(0.5) WITHIN GROUP (ORDER BY price)
+    FROM {table}
+    WHERE district IS NOT NULL AND sold_year IS NOT NULL
+    GROUP BY district, sold_year
+"""
+
+# Median price per district over the last six months of the dataset.
+RECENT_MEDIAN_SQL = """
+    SELECT CAST(district AS text), percentile_cont(0.5) WITHIN GROUP (ORDER BY price)
+    FROM {table}
+    WHERE district IS NOT NULL
+      AND "date" >= (SELECT max("date") FROM {table}) - CAST(:window AS interval)
+    GROUP BY district
+"""
+
 
-engine = get_engine()
-with engine.begin() as conn:
-    latest_table_name = conn.execute(
+def latest_table_name(conn: Connection) -> str:
+    table_name = conn.execute(
         text("SELECT table_name FROM dataset_hashes ORDER BY inserted_at DESC LIMIT 1")
     ).scalar_one_or_none()
+    if table_name is None:
+        raise RuntimeError("No persisted dataset found in dataset_hashes.")
+    return table_name
+
+
+def compute_lookup_tables(
+    conn: Connection, table_name: str
+) -> Dict[str, Dict[str, Optional[float]]]:
+    """The ``lookup_tables.json`` payload for ``table_name``, computed in SQL."""
+    table = quote_ident(table_name)
+    borough_trend = {
+        district: median
+        for district, median in conn.execute(
+            text(BOROUGH_TREND_SQL.format(table=table))
+        )
+    }
+    district_yearly = {
+        f"{district}_{int(year)}": median
+        for district, year, median in conn.execute(
+            text(DISTRICT_YEARLY_SQL.format(table=table))
+        )
+    }
+    recent_median = {
+        district: median
+        for district, median in conn.execute(
+            text(RECENT_MEDIAN_SQL.format(table=table)), {"window": RECENT_WINDOW}
+        )
+    }
+    return {
+        "borough_price_trend": borough_trend,
+        "district_yearly_medians": district_yearly,
+        "avg_price_last_half": recent_median,
+    }
+
+
+def _latest_finished_run_id(experiment_name: str) -> Optional[str]:
+    # Same lookup as serving, so tuning runs (which have no model) are skipped.
+    client = mlflow_service.get_client()
+    experiment = mlflow_service.get_experiment(client, experiment_name)
+    if experiment is None:
+        raise RuntimeError("Experiment not found")
+    runs = mlflow_service.list_recent_finished_runs(
+        client, experiment.experiment_id, limit=1
+    )
+    return runs[0].info.run_id if runs else None
+
+
+def main(args: Namespace) -> None:
+    engine = get_engine()
+    with engine.connect() as conn:
+        table_name = args.table or latest_table_name(conn)
+        payload = compute_lookup_tables(conn, table_name)
+    paths = write_lookup_artifacts(payload)
+
+    logger.info(
+        f"Exported lookup tables for {table_name}",
+        extra={
+            "districts": len(payload["borough_price_trend"]),
+            "district_years": len(payload["district_yearly_medians"]),
+        },
+    )
+    if args.no_log:
+        return
+
+    experiment_name = os.getenv("MLFLOW_EXPERIMENT_NAME", "LondonHousingAI")
+    mlflow.set_experiment(experiment_name)
+    run_id = args.run_id or _latest_finished_run_id(experiment_name)
+    with mlflow.start_run(run_id=run_id):
+        for path in paths:
+            mlflow.log_artifact(str(path))
+
 
-if latest_table_name is None:
-    raise RuntimeError("No persisted dataset found in dataset_hashes.")
-
-# Load the engineered dataset from Postgres
-df = pd.read_sql(f"SELECT * FROM {latest_table_name}", engine)
-
-# Export borough_price_trend: district -> median price
-borough_trend = df.groupby("district")["price"].median().to_dict()
-
-# Export district_yearly_medians: district_year -> median price
-district_yearly = df.groupby(["district", "sold_year"])["price"].median().reset_index()
-district_yearly_dict = {
-    f"{row.district}_{int(row.sold_year)}": row.price
-    for row in district_yearly.itertuples()
-}
-
-# Export avg_price_last_half: district -> most recent 6 month median
-# Simplification: use last 6 months of training data per district
-df["date"] = pd.to_datetime(df["date"])
-cutoff = df["date"].max() - pd.DateOffset(months=6)
-recent = df[df["date"] >= cutoff]
-recent_median = recent.groupby("district")["price"].median().to_dict()
-
-artifacts = {
-    "borough_price_trend": borough_trend,
-    "district_yearly_medians": district_yearly_dict,
-    "avg_price_last_half": recent_median,
-}
-
-LOOKUP_TABLE_NAME = "lookup_tables.json"
-lookup_table_path = generate_artifact_from_payload(LOOKUP_TABLE_NAME, artifacts)
-
-experiment_name = os.getenv("MLFLOW_EXPERIMENT_NAME", "LondonHousingAI")
-mlflow.set_experiment(experiment_name)
-
-client = MlflowClient(tracking_uri=os.getenv("MLFLOW_TRACKING_URI"))
-experiment = client.get_experiment_by_name(experiment_name)
-if experiment is None:
-    raise RuntimeError("Experiment not found")
-
-finished_status = RunStatus.to_string(RunStatus.FINISHED)
-runs = client.search_runs(
-    experiment_ids=[experiment.experiment_id],
-    filter_string=f"attributes.status = '{finished_status}'",
-    order_by=["start_time DESC"],
-    max_results=1,
-)
-run_id = runs[0].info.run_id if runs else None
-
-with mlflow.start_run(run_id=run_id):
-    mlflow.log_artifact(str(lookup_table_path))
-
-print(f"Exported {len(borough_trend)} districts")
-print(f"Exported {len(district_yearly_dict)} district-year pairs")
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--table", type=str, help="Gold table to export; defaults to the latest."
+    )
+    parser.add_argument(
+        "--run-id", type=str, help="Run to attach to; defaults to the latest."
+    )
+    parser.add_argument(
+        "--no-log", action="store_true", help="Write the files without MLflow."
+    )
+    main(parser.parse_args())
@@ -0,0 +1,73 @@
+"""Package one trained run into a self-contained serving bundle.
+
+Usage:
+    python -m london_housing_ai.scripts.export_serving_bundle --out artifacts/serving_bundle
+    python -m london_housing_ai.scripts.export_serving_bundle --out bundle \\
+        --run-id <run_id> --model-dir artifacts/model \\
+        --lookup-file artifacts/lookup_tables.json
+"""
+
+import argparse
+from argparse import Namespace
+from pathlib import Path
+from typing import Any, Dict
+
+from london_housing_ai.serving_bundle import write_bundle
+from london_housing_ai.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def _run_params(run_id: str) -> Dict[str, Any]:
+    from london_housing_ai.api.services import mlflow_service
+
+    try:
+        return dict(mlflow_service.get_client().get_run(run_id).data.params or {})
+    except Exception:
+        logger.warning(
+            f"Could not read params for run '{run_id}' from MLflow; "
+            "bundle will fall back to defaults."
+        )
+        return {}
+
+
+def main(args: Namespace) -> None:
+    from london_housing_ai.api.services import mlflow_service
+    from london_housing_ai.api.services.transformer_cache import (
+        _download_lookup_table,
+    )
+
+    run_id = args.run_id or mlflow_service.get_latest_finished_run_id()
+    if not run_id:
+        raise RuntimeError("No finished run found and --run-id was not provided.")
+
+    if args.model_dir:
+        import mlflow.catboost as mlflow_catboost
+
+        model = mlflow_catboost.load_model(args.model_dir)
+    else:
+        model = mlflow_service.load_model_for_run(run_id)
+
+    lookup_path = args.lookup_file or _download_lookup_table(run_id)
+
+    params = _run_params(run_id)
+    if args.log_target is not None:
+        params["log_target"] = args.log_target
+
+    out_dir = write_bundle(Path(args.out), model, Path(lookup_path), run_id, params)
+    logger.info(f"Exported serving bundle for run '{run_id}' to {out_dir}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--out", type=str, required=True)
+    parser.add_argument("--run-id", type=str)
+    parser.add_argument("--model-dir", type=str)
+    parser.add_argument("--lookup-file", type=str)
+    parser.add_argument(
+        "--log-target",
+        type=str,
+        choices=["true", "false"],
+        help="Override log_target when the run's params are unavailable.",
+    )
+    main(parser.parse_args())
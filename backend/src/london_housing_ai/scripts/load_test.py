@@ -0,0 +1,331 @@
+"""Measure /predict throughput and latency under reproducible conditions.
+
+Starts the real API (uvicorn, in a subprocess) against a throwaway file-based
+MLflow store populated from ``artifacts/model`` and ``artifacts/lookup_tables.json``,
+points it at a local fake postcodes.io with configurable latency and 429 share,
+then drives ``/predict`` open-loop at a target QPS and prints a JSON report.
+
+Usage:
+    python -m london_housing_ai.scripts.load_test --qps 50 --duration 30
+    python -m london_housing_ai.scripts.load_test --qps 200 --duration 60 \\
+        --postcode-latency-ms 80 --postcode-429-share 0.05 --out report.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import zlib
+from argparse import Namespace
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import aiohttp
+import numpy as np
+from aiohttp import web
+
+from london_housing_ai.lookup_tables import (
+    BINARY_LOOKUP_TABLE_FILE,
+    LookupTables,
+    write_binary_lookup_tables,
+)
+from london_housing_ai.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+ARTIFACTS_DIR = Path(__file__).resolve().parents[3] / "artifacts"
+PROPERTY_TYPES = ("D", "S", "T", "F")
+
+# (latency seconds, HTTP status or 0 for a client-side error)
+Result = Tuple[float, int]
+
+
+def build_local_store(root: Path, model_dir: Path, lookup_file: Path) -> str:
+    """Log ``model_dir`` and the lookup tables as one finished run under ``root``.
+
+    Returns the ``file://`` tracking URI of the new store.
+    """
+    from mlflow.tracking import MlflowClient
+
+    from london_housing_ai.api.services import mlflow_service
+
+    tracking_uri = (root / "mlruns").resolve().as_uri()
+    client = MlflowClient(tracking_uri=tracking_uri)
+    experiment_id = client.create_experiment(mlflow_service.get_experiment_name())
+    run_id = client.create_run(experiment_id, run_name="load_test").info.run_id
+    client.log_artifacts(run_id, str(model_dir), mlflow_service.get_artifact_path())
+    client.log_artifact(run_id, str(lookup_file))
+    binary_lookup = write_binary_lookup_tables(
+        lookup_file, root / BINARY_LOOKUP_TABLE_FILE
+    )
+    client.log_artifact(run_id, str(binary_lookup))
+    client.log_param(run_id, "log_target", "true")
+    client.set_terminated(run_id)
+    return tracking_uri
+
+
+class FakePostcodesIO:
+    """Answers ``GET /postcodes/{postcode}`` like postcodes.io.
+
+    Each postcode maps to a fixed district; responses are delayed by
+    ``latency_seconds`` and a ``rate_limited_share`` of them are 429s.
+    """
+
+    def __init__(
+        self,
+        districts: Sequence[str],
+        latency_seconds: float = 0.05,
+        rate_limited_share: float = 0.0,
+        seed: int = 0,
+    ):
+        self.districts = list(districts)
+        self.latency_seconds = latency_seconds
+        self.rate_limited_share = rate_limited_share
+        self.requests = 0
+        self.rate_limited = 0
+        self._random = random.Random(seed)
+        self._runner: Optional[web.AppRunner] = None
+
+    def district_for(self, postcode: str) -> str:
+        return self.districts[zlib.crc32(postcode.encode()) % len(self.districts)]
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        self.requests += 1
+        if self.latency_seconds:
+            await asyncio.sleep(self.latency_seconds)
+        if self._random.random() < self.rate_limited_share:
+            self.rate_limited += 1
+            return web.json_response({"status": 429}, status=429)
+        postcode = request.match_info["postcode"]
+        return web.json_response(
+            {"status": 200, "result": {"admin_district": self.district_for(postcode)}}
+        )
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Start serving; returns a ``POSTCODE_LOOKUP_URL`` template."""
+        app = web.Application()
+        app.router.add_get("/postcodes/{postcode}", self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        bound_host, bound_port = self._runner.addresses[0][:2]
+        return f"http://{bound_host}:{bound_port}/postcodes/{{postcode}}"
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_api(port: int, env: Dict[str, str], workers: int = 1) -> subprocess.Popen:
+    command = [
+        sys.executable,
+        "-m",
+        "uvicorn",
+        "london_housing_ai.api.main_api:app",
+        "--host",
+        "127.0.0.1",
+        "--port",
+        str(port),
+        "--workers",
+        str(workers),
+        "--no-access-log",
+    ]
+    return subprocess.Popen(command, env={**os.environ, **env})
+
+
+async def wait_until_ready(base_url: str, timeout_seconds: float = 120.0) -> None:
+    deadline = time.monotonic() + timeout_seconds
+    async with aiohttp.ClientSession() as session:
+        while time.monotonic() < deadline:
+            try:
+                async with session.get(f"{base_url}/readyz") as response:
+                    if response.status == 200:
+                        return
+            except aiohttp.ClientError:
+                pass
+            await asyncio.sleep(0.25)
+    raise RuntimeError(f"API at {base_url} was not ready after {timeout_seconds}s")
+
+
+def _payloads(n_postcodes: int, seed: int) -> List[Dict[str, str]]:
+    rng = random.Random(seed)
+    return [
+        {
+            "postcode": f"LT{i % 100} {i // 100 % 10}AA",
+            "property_type": rng.choice(PROPERTY_TYPES),
+            "is_new_build": rng.choice("NNNNY"),
+            "is_leasehold": rng.choice("NY"),
+        }
+        for i in range(n_postcodes)
+    ]
+
+
+async def run_load(
+    base_url: str,
+    qps: float,
+    duration_seconds: float,
+    payloads: Sequence[Dict[str, str]],
+    timeout_seconds: float = 30.0,
+) -> Tuple[List[Result], float]:
+    """Fire requests open-loop at ``qps``; returns results and elapsed seconds.
+
+    Requests are scheduled on a fixed timetable regardless of how long earlier
+    ones take, so a slow server shows up as latency rather than lower load.
+    """
+    results: List[Result] = []
+    timeout = aiohttp.ClientTimeout(total=timeout_seconds)
+    connector = aiohttp.TCPConnector(limit=0)
+    async with aiohttp.ClientSession(timeout=timeout, connector=connector) as session:
+
+        async def one(payload: Dict[str, str]) -> None:
+            start = time.perf_counter()
+            try:
+                async with session.post(f"{base_url}/predict", json=payload) as resp:
+                    await resp.read()
+                    status = resp.status
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                status = 0
+            results.append((time.perf_counter() - start, status))
+
+        total = int(qps * duration_seconds)
+        tasks = []
+        start = time.perf_counter()
+        for i in range(total):
+            delay = start + i / qps - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(one(payloads[i % len(payloads)])))
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - start
+    return results, elapsed
+
+
+def summarize(results: Sequence[Result], elapsed: float, qps: float) -> Dict[str, Any]:
+    latencies_ms = np.array([latency for latency, _ in results]) * 1000
+    statuses = Counter(status for _, status in results)
+    ok = statuses.get(200, 0)
+    report: Dict[str, Any] = {
+        "target_qps": qps,
+        "requests": len(results),
+        "elapsed_seconds": round(elapsed, 3),
+        "throughput_qps": round(len(results) / elapsed, 2) if elapsed else 0.0,
+        "ok_qps": round(ok / elapsed, 2) if elapsed else 0.0,
+        "status_counts": {str(k): v for k, v in sorted(statuses.items())},
+        "error_rate": round(1 - ok / len(results), 4) if results else 0.0,
+        "shed_rate": round(statuses.get(503, 0) / len(results), 4) if results else 0.0,
+    }
+    if len(latencies_ms):
+        report["latency_ms"] = {
+            "mean": round(float(latencies_ms.mean()), 3),
+            "p50": round(float(np.percentile(latencies_ms, 50)), 3),
+            "p90": round(float(np.percentile(latencies_ms, 90)), 3),
+            "p99": round(float(np.percentile(latencies_ms, 99)), 3),
+            "max": round(float(latencies_ms.max()), 3),
+        }
+    return report
+
+
+async def _run(args: Namespace) -> Dict[str, Any]:
+    if args.workdir:
+        return await _run_in(Path(args.workdir), args)
+    # Without --workdir the MLflow store and artifact cache are thrown away.
+    with tempfile.TemporaryDirectory(prefix="london_housing_load_") as workdir:
+        return await _run_in(Path(workdir), args)
+
+
+async def _run_in(workdir: Path, args: Namespace) -> Dict[str, Any]:
+    tracking_uri = build_local_store(
+        workdir, Path(args.model_dir), Path(args.lookup_file)
+    )
+    fake = FakePostcodesIO(
+        LookupTables.load(Path(args.lookup_file)).districts,
+        latency_seconds=args.postcode_latency_ms / 1000,
+        rate_limited_share=args.postcode_429_share,
+        seed=args.seed,
+    )
+    postcode_url = await fake.start()
+    port = args.port or _free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    api = start_api(
+        port,
+        {
+            "MLFLOW_TRACKING_URI": tracking_uri,
+            "POSTCODE_LOOKUP_URL": postcode_url,
+            "ARTIFACT_CACHE_DIR": str(workdir / "artifact_cache"),
+            "LOG_LEVEL": os.getenv("LOG_LEVEL", "WARNING"),
+        },
+        workers=args.workers,
+    )
+    try:
+        await wait_until_ready(base_url)
+        results, elapsed = await run_load(
+            base_url,
+            args.qps,
+            args.duration,
+            _payloads(args.postcodes, args.seed),
+        )
+    finally:
+        api.terminate()
+        api.wait(timeout=30)
+        await fake.stop()
+
+    report = summarize(results, elapsed, args.qps)
+    report["config"] = {
+        "workers": args.workers,
+        "distinct_postcodes": args.postcodes,
+        "postcode_latency_ms": args.postcode_latency_ms,
+        "postcode_429_share": args.postcode_429_share,
+    }
+    report["postcodes_io"] = {
+        "requests": fake.requests,
+        "rate_limited": fake.rate_limited,
+    }
+    return report
+
+
+def main(args: Namespace) -> None:
+    report = asyncio.run(_run(args))
+    payload = json.dumps(report, indent=2)
+    if args.out:
+        Path(args.out).write_text(payload + "\n", encoding="utf-8")
+        logger.info(f"Wrote load test report to {args.out}")
+    print(payload)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--qps", type=float, default=50.0)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--port", type=int)
+    parser.add_argument(
+        "--postcodes",
+        type=int,
+        default=200,
+        help="Distinct postcodes to cycle through; fewer means more cache hits.",
+    )
+    parser.add_argument("--postcode-latency-ms", type=float, default=50.0)
+    parser.add_argument("--postcode-429-share", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--model-dir", type=str, default=str(ARTIFACTS_DIR / "model"))
+    parser.add_argument(
+        "--lookup-file", type=str, default=str(ARTIFACTS_DIR / "lookup_tables.json")
+    )
+    parser.add_argument("--workdir", type=str, help="Keep the MLflow store here.")
+    parser.add_argument("--out", type=str, help="Also write the JSON report here.")
+    main(parser.parse_args())
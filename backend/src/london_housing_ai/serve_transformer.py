@@ -1,23 +1,54 @@
 import datetime
-import json
+from pathlib import Path
 
 import numpy as np
 import pandas as pd
 
+from london_housing_ai.lookup_tables import LookupTables
+
+# Column order must match training exactly
+FEATURE_COLUMNS = [
+    "property_type",
+    "is_new_build",
+    "is_leasehold",
+    "district",
+    "sold_month",
+    "advanced_property_type",
+    "property_type_and_tenure",
+    "property_type_and_district",
+    "date",
+    "sold_year",
+    "borough_price_trend",
+    "district_yearly_medians",
+    "avg_price_last_half",
+]
+
+
+def _gather(values: np.ndarray, codes: np.ndarray) -> np.ndarray:
+    """``values[codes]`` with NaN where ``codes`` is -1 (unknown district)."""
+    out = np.full(len(codes), np.nan)
+    known = codes >= 0
+    out[known] = values[codes[known]]
+    return out
+
 
 class ServingTransformer:
     """Transforms user input into model-ready features.
 
     Mirrors the training pipeline but uses precomputed lookup tables
-    instead of computing trends from the full dataset
+    instead of computing trends from the full dataset.
+
+    ``lookup_path`` may point at ``lookup_tables.json`` or at the binary
+    ``lookup_tables.bin``; the binary form is memory-mapped.
     """
 
     def __init__(self, lookup_path: str):
-        with open(lookup_path) as f:
-            tables = json.load(f)
-        self._borough_price_trend = tables["borough_price_trend"]
-        self._district_yearly_medians = tables["district_yearly_medians"]
-        self._avg_price_last_half = tables["avg_price_last_half"]
+        self._tables = LookupTables.load(Path(lookup_path))
+
+    @property
+    def districts(self) -> list:
+        """Districts with lookup-table entries, in vocabulary order."""
+        return list(self._tables.districts)
 
     def transform(self, user_input: dict) -> pd.DataFrame:
         today = datetime.date.today()
@@ -30,19 +61,19 @@ class ServingTransformer:
         sold_month = today.month
 
         # Trend lookups = use district median as fallback if district unseen
-        global_price_median = np.median(list(self._borough_price_trend.values()))
-        borough_price_trend = self._borough_price_trend.get(
-            district, global_price_median
-        )
-        district_yearly_median = self._district_yearly_medians.get(
-            f"{district}_{sold_year}",
-            self._district_yearly_medians.get(
-                f"{district}_{sold_year - 1}", global_price_median
-            ),
-        )
-        avg_price_last_half = self._avg_price_last_half.get(
-            district, global_price_median
-        )
+        tables = self._tables
+        global_price_median = tables.global_price_median
+        borough_price_trend = tables.borough_trend(district)
+        if borough_price_trend is None:
+            borough_price_trend = global_price_median
+        district_yearly_median = tables.yearly_median(district, sold_year)
+        if district_yearly_median is None:
+            district_yearly_median = tables.yearly_median(district, sold_year - 1)
+        if district_yearly_median is None:
+            district_yearly_median = global_price_median
+        avg_price_last_half = tables.recent_median(district)
+        if avg_price_last_half is None:
+            avg_price_last_half = global_price_median
 
         # Interaction features - deterministic, same logic as training
         advanced_property_type = f"{is_new_build}_{property_type}"
@@ -66,21 +97,67 @@ class ServingTransformer:
             "avg_price_last_half": avg_price_last_half,
         }
 
-        # Column order must match training exactly
-        required_cols = [
-            "property_type",
-            "is_new_build",
-            "is_leasehold",
-            "district",
-            "sold_month",
-            "advanced_property_type",
-            "property_type_and_tenure",
-            "property_type_and_district",
-            "date",
-            "sold_year",
-            "borough_price_trend",
-            "district_yearly_medians",
-            "avg_price_last_half",
+        return pd.DataFrame([row])[FEATURE_COLUMNS]
+
+    def _yearly_medians(self, codes: np.ndarray, year: int) -> np.ndarray:
+        yearly = self._tables.district_yearly_medians
+        offset = year - self._tables.year_min
+        if not 0 <= offset < yearly.shape[1]:
+            return np.full(len(codes), np.nan)
+        return _gather(yearly[:, offset], codes)
+
+    def transform_batch(self, frame: pd.DataFrame) -> pd.DataFrame:
+        """Vectorised ``transform`` for many requests at once.
+
+        ``frame`` has one row per request with the same keys ``transform``
+        reads; the result matches ``transform`` row for row.
+        """
+        today = datetime.date.today()
+        tables = self._tables
+        n_rows = len(frame)
+        district = frame["district"].astype(str).reset_index(drop=True)
+        property_type = frame["property_type"].astype(str).reset_index(drop=True)
+        is_new_build = self._flag(frame, "is_new_build", n_rows)
+        is_leasehold = self._flag(frame, "is_leasehold", n_rows)
+
+        codes = district.map(tables.district_codes).fillna(-1).to_numpy(dtype=int)
+        fallback = tables.global_price_median
+        district_yearly_median = self._yearly_medians(codes, today.year)
+        missing = np.isnan(district_yearly_median)
+        district_yearly_median[missing] = self._yearly_medians(codes, today.year - 1)[
+            missing
         ]
 
-        return pd.DataFrame([row])[required_cols]
+        features = pd.DataFrame(
+            {
+                "property_type": property_type,
+                "is_new_build": is_new_build,
+                "is_leasehold": is_leasehold,
+                "district": district,
+                "sold_month": today.month,
+                "advanced_property_type": is_new_build + "_" + property_type,
+                "property_type_and_tenure": is_leasehold + "_" + property_type,
+                "property_type_and_district": district + "_" + property_type,
+                # Same datetime64[ns] dtype the single-row frame infers.
+                "date": pd.Timestamp(datetime.date(today.year, today.month, 1)).as_unit(
+                    "ns"
+                ),
+                "sold_year": today.year,
+                "borough_price_trend": np.nan_to_num(
+                    _gather(tables.borough_price_trend, codes), nan=fallback
+                ),
+                "district_yearly_medians": np.nan_to_num(
+                    district_yearly_median, nan=fallback
+                ),
+                "avg_price_last_half": np.nan_to_num(
+                    _gather(tables.avg_price_last_half, codes), nan=fallback
+                ),
+            }
+        )
+        return features[FEATURE_COLUMNS]
+
+    @staticmethod
+    def _flag(frame: pd.DataFrame, column: str, n_rows: int) -> pd.Series:
+        if column not in frame:
+            return pd.Series(["N"] * n_rows)
+        return frame[column].fillna("N").astype(str).reset_index(drop=True)
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import asyncio
+import os
+import time
 from typing import Optional
 from urllib.parse import quote
 
@@ -8,12 +10,20 @@ import aiohttp
 import async_timeout
 
 from london_housing_ai.utils.logger import get_logger
+from london_housing_ai.utils.metrics import (
+    POSTCODE_CACHE_REQUESTS,
+    POSTCODE_RESOLUTION_SECONDS,
+    POSTCODE_UPSTREAM_ERRORS,
+)
 
-POSTCODE_LOOKUP_URL = "https://api.postcodes.io/postcodes/{postcode}"
+# Overridable so load tests can point at a local stand-in for postcodes.io.
+POSTCODE_LOOKUP_URL = os.getenv(
+    "POSTCODE_LOOKUP_URL", "https://api.postcodes.io/postcodes/{postcode}"
+)
 _cache: dict[str, Optional[str]] = {}
 _lock = asyncio.Lock()
 _session: Optional[aiohttp.ClientSession] = None
-logger = get_logger()
+logger = get_logger(__name__)
 
 
 def _normalize_postcode(postcode: str) -> str:
@@ -27,18 +37,29 @@ def get_session() -> aiohttp.ClientSession:
     return _session
 
 
-async def resolve_district(postcode: str, timeout_seconds: int = 10) -> Optional[str]:
+async def resolve_district(
+    postcode: str, timeout_seconds: Optional[float] = None
+) -> Optional[str]:
     """
     Resolve a single postcode to its admin district using postcodes.io.
     Returns None for unknown/invalid postcodes or transient lookup errors.
     """
     if not postcode or not postcode.strip():
         return None
+    if timeout_seconds is None:
+        # Bounds how long an admitted /predict request can wait on postcodes.io.
+        timeout_seconds = float(os.getenv("POSTCODE_LOOKUP_TIMEOUT_SECONDS", "10"))
 
+    start = time.perf_counter()
     normalized = _normalize_postcode(postcode)
     async with _lock:
         if normalized in _cache:
+            POSTCODE_CACHE_REQUESTS.labels(result="hit").inc()
+            POSTCODE_RESOLUTION_SECONDS.labels(cache="hit").observe(
+                time.perf_counter() - start
+            )
             return _cache[normalized]
+    POSTCODE_CACHE_REQUESTS.labels(result="miss").inc()
 
     url = POSTCODE_LOOKUP_URL.format(postcode=quote(normalized))
     district: Optional[str] = None
@@ -55,9 +76,20 @@ async def resolve_district(postcode: str, timeout_seconds: int = 10) -> Optional
                         payload = await response.json()
                         result = payload.get("result") or {}
                         district = result.get("admin_district")
-    except (aiohttp.ClientError, asyncio.TimeoutError):
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        if isinstance(e, asyncio.TimeoutError):
+            reason = "timeout"
+        elif isinstance(e, aiohttp.ClientResponseError):
+            reason = f"http_{e.status}"
+        else:
+            reason = "client_error"
+        POSTCODE_UPSTREAM_ERRORS.labels(reason=reason).inc()
         logger.warning("Postcode lookup failed for postcode=%s", normalized)
         return None
+    finally:
+        POSTCODE_RESOLUTION_SECONDS.labels(cache="miss").observe(
+            time.perf_counter() - start
+        )
 
     async with _lock:
         _cache[normalized] = district
@@ -0,0 +1,175 @@
+"""Self-contained serving bundle.
+
+A bundle is a directory holding everything the API needs to answer ``/predict``
+for one trained run:
+
+    manifest.json        run id, params (e.g. ``log_target``), file checksums
+    model.cbm            native CatBoost model
+    lookup_tables.bin    memory-mapped serving lookup tables
+    lookup_tables.json   the same tables as JSON (when built from JSON)
+    feature_schema.json  ordered feature columns and categorical features
+
+Reading a bundle only needs CatBoost and pandas, so the API can serve from it
+without importing MLflow at all.
+"""
+
+import datetime
+import json
+import shutil
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from london_housing_ai.lookup_tables import (
+    BINARY_LOOKUP_TABLE_FILE,
+    BINARY_MAGIC,
+    LOOKUP_TABLE_FILE,
+    LookupTables,
+)
+from london_housing_ai.utils.checksum import file_sha256
+
+BUNDLE_FORMAT_VERSION = 1
+MANIFEST_FILE = "manifest.json"
+MODEL_FILE = "model.cbm"
+FEATURE_SCHEMA_FILE = "feature_schema.json"
+
+
+def _parse_bool(raw: Any, default: bool) -> bool:
+    if raw is None:
+        return default
+    return str(raw).strip().lower() in {"1", "true", "yes", "y"}
+
+
+def feature_schema_from_model(model) -> Dict[str, List[str]]:
+    columns = list(model.feature_names_)
+    cat_indices = set(model.get_cat_feature_indices())
+    return {
+        "columns": columns,
+        "cat_features": [col for i, col in enumerate(columns) if i in cat_indices],
+        "numeric_features": [
+            col for i, col in enumerate(columns) if i not in cat_indices
+        ],
+    }
+
+
+def write_bundle(
+    out_dir: Path,
+    model,
+    lookup_path: Path,
+    run_id: str,
+    params: Optional[Dict[str, Any]] = None,
+) -> Path:
+    """Write ``model`` and ``lookup_path`` for ``run_id`` as a serving bundle."""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    model_path = out_dir / MODEL_FILE
+    model.save_model(str(model_path), format="cbm")
+    lookup_files = [BINARY_LOOKUP_TABLE_FILE]
+    LookupTables.load(lookup_path).write_binary(out_dir / BINARY_LOOKUP_TABLE_FILE)
+    with Path(lookup_path).open("rb") as f:
+        if f.read(len(BINARY_MAGIC)) != BINARY_MAGIC:
+            shutil.copyfile(lookup_path, out_dir / LOOKUP_TABLE_FILE)
+            lookup_files.append(LOOKUP_TABLE_FILE)
+
+    schema_path = out_dir / FEATURE_SCHEMA_FILE
+    with schema_path.open("w", encoding="utf-8") as f:
+        json.dump(feature_schema_from_model(model), f, indent=2)
+
+    run_params = {k: str(v) for k, v in (params or {}).items()}
+    manifest = {
+        "format_version": BUNDLE_FORMAT_VERSION,
+        "run_id": run_id,
+        "created_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "params": run_params,
+        "log_target": _parse_bool(run_params.get("log_target"), default=True),
+        "files": {
+            name: {
+                "size": (out_dir / name).stat().st_size,
+                "sha256": file_sha256(out_dir / name),
+            }
+            for name in (MODEL_FILE, *lookup_files, FEATURE_SCHEMA_FILE)
+        },
+    }
+    with (out_dir / MANIFEST_FILE).open("w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    return out_dir
+
+
+@dataclass(frozen=True)
+class ServingBundle:
+    root: Path
+    manifest: Dict[str, Any]
+
+    @classmethod
+    def load(cls, root: Path, verify: bool = True) -> "ServingBundle":
+        root = Path(root)
+        manifest_path = root / MANIFEST_FILE
+        if not manifest_path.exists():
+            raise FileNotFoundError(
+                f"Serving bundle manifest not found: {manifest_path}"
+            )
+        with manifest_path.open(encoding="utf-8") as f:
+            manifest = json.load(f)
+
+        version = manifest.get("format_version")
+        if version != BUNDLE_FORMAT_VERSION:
+            raise RuntimeError(
+                f"Unsupported serving bundle format_version={version}; "
+                f"expected {BUNDLE_FORMAT_VERSION}."
+            )
+        bundle = cls(root=root, manifest=manifest)
+        if verify:
+            bundle.verify()
+        return bundle
+
+    def verify(self) -> None:
+        for name, expected in self.manifest.get("files", {}).items():
+            path = self.root / name
+            if not path.exists():
+                raise FileNotFoundError(f"Serving bundle file missing: {path}")
+            if path.stat().st_size != expected["size"]:
+                raise RuntimeError(f"Serving bundle file size mismatch: {path}")
+            if file_sha256(path) != expected["sha256"]:
+                raise RuntimeError(f"Serving bundle checksum mismatch: {path}")
+
+    @property
+    def run_id(self) -> str:
+        return self.manifest["run_id"]
+
+    @property
+    def params(self) -> Dict[str, str]:
+        return self.manifest.get("params", {})
+
+    @property
+    def log_target(self) -> bool:
+        return bool(self.manifest.get("log_target", True))
+
+    @property
+    def model_path(self) -> Path:
+        return self.root / MODEL_FILE
+
+    @property
+    def lookup_path(self) -> Path:
+        # Bundles written before the binary format only carry the JSON tables.
+        if BINARY_LOOKUP_TABLE_FILE in self.manifest.get("files", {}):
+            return self.root / BINARY_LOOKUP_TABLE_FILE
+        return self.root / LOOKUP_TABLE_FILE
+
+    @property
+    def feature_schema(self) -> Dict[str, List[str]]:
+        with (self.root / FEATURE_SCHEMA_FILE).open(encoding="utf-8") as f:
+            return json.load(f)
+
+    def load_model(self):
+        # Imported lazily so that merely resolving a bundle stays cheap.
+        from catboost import CatBoostRegressor
+
+        model = CatBoostRegressor()
+        model.load_model(str(self.model_path), format="cbm")
+        return model
+
+    def load_transformer(self):
+        from london_housing_ai.serve_transformer import ServingTransformer
+
+        return ServingTransformer(str(self.lookup_path))
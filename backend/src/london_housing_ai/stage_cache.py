@@ -0,0 +1,262 @@
+"""Memoise the training pipeline stage by stage as Parquet files.
+
+Stages run in a chain: clean -> geocode -> features -> augment -> train_frame.
+Each output is stored as ``<root>/<stage>/<key>.parquet``. The key hashes the
+upstream stage's key (the raw CSV checksum for ``clean``), the config the stage
+reads and the source code of the functions implementing it. Keys only depend
+on inputs, never on data, so the whole chain can be keyed before anything
+runs. A rerun then recomputes from the first stage whose key changed. The
+final gold key also names the persisted Postgres table.
+
+Usage:
+    python -m london_housing_ai.stage_cache list
+    python -m london_housing_ai.stage_cache prune --older-than-days 30
+    python -m london_housing_ai.stage_cache prune --stage geocode --keep-latest 2
+"""
+
+import argparse
+import dataclasses
+import hashlib
+import inspect
+import json
+import os
+import time
+import uuid
+from argparse import Namespace
+from dataclasses import dataclass
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+from london_housing_ai import augmenters, cleaners, feature_engineering, pipeline
+from london_housing_ai.utils.logger import get_logger
+from london_housing_ai.utils.paths import get_project_root
+
+STAGES = ("clean", "geocode", "features", "augment", "train_frame")
+
+# Code each stage's output depends on; editing any of it invalidates the
+# stage and everything downstream. Geocoding deliberately excludes the rest of
+# feature_engineering so feature work does not refetch postcodes.
+STAGE_CODE: Dict[str, Sequence[Union[Callable, ModuleType]]] = {
+    "clean": (
+        pipeline.clean_dataset,
+        cleaners,
+        feature_engineering.extract_sold_year,
+        feature_engineering.extract_sold_month,
+    ),
+    "geocode": (
+        pipeline.geocode_dataset,
+        feature_engineering.filter_by_keywords,
+        feature_engineering.get_district_from_postcode,
+        feature_engineering._bulk_lookup,
+        feature_engineering._fetch_districts_with_retries,
+        feature_engineering._one_round,
+    ),
+    "features": (pipeline.extract_features, feature_engineering),
+    "augment": (pipeline.build_aug_dataset, augmenters),
+    "train_frame": (pipeline.required_columns,),
+}
+
+logger = get_logger(__name__)
+
+
+def _jsonable(value: Any) -> Any:
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return dataclasses.asdict(value)
+    return str(value)
+
+
+def code_version(stage: str) -> str:
+    digest = hashlib.sha256()
+    for obj in STAGE_CODE[stage]:
+        digest.update(inspect.getsource(obj).encode())
+    return digest.hexdigest()
+
+
+def stage_key(stage: str, upstream_key: str, config: Any) -> str:
+    """Hash of what ``stage`` reads: upstream output, its config and its code."""
+    payload = json.dumps(
+        [stage, upstream_key, config, code_version(stage)],
+        sort_keys=True,
+        default=_jsonable,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+@dataclass
+class CacheEntry:
+    stage: str
+    key: str
+    path: Path
+    rows: int
+    size_bytes: int
+    last_used: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "stage": self.stage,
+            "key": self.key,
+            "rows": self.rows,
+            "size_bytes": self.size_bytes,
+            "last_used": time.strftime(
+                "%Y-%m-%dT%H:%M:%S", time.localtime(self.last_used)
+            ),
+        }
+
+
+class StageCache:
+    def __init__(self, root: Path, enabled: bool = True):
+        self.root = Path(root)
+        self.enabled = enabled
+
+    def path(self, stage: str, key: str) -> Path:
+        return self.root / stage / f"{key}.parquet"
+
+    def load(self, stage: str, key: str) -> Optional[pd.DataFrame]:
+        path = self.path(stage, key)
+        if not self.enabled or not path.exists():
+            return None
+        df = pd.read_parquet(path)
+        # Hits refresh the mtime so pruning by age drops the least recently used.
+        os.utime(path)
+        logger.info(f"Stage '{stage}' cache hit ({key[:12]}, {len(df)} rows)")
+        return df
+
+    def save(self, stage: str, key: str, df: pd.DataFrame) -> None:
+        if not self.enabled:
+            return
+        path = self.path(stage, key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+        try:
+            df.to_parquet(tmp)
+            os.replace(tmp, path)
+        finally:
+            tmp.unlink(missing_ok=True)
+
+    def get_or_compute(
+        self, stage: str, key: str, compute: Callable[[], pd.DataFrame]
+    ) -> pd.DataFrame:
+        df = self.load(stage, key)
+        if df is None:
+            df = compute()
+            self.save(stage, key, df)
+        return df
+
+    def entries(self, stage: Optional[str] = None) -> List[CacheEntry]:
+        stages = [stage] if stage else STAGES
+        found = []
+        for name in stages:
+            for path in sorted((self.root / name).glob("*.parquet")):
+                stat = path.stat()
+                found.append(
+                    CacheEntry(
+                        stage=name,
+                        key=path.stem,
+                        path=path,
+                        rows=pq.ParquetFile(path).metadata.num_rows,
+                        size_bytes=stat.st_size,
+                        last_used=stat.st_mtime,
+                    )
+                )
+        return found
+
+    def prune(
+        self,
+        stage: Optional[str] = None,
+        older_than_seconds: Optional[float] = None,
+        keep_latest: Optional[int] = None,
+        dry_run: bool = False,
+    ) -> List[CacheEntry]:
+        """Delete entries by age and/or beyond the newest ``keep_latest`` per stage."""
+        doomed: List[CacheEntry] = []
+        now = time.time()
+        for name in [stage] if stage else STAGES:
+            entries = sorted(self.entries(name), key=lambda e: e.last_used)
+            if keep_latest is not None:
+                cut = max(0, len(entries) - keep_latest)
+                doomed.extend(entries[:cut])
+                entries = entries[cut:]
+            if older_than_seconds is not None:
+                doomed.extend(
+                    e for e in entries if now - e.last_used > older_than_seconds
+                )
+        if not dry_run:
+            for entry in doomed:
+                entry.path.unlink(missing_ok=True)
+        return doomed
+
+
+def pipeline_keys(
+    checksum: str,
+    cleaning_config: Any,
+    fe_config: Any,
+    train_columns: Sequence[str],
+    augment: Optional[Any] = None,
+) -> Dict[str, str]:
+    """Keys of every stage for one run, plus ``gold`` (the persisted table's)."""
+    keys = {"clean": stage_key("clean", checksum, cleaning_config)}
+    geocode_config = {
+        "postcode_col": cleaning_config.postcode_col,
+        "use_district": fe_config.use_district,
+        "district_col": fe_config.district_col,
+        "city_filter": fe_config.city_filter,
+    }
+    keys["geocode"] = stage_key("geocode", keys["clean"], geocode_config)
+    keys["features"] = stage_key("features", keys["geocode"], fe_config)
+    keys["gold"] = keys["features"]
+    if augment is not None:
+        keys["augment"] = stage_key("augment", keys["features"], augment)
+        keys["gold"] = keys["augment"]
+    keys["train_frame"] = stage_key("train_frame", keys["gold"], list(train_columns))
+    return keys
+
+
+def get_stage_cache() -> StageCache:
+    default = get_project_root() / "data_lake" / "stage_cache"
+    root = Path(os.getenv("STAGE_CACHE_DIR", str(default)))
+    enabled = os.getenv("STAGE_CACHE_ENABLED", "true").lower() == "true"
+    return StageCache(root, enabled=enabled)
+
+
+def main(args: Namespace) -> None:
+    cache = StageCache(Path(args.root)) if args.root else get_stage_cache()
+    if args.command == "list":
+        entries = cache.entries(args.stage)
+    else:
+        entries = cache.prune(
+            stage=args.stage,
+            older_than_seconds=(
+                args.older_than_days * 86400
+                if args.older_than_days is not None
+                else None
+            ),
+            keep_latest=args.keep_latest,
+            dry_run=args.dry_run,
+        )
+    for entry in entries:
+        print(json.dumps(entry.to_dict()))
+    total = sum(e.size_bytes for e in entries)
+    verb = "listed" if args.command == "list" else "pruned"
+    logger.info(f"{len(entries)} cache entries {verb} ({total} bytes) in {cache.root}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("command", choices=["list", "prune"])
+    parser.add_argument("--root", type=str, help="Defaults to STAGE_CACHE_DIR.")
+    parser.add_argument("--stage", type=str, choices=STAGES)
+    parser.add_argument("--older-than-days", type=float)
+    parser.add_argument("--keep-latest", type=int)
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Show what prune would delete."
+    )
+    args = parser.parse_args()
+    if args.command == "prune" and (
+        args.older_than_days is None and args.keep_latest is None
+    ):
+        parser.error("prune needs --older-than-days and/or --keep-latest")
+    main(args)
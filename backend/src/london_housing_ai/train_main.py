@@ -2,16 +2,20 @@ import argparse
 import asyncio
 import os
 from argparse import Namespace
+from pathlib import Path
+from typing import Optional
 
 import mlflow
 import mlflow.catboost as mlflow_catboost
 import mlflow.exceptions
 from dotenv import load_dotenv
 from mlflow import MlflowClient
+from pandas import DataFrame
 
 from london_housing_ai.augmenters import add_floor_area
 from london_housing_ai.data_quality_reporter import generate_data_quality_report
 from london_housing_ai.experiment_logger import ExperimentLogger
+from london_housing_ai.feature_engineering import build_lookup_tables
 from london_housing_ai.file_injest import (
     upload_parquet_to_gcs,
     write_df_to_partitioned_parquet,
@@ -23,7 +27,9 @@ from london_housing_ai.loaders import (
     load_fe_config,
     load_parquet_config,
     load_train_config,
+    load_tune_config,
 )
+from london_housing_ai.lookup_tables import write_lookup_artifacts
 from london_housing_ai.models import PriceModel
 from london_housing_ai.persistence import (
     dataset_already_persisted,
@@ -31,20 +37,55 @@ from london_housing_ai.persistence import (
     get_dataset_from_db,
     get_engine,
     persist_dataset,
-    record_checksum,
     reset_postgres,
 )
 from london_housing_ai.pipeline import (
     clean_dataset,
     df_with_required_cols,
-    feature_engineer_dataset,
+    extract_features,
+    geocode_dataset,
+    required_columns,
 )
+from london_housing_ai.quantized_pools import (
+    ChunkSource,
+    FrameSource,
+    ParquetSource,
+    get_quantized_pool_dir,
+)
+from london_housing_ai.stage_cache import StageCache, get_stage_cache, pipeline_keys
 from london_housing_ai.utils.checksum import file_sha256, unique_filename_from_sha256
 from london_housing_ai.utils.logger import get_logger
 from london_housing_ai.utils.paths import get_project_root
 
 load_dotenv()
-logger = get_logger()
+logger = get_logger(__name__)
+
+# Columns build_lookup_tables aggregates over.
+LOOKUP_SOURCE_COLUMNS = frozenset({"district", "sold_year", "date", "price"})
+
+
+def upload_silver_layer(
+    df: DataFrame,
+    config_path: Path,
+    data_path: Path,
+    credential_path: Optional[str],
+    cleanup: bool,
+) -> None:
+    # silver layer check-point
+    parquet_config = load_parquet_config(config_path)
+    parquet_dir = data_path / "silver"
+
+    write_df_to_partitioned_parquet(
+        df=df,
+        out_dir=parquet_dir,
+        partition_cols=parquet_config.silver_partition_cols,
+    )
+    upload_parquet_to_gcs(
+        local_dir=parquet_dir,
+        destination_blob_name=parquet_config.destination_blob_name,
+        credential_path=credential_path,
+        cleanup=cleanup,
+    )
 
 
 def main(args: Namespace) -> None:  # noqa: C901
@@ -68,76 +109,116 @@ def main(args: Namespace) -> None:  # noqa: C901
     ensure_checksum_table(engine)
     checksum = file_sha256(csv_path)
     cleaning_config = load_cleaning_config(config_path)
+    train_cfg = load_train_config(config_path)
     raw_data = load_dataset(
         csv_path, cleaning_config.col_headers, cleaning_config.loading_cols
     )
 
+    fe_config = load_fe_config(config_path)
+    augment = None
+    if args.aug:
+        aug_config = load_augment_config(config_path)
+        if aug_config is None:
+            raise ValueError(
+                "Augment config could not be loaded. Please check your config file."
+            )
+        aug_csv_path = root_path / "data" / args.aug
+        augment = (aug_config, file_sha256(aug_csv_path))
+
+    # every stage is keyed up front; the gold key names the persisted table
+    train_columns = [*required_columns(train_cfg), *sorted(LOOKUP_SOURCE_COLUMNS)]
+    keys = pipeline_keys(
+        checksum, cleaning_config, fe_config, train_columns, augment=augment
+    )
+    gold_key = keys["gold"]
+    cache = get_stage_cache()
+
+    df = cache.load("train_frame", keys["train_frame"])
+    train_frame_cached = df is not None
+    persisted_key = None
+    if df is None:
+        # Datasets persisted before stage keys existed are recorded under the
+        # raw CSV checksum; they are still used rather than rebuilt.
+        persisted_key = next(
+            (k for k in (gold_key, checksum) if dataset_already_persisted(engine, k)),
+            None,
+        )
     # if dataset exists load dataset from db
-    if dataset_already_persisted(engine, checksum):
-        logger.info(
-            f"checksum '{checksum}' for '{csv_path}' is found, skipping cleaning and extraction."
+    if persisted_key is not None:
+        if persisted_key == gold_key:
+            logger.info(
+                f"gold key '{gold_key}' for '{csv_path}' is found, skipping cleaning and extraction."
+            )
+        else:
+            logger.warning(
+                f"'{csv_path}' is only persisted under its checksum '{checksum}', "
+                f"not gold key '{gold_key}'; using that table. Drop its "
+                "dataset_hashes row to rebuild it under the gold key."
+            )
+        # only the training and lookup columns are transferred, already typed
+        df = get_dataset_from_db(
+            engine,
+            persisted_key,
+            columns=train_columns,
+            categorical=train_cfg.cat_features,
         )
-        df = get_dataset_from_db(engine, checksum)
-    else:
+    elif df is None:
         logger.info(
-            f"checksum '{checksum}' for '{csv_path}' is not found, proceeding cleaning and extraction."
+            f"gold key '{gold_key}' for '{csv_path}' is not found, proceeding cleaning and extraction."
         )
 
         # if dataset not exist, proceed cleaning and data extraction
-        df = clean_dataset(raw_data.copy(), cleaning_config)
-
+        df = cache.get_or_compute(
+            "clean",
+            keys["clean"],
+            lambda: clean_dataset(raw_data.copy(), cleaning_config),
+        )
+        # outside the cached stage, so a cache hit still uploads the silver layer
         if os.environ.get("DEV_MODE", "false").lower() != "true":
-            logger.info("Dev mode is on, skipping uploading to Google Cloud Storage.")
-            # ------comment it only when gcs uploading is required.
-            # silver layer check-point
-            parquet_config = load_parquet_config(config_path)
-            parquet_dir = data_path / "silver"
-
-            write_df_to_partitioned_parquet(
-                df=df,
-                out_dir=parquet_dir,
-                partition_cols=parquet_config.silver_partition_cols,
-            )
-            upload_parquet_to_gcs(
-                local_dir=parquet_dir,
-                destination_blob_name=parquet_config.destination_blob_name,
-                credential_path=credential_path,
-                cleanup=args.cleanup_local,
-            )
-            # -------end of gcs uploading
-
-        df = asyncio.run(
-            feature_engineer_dataset(
-                df, load_fe_config(config_path), cleaning_config.postcode_col
+            upload_silver_layer(
+                df, config_path, data_path, credential_path, args.cleanup_local
             )
+        else:
+            logger.info("Dev mode is on, skipping uploading to Google Cloud Storage.")
+        df = cache.get_or_compute(
+            "geocode",
+            keys["geocode"],
+            lambda: asyncio.run(
+                geocode_dataset(df, fe_config, cleaning_config.postcode_col)
+            ),
         )
         if df.empty:
             return
+        df = cache.get_or_compute(
+            "features", keys["features"], lambda: extract_features(df, fe_config)
+        )
         # merging with supplement dataset
-        if args.aug:
-            aug_config = load_augment_config(config_path)
-            if aug_config is None:
-                raise ValueError(
-                    "Augment config could not be loaded. Please check your config file."
+        if augment is not None:
+            aug_config = augment[0]
+
+            def augment_features() -> DataFrame:
+                aug_df = load_dataset(
+                    aug_csv_path, aug_config.col_headers, aug_config.required_cols
                 )
-            aug_csv_path = root_path / "data" / args.aug
-            aug_df = load_dataset(
-                aug_csv_path, aug_config.col_headers, aug_config.required_cols
-            )
-            df = add_floor_area(
-                main_df=df,
-                aug_df=aug_df,
-                floor_col=aug_config.floor_col,
-                merge_key=aug_config.postcode_col,
-                how=aug_config.join_method,
-                min_match_rate=aug_config.min_match_rate,
-            )
+                return add_floor_area(
+                    main_df=df,
+                    aug_df=aug_df,
+                    floor_col=aug_config.floor_col,
+                    merge_key=aug_config.postcode_col,
+                    how=aug_config.join_method,
+                    min_match_rate=aug_config.min_match_rate,
+                )
+
+            df = cache.get_or_compute("augment", keys["augment"], augment_features)
 
         # gold layer check-point
 
-        # persist clean/merged dataset
-        persist_dataset(df, engine, checksum)
-        record_checksum(engine, checksum)
+        # persist clean/merged dataset; records the gold key in the same swap
+        persist_dataset(df, engine, gold_key)
+
+    if not train_frame_cached:
+        df = df[[c for c in dict.fromkeys(train_columns) if c in df.columns]]
+        cache.save("train_frame", keys["train_frame"], df)
 
     # model training
     client = MlflowClient()
@@ -152,25 +233,46 @@ def main(args: Namespace) -> None:  # noqa: C901
 
     mlflow.set_experiment(experiment_name=EXPERIMENT_NAME)
 
+    training_df = df_with_required_cols(df, train_cfg)
+    tune_run_id = None
+    if args.tune:
+        # imported here so plain training runs never import ray
+        from london_housing_ai.tuning import tune_train_config
+
+        # the promoted config is trained and logged below like any other run
+        train_cfg, tune_run_id = tune_train_config(
+            training_df, train_cfg, load_tune_config(config_path)
+        )
+
     # start logging metadata as you train a model
     with mlflow.start_run(run_name="london_housing_run") as run:
-        train_cfg = load_train_config(config_path)
-        training_df = df_with_required_cols(df, train_cfg)
+        if tune_run_id is not None:
+            mlflow.set_tag("tuned_by_run_id", tune_run_id)
         trainer = PriceModel(train_cfg)
-        trainer.train_and_evaluate(training_df, checksum)
+        if train_cfg.quantized_pools:
+            trainer.train_and_evaluate_quantized(
+                training_source(cache, keys["train_frame"], training_df),
+                checksum,
+                get_quantized_pool_dir(),
+                dataset_key=keys["train_frame"],
+            )
+        else:
+            trainer.train_and_evaluate(training_df, checksum)
 
         try:
             # log trained model into MLflow under consistent path
             mlflow_catboost.log_model(
                 cb_model=trainer.model,
                 name=os.getenv("MLFLOW_ARTIFACT_PATH", "catboost_model"),
-                input_example=training_df.drop(columns=[train_cfg.label]).iloc[:1],
+                input_example=training_df.iloc[:1].drop(columns=[train_cfg.label]),
             )
         except Exception as exc:
             msg = f"Failed to log Catboost model to MLflow. caused by: {exc}"
             logger.exception(msg)
             raise RuntimeError(msg)
 
+        log_lookup_tables(df)
+
         generate_data_quality_report(
             raw_data.copy(), unique_filename_from_sha256("data_quality", checksum)
         )
@@ -185,11 +287,36 @@ def main(args: Namespace) -> None:  # noqa: C901
     #     reset_postgres(engine)
 
 
+def training_source(
+    cache: StageCache, train_frame_key: str, training_df: DataFrame
+) -> ChunkSource:
+    """Stream the cached training frame from disk when there is one."""
+    path = cache.path("train_frame", train_frame_key)
+    if cache.enabled and path.exists():
+        return ParquetSource(path)
+    return FrameSource(training_df)
+
+
+def log_lookup_tables(df: DataFrame) -> None:
+    """Log the serving lookup tables built from the frame this run trained on."""
+    missing = LOOKUP_SOURCE_COLUMNS.difference(df.columns)
+    if missing:
+        logger.warning(f"Skipping lookup tables; dataset has no {sorted(missing)}.")
+        return
+    for path in write_lookup_artifacts(build_lookup_tables(df)):
+        mlflow.log_artifact(str(path))
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("--config", type=str)
     parser.add_argument("--csv", type=str)
     parser.add_argument("--aug", type=str)
     parser.add_argument("--cleanup_local", action="store_true")
+    parser.add_argument(
+        "--tune",
+        action="store_true",
+        help="Search CatBoost parameters with Ray Tune and train the best.",
+    )
     args = parser.parse_args()
     main(args)
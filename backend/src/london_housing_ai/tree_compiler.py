@@ -0,0 +1,464 @@
+"""Compile a trained CatBoost model into flat NumPy arrays.
+
+CatBoost trees are oblivious: every node at one depth of a tree tests the same
+split, so a tree is fully described by one split per depth plus a table of
+``2 ** depth`` leaf values. ``compile_catboost_model`` flattens a fitted
+``CatBoostRegressor`` into that representation:
+
+- float splits become ``(feature, border)`` pairs,
+- one-hot splits become ``(cat feature, hash)`` pairs,
+- CTR splits become ``(ctr, border)`` pairs, where every CTR value is
+  pre-computed from the model's own counters for each hash bucket it knows.
+
+Categorical strings are mapped to CatBoost's hashes once at compile time using
+the known category set, so evaluation is pure array indexing and arithmetic and
+agrees bit-for-bit with ``model.predict`` for categories in that set.
+"""
+
+import json
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+_UINT64_MASK = (1 << 64) - 1
+_MAGIC_MULT = np.uint64(0x4906BA494954CB65)
+# Marks an empty slot in CatBoost's dense CTR hash maps.
+_EMPTY_BUCKET_HASH = _UINT64_MASK
+# CatBoost's own Python exporter hashes unseen categories to this value.
+UNKNOWN_CATEGORY_HASH = 0x7FFFFFFF
+
+_FLOAT_SPLIT = "FloatFeature"
+_ONE_HOT_SPLIT = "OneHotFeature"
+_CTR_SPLIT = "OnlineCtr"
+
+
+def _model_hash(value: int) -> int:
+    """Sign-extend a 32-bit categorical hash the way CatBoost does (ui64)(int)."""
+    value &= 0xFFFFFFFF
+    if value >= 1 << 31:
+        value -= 1 << 32
+    return value & _UINT64_MASK
+
+
+def _calc_hash(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    # uint64 arithmetic wraps, which is exactly CatBoost's CalcHash.
+    return _MAGIC_MULT * (a + _MAGIC_MULT * b)
+
+
+def _ctr_calc(
+    ctr: Dict[str, Any], count_in_class: np.ndarray, total_count: np.ndarray
+) -> np.ndarray:
+    # CatBoost evaluates CTRs in single precision.
+    prior_num = np.float32(ctr["prior_numerator"])
+    prior_denom = np.float32(ctr["prior_denomerator"])
+    shift = np.float32(ctr["shift"])
+    scale = np.float32(ctr["scale"])
+    value = (count_in_class.astype(np.float32) + prior_num) / (
+        total_count.astype(np.float32) + prior_denom
+    )
+    return ((value + shift) * scale).astype(np.float32)
+
+
+def _ctr_values(ctr: Dict[str, Any], table: Dict[str, Any]) -> np.ndarray:
+    """Return the CTR value of every bucket in ``table``."""
+    counts = table["counts"]
+    ctr_type = ctr["ctr_type"]
+    if ctr_type in ("Counter", "FeatureFreq"):
+        denominator = np.full(len(counts), table["counter_denominator"])
+        return _ctr_calc(ctr, counts[:, 0], denominator)
+    if ctr_type == "Buckets":
+        good = counts[:, ctr["target_border_idx"]]
+        return _ctr_calc(ctr, good, counts.sum(axis=1))
+    if ctr_type == "Borders":
+        good = counts[:, ctr["target_border_idx"] + 1 :].sum(axis=1)
+        return _ctr_calc(ctr, good, counts.sum(axis=1))
+    raise NotImplementedError(f"CTR type '{ctr_type}' is not supported.")
+
+
+@dataclass(frozen=True)
+class CompiledCatBoostModel:
+    feature_names: List[str]
+    float_columns: List[str]
+    float_nan_true: np.ndarray
+    cat_columns: List[str]
+    cat_hashes: Dict[str, int]
+    # Operands hashed into CTR projections: cat hashes, float bits, exact-value bits.
+    projection_float_src: np.ndarray
+    projection_float_border: np.ndarray
+    projection_exact_src: np.ndarray
+    projection_exact_value: np.ndarray
+    projection_operands: np.ndarray
+    projection_lengths: np.ndarray
+    # Open-addressing hash table over every (table, bucket hash) pair.
+    table_salts: np.ndarray
+    slot_keys: np.ndarray
+    slot_entries: np.ndarray
+    slot_shift: int
+    max_probe: int
+    entry_tables: np.ndarray
+    entry_hashes: np.ndarray
+    entry_ranks: np.ndarray
+    # One entry per CTR used by the trees.
+    ctr_table: np.ndarray
+    ctr_value_offsets: np.ndarray
+    ctr_values: np.ndarray
+    ctr_defaults: np.ndarray
+    # Splits, grouped by kind in this order, followed by one always-false column.
+    float_split_src: np.ndarray
+    float_split_border: np.ndarray
+    one_hot_split_src: np.ndarray
+    one_hot_split_value: np.ndarray
+    ctr_split_src: np.ndarray
+    ctr_split_border: np.ndarray
+    # Trees: one split per depth, padded to the deepest tree.
+    tree_splits: np.ndarray
+    depth_weights: np.ndarray
+    leaf_offsets: np.ndarray
+    leaf_values: np.ndarray
+    scale: float
+    bias: float
+
+    @property
+    def tree_count(self) -> int:
+        return len(self.leaf_offsets)
+
+    def _float_matrix(self, X: pd.DataFrame) -> np.ndarray:
+        columns = []
+        for name in self.float_columns:
+            values = X[name].to_numpy()
+            if np.issubdtype(values.dtype, np.datetime64):
+                values = values.astype("datetime64[ns]").view(np.int64)
+            columns.append(values.astype(np.float32))
+        if not columns:
+            return np.empty((len(X), 0), dtype=np.float32)
+        return np.column_stack(columns)
+
+    def _cat_hash_matrix(self, X: pd.DataFrame) -> np.ndarray:
+        hashes = np.empty((len(X), len(self.cat_columns)), dtype=np.uint64)
+        lookup = self.cat_hashes
+        for j, name in enumerate(self.cat_columns):
+            hashes[:, j] = [
+                lookup.get(str(value), UNKNOWN_CATEGORY_HASH)
+                for value in X[name].to_numpy()
+            ]
+        return hashes
+
+    def _ctr_matrix(self, floats: np.ndarray, cats: np.ndarray) -> np.ndarray:
+        n_rows = len(floats)
+        float_bits = floats[:, self.projection_float_src] > self.projection_float_border
+        exact_bits = cats[:, self.projection_exact_src] == self.projection_exact_value
+        operands = np.hstack(
+            [cats, float_bits.astype(np.uint64), exact_bits.astype(np.uint64)]
+        )
+
+        n_tables = len(self.table_salts)
+        hashes = np.zeros((n_rows, n_tables), dtype=np.uint64)
+        for slot in range(self.projection_operands.shape[1]):
+            active = slot < self.projection_lengths
+            step = _calc_hash(hashes, operands[:, self.projection_operands[:, slot]])
+            hashes = np.where(active, step, hashes)
+
+        # Probe one shared table; the stored (table, hash) pair is re-checked so
+        # a salted-key match can never select another table's bucket.
+        salted = _calc_hash(hashes, self.table_salts)
+        mask = len(self.slot_keys) - 1
+        home = (salted >> np.uint64(self.slot_shift)).astype(np.int64)
+        entry = np.full(salted.shape, -1, dtype=np.int64)
+        for probe in range(self.max_probe + 1):
+            probed = (home + probe) & mask
+            hit = (self.slot_keys[probed] == salted) & (self.slot_entries[probed] >= 0)
+            entry = np.where(hit, self.slot_entries[probed], entry)
+        # entry == -1 selects the trailing sentinel, which never matches.
+        found = (self.entry_tables[entry] == np.arange(n_tables)) & (
+            self.entry_hashes[entry] == hashes
+        )
+
+        bucket = self.entry_ranks[entry[:, self.ctr_table]]
+        values = self.ctr_values[
+            np.minimum(self.ctr_value_offsets + bucket, len(self.ctr_values) - 1)
+        ]
+        return np.where(found[:, self.ctr_table], values, self.ctr_defaults)
+
+    def _split_bits(self, X: pd.DataFrame) -> np.ndarray:
+        floats = self._float_matrix(X)
+        cats = self._cat_hash_matrix(X)
+        float_values = floats[:, self.float_split_src]
+        float_bits = (float_values > self.float_split_border) | (
+            np.isnan(float_values) & self.float_nan_true[self.float_split_src]
+        )
+        one_hot_bits = cats[:, self.one_hot_split_src] == self.one_hot_split_value
+        if len(self.ctr_table):
+            ctrs = self._ctr_matrix(floats, cats)
+            ctr_bits = ctrs[:, self.ctr_split_src] > self.ctr_split_border
+        else:
+            ctr_bits = np.zeros((len(X), 0), dtype=bool)
+        padding = np.zeros((len(X), 1), dtype=bool)
+        return np.hstack([float_bits, one_hot_bits, ctr_bits, padding])
+
+    def predict(self, X: pd.DataFrame) -> np.ndarray:
+        """Evaluate the compiled trees for every row of ``X``."""
+        bits = self._split_bits(X)
+        leaves = np.zeros((len(X), self.tree_count), dtype=np.int64)
+        for depth, weight in enumerate(self.depth_weights):
+            leaves += bits[:, self.tree_splits[:, depth]] * weight
+        per_tree = self.leaf_values[self.leaf_offsets + leaves]
+        # Accumulate tree by tree, like CatBoost, so results match bit-for-bit.
+        raw = np.cumsum(per_tree, axis=1)[:, -1]
+        return self.scale * raw + self.bias
+
+
+def _catboost_json(model, known: pd.DataFrame) -> Dict[str, Any]:
+    from catboost import Pool
+
+    pool = Pool(
+        known[list(model.feature_names_)],
+        cat_features=model.get_cat_feature_indices(),
+    )
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = Path(tmp_dir) / "model.json"
+        model.save_model(str(path), format="json", pool=pool)
+        with path.open(encoding="utf-8") as f:
+            return json.load(f)
+
+
+def _split_catalogue(info: Dict[str, Any]) -> List[Tuple[str, int, Any]]:
+    """Enumerate splits in CatBoost's ``split_index`` order."""
+    catalogue: List[Tuple[str, int, Any]] = []
+    for i, feature in enumerate(info.get("float_features", [])):
+        catalogue.extend((_FLOAT_SPLIT, i, border) for border in feature["borders"])
+    for feature in info.get("categorical_features", []):
+        catalogue.extend(
+            (_ONE_HOT_SPLIT, feature["feature_index"], value)
+            for value in feature.get("values", [])
+        )
+    for i, ctr in enumerate(info.get("ctrs", [])):
+        catalogue.extend((_CTR_SPLIT, i, border) for border in ctr["borders"])
+    return catalogue
+
+
+def _parse_ctr_table(raw: Dict[str, Any]) -> Dict[str, Any]:
+    stride = raw["hash_stride"]
+    flat = raw["hash_map"]
+    keys = np.array([int(h) for h in flat[::stride]], dtype=np.uint64)
+    counts = np.array(
+        [flat[i + 1 : i + stride] for i in range(0, len(flat), stride)],
+        dtype=np.float64,
+    ).reshape(len(keys), stride - 1)
+    keep = keys != np.uint64(_EMPTY_BUCKET_HASH)
+    keys, counts = keys[keep], counts[keep]
+    order = np.argsort(keys, kind="stable")
+    return {
+        "keys": keys[order],
+        "counts": counts[order],
+        "counter_denominator": raw.get("counter_denominator", 0),
+    }
+
+
+def compile_catboost_model(  # noqa: C901
+    model, known: pd.DataFrame
+) -> CompiledCatBoostModel:
+    """Compile a fitted CatBoost model into a ``CompiledCatBoostModel``.
+
+    ``known`` holds feature rows covering the category values the compiled
+    model must resolve exactly (e.g. the training frame); unseen values are
+    treated the way CatBoost treats a value with no CTR statistics.
+    """
+    spec = _catboost_json(model, known)
+    info = spec["features_info"]
+    feature_names = list(model.feature_names_)
+
+    float_features = info.get("float_features", [])
+    cat_features = info.get("categorical_features", [])
+    float_columns = [feature_names[f["flat_feature_index"]] for f in float_features]
+    cat_columns = [feature_names[f["flat_feature_index"]] for f in cat_features]
+    float_nan_true = np.array(
+        [f.get("nan_value_treatment") == "AsTrue" for f in float_features], dtype=bool
+    )
+    cat_hashes = {
+        str(entry["value"]): _model_hash(entry["hash"])
+        for entry in info.get("cat_features_hash", [])
+    }
+
+    catalogue = _split_catalogue(info)
+    trees = spec["oblivious_trees"]
+    used: Dict[str, List[int]] = {_FLOAT_SPLIT: [], _ONE_HOT_SPLIT: [], _CTR_SPLIT: []}
+    seen = set()
+    for tree in trees:
+        for split in tree["splits"]:
+            split_index = split["split_index"]
+            kind, _, border = catalogue[split_index]
+            if kind != split["split_type"]:
+                raise RuntimeError(
+                    f"Split {split_index} is '{split['split_type']}' in the trees "
+                    f"but '{kind}' in the feature catalogue."
+                )
+            if split_index not in seen:
+                seen.add(split_index)
+                used[kind].append(split_index)
+
+    column_of: Dict[int, int] = {}
+    for split_index in [*used[_FLOAT_SPLIT], *used[_ONE_HOT_SPLIT], *used[_CTR_SPLIT]]:
+        column_of[split_index] = len(column_of)
+    padding_column = len(column_of)
+
+    # CTRs referenced by the trees and the counter tables behind them.
+    ctrs = info.get("ctrs", [])
+    used_ctrs = sorted({catalogue[i][1] for i in used[_CTR_SPLIT]})
+    ctr_position = {ctr_idx: pos for pos, ctr_idx in enumerate(used_ctrs)}
+    table_ids: Dict[str, int] = {}
+    tables: List[Dict[str, Any]] = []
+    for ctr_idx in used_ctrs:
+        identifier = ctrs[ctr_idx]["identifier"]
+        if identifier not in table_ids:
+            table_ids[identifier] = len(tables)
+            table = _parse_ctr_table(spec["ctr_data"][identifier])
+            table["elements"] = ctrs[ctr_idx]["elements"]
+            tables.append(table)
+
+    n_cats = len(cat_features)
+    float_operands: Dict[Tuple[int, float], int] = {}
+    exact_operands: Dict[Tuple[int, int], int] = {}
+    projections: List[List[Tuple[str, Any]]] = []
+    for table in tables:
+        projection: List[Tuple[str, Any]] = []
+        for element in table["elements"]:
+            kind = element["combination_element"]
+            if kind == "cat_feature_value":
+                projection.append(("cat", element["cat_feature_index"]))
+            elif kind == "float_feature":
+                key = (element["float_feature_index"], element["border"])
+                float_operands.setdefault(key, len(float_operands))
+                projection.append(("float", key))
+            elif kind == "cat_feature_exact_value":
+                key = (element["cat_feature_index"], _model_hash(element["value"]))
+                exact_operands.setdefault(key, len(exact_operands))
+                projection.append(("exact", key))
+            else:
+                raise NotImplementedError(f"Unsupported CTR element '{kind}'.")
+        projections.append(projection)
+
+    max_len = max((len(p) for p in projections), default=0)
+    projection_operands = np.zeros((len(projections), max_len), dtype=np.int64)
+    for p, projection in enumerate(projections):
+        for slot, (kind, key) in enumerate(projection):
+            if kind == "cat":
+                operand = key
+            elif kind == "float":
+                operand = n_cats + float_operands[key]
+            else:
+                operand = n_cats + len(float_operands) + exact_operands[key]
+            projection_operands[p, slot] = operand
+
+    table_salts = np.arange(1, len(tables) + 1, dtype=np.uint64)
+    entry_tables = np.concatenate(
+        [np.full(len(t["keys"]), i, dtype=np.int64) for i, t in enumerate(tables)]
+        or [np.zeros(0, dtype=np.int64)]
+    )
+    entry_hashes = np.concatenate(
+        [t["keys"] for t in tables] or [np.zeros(0, dtype=np.uint64)]
+    ).astype(np.uint64)
+    entry_ranks = np.concatenate(
+        [np.arange(len(t["keys"]), dtype=np.int64) for t in tables]
+        or [np.zeros(0, dtype=np.int64)]
+    )
+    entry_keys = _calc_hash(entry_hashes, table_salts[entry_tables])
+    if len(np.unique(entry_keys)) != len(entry_keys):
+        raise RuntimeError("CTR bucket keys collide after salting; cannot compile.")
+    # Keep the load factor at or below 1/4 so probe sequences stay short.
+    slot_bits = max(4, (4 * len(entry_keys)).bit_length())
+    slot_shift = 64 - slot_bits
+    slot_mask = (1 << slot_bits) - 1
+    slot_keys = np.full(1 << slot_bits, _EMPTY_BUCKET_HASH, dtype=np.uint64)
+    slot_entries = np.full(1 << slot_bits, -1, dtype=np.int64)
+    max_probe = 0
+    for entry, key in enumerate(entry_keys.tolist()):
+        slot, probe = key >> slot_shift, 0
+        while slot_entries[slot] >= 0:
+            slot, probe = (slot + 1) & slot_mask, probe + 1
+        slot_keys[slot], slot_entries[slot] = key, entry
+        max_probe = max(max_probe, probe)
+    entry_tables = np.append(entry_tables, -1)
+    entry_hashes = np.append(entry_hashes, np.uint64(_EMPTY_BUCKET_HASH))
+    entry_ranks = np.append(entry_ranks, 0)
+
+    ctr_values: List[np.ndarray] = []
+    ctr_value_offsets, ctr_table, ctr_defaults = [], [], []
+    offset = 0
+    for ctr_idx in used_ctrs:
+        ctr = ctrs[ctr_idx]
+        table_idx = table_ids[ctr["identifier"]]
+        values = _ctr_values(ctr, tables[table_idx])
+        ctr_values.append(values)
+        ctr_table.append(table_idx)
+        ctr_value_offsets.append(offset)
+        ctr_defaults.append(_ctr_calc(ctr, np.zeros(1), np.zeros(1))[0])
+        offset += len(values)
+
+    float_split_src = [catalogue[i][1] for i in used[_FLOAT_SPLIT]]
+    float_split_border = [catalogue[i][2] for i in used[_FLOAT_SPLIT]]
+    one_hot_split_src = [catalogue[i][1] for i in used[_ONE_HOT_SPLIT]]
+    one_hot_split_value = [_model_hash(catalogue[i][2]) for i in used[_ONE_HOT_SPLIT]]
+    ctr_split_src = [ctr_position[catalogue[i][1]] for i in used[_CTR_SPLIT]]
+    ctr_split_border = [catalogue[i][2] for i in used[_CTR_SPLIT]]
+
+    max_depth = max((len(t["splits"]) for t in trees), default=0)
+    tree_splits = np.full((len(trees), max_depth), padding_column, dtype=np.int64)
+    leaf_offsets = np.zeros(len(trees), dtype=np.int64)
+    leaf_values: List[float] = []
+    for t, tree in enumerate(trees):
+        for depth, split in enumerate(tree["splits"]):
+            tree_splits[t, depth] = column_of[split["split_index"]]
+        leaf_offsets[t] = len(leaf_values)
+        leaf_values.extend(tree["leaf_values"])
+
+    scale, biases = spec.get("scale_and_bias", [1.0, [0.0]])
+    if len(biases) != 1:
+        raise NotImplementedError("Only single-dimension models can be compiled.")
+
+    return CompiledCatBoostModel(
+        feature_names=feature_names,
+        float_columns=float_columns,
+        float_nan_true=float_nan_true,
+        cat_columns=cat_columns,
+        cat_hashes=cat_hashes,
+        projection_float_src=np.array([k[0] for k in float_operands], dtype=np.int64),
+        projection_float_border=np.array(
+            [k[1] for k in float_operands], dtype=np.float32
+        ),
+        projection_exact_src=np.array([k[0] for k in exact_operands], dtype=np.int64),
+        projection_exact_value=np.array(
+            [k[1] for k in exact_operands], dtype=np.uint64
+        ),
+        projection_operands=projection_operands,
+        projection_lengths=np.array([len(p) for p in projections], dtype=np.int64),
+        table_salts=table_salts,
+        slot_keys=slot_keys,
+        slot_entries=slot_entries,
+        slot_shift=slot_shift,
+        max_probe=max_probe,
+        entry_tables=entry_tables,
+        entry_hashes=entry_hashes,
+        entry_ranks=entry_ranks,
+        ctr_table=np.array(ctr_table, dtype=np.int64),
+        ctr_value_offsets=np.array(ctr_value_offsets, dtype=np.int64),
+        ctr_values=(
+            np.concatenate(ctr_values) if ctr_values else np.zeros(1, np.float32)
+        ),
+        ctr_defaults=np.array(ctr_defaults, dtype=np.float32),
+        float_split_src=np.array(float_split_src, dtype=np.int64),
+        float_split_border=np.array(float_split_border, dtype=np.float32),
+        one_hot_split_src=np.array(one_hot_split_src, dtype=np.int64),
+        one_hot_split_value=np.array(one_hot_split_value, dtype=np.uint64),
+        ctr_split_src=np.array(ctr_split_src, dtype=np.int64),
+        ctr_split_border=np.array(ctr_split_border, dtype=np.float32),
+        tree_splits=tree_splits,
+        depth_weights=np.left_shift(1, np.arange(max_depth, dtype=np.int64)),
+        leaf_offsets=leaf_offsets,
+        leaf_values=np.array(leaf_values, dtype=np.float64),
+        scale=float(scale),
+        bias=float(biases[0]),
+    )
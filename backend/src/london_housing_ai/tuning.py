@@ -0,0 +1,195 @@
+"""Hyperparameter search over PriceModel with Ray Tune.
+
+The training frame is split once in the driver and the train and validation
+splits are put in Ray's object store once; every trial maps the same buffers
+(numeric and categorical-code columns deserialize zero-copy) and only builds
+its own CatBoost pools from them. Trials report the validation loss every
+``report_every`` boosting iterations so ASHA can stop the weak ones early,
+and each trial is logged as a nested MLflow run. The best trial's parameters
+are returned as a TrainConfig for the caller to train and log the promoted
+model with.
+"""
+
+import dataclasses
+import json
+import os
+from dataclasses import asdict
+from typing import Any, Dict, Tuple
+
+import mlflow
+import pandas as pd
+import ray
+from ray import tune
+from ray.tune.schedulers import ASHAScheduler
+
+from london_housing_ai.config_schemas.TrainConfig import TrainConfig
+from london_housing_ai.config_schemas.TuneConfig import TuneConfig
+from london_housing_ai.models import MetricType, PriceModel, SplitFrame
+from london_housing_ai.run_kinds import RUN_KIND_TAG, TUNE_RUN_KIND
+from london_housing_ai.utils.logger import get_logger
+from london_housing_ai.utils.paths import get_project_root
+
+# TrainConfig fields the search varies.
+TUNED_FIELDS = ("depth", "lr", "l2_leaf_reg")
+METRIC = "validation_loss"
+
+logger = get_logger(__name__)
+
+
+def search_space(tune_cfg: TuneConfig) -> Dict[str, Any]:
+    return {
+        "depth": tune.choice(tune_cfg.depth),
+        "lr": tune.loguniform(tune_cfg.lr_min, tune_cfg.lr_max),
+        "l2_leaf_reg": tune.uniform(tune_cfg.l2_leaf_reg_min, tune_cfg.l2_leaf_reg_max),
+    }
+
+
+def _first(by_metric: Dict[str, Any]) -> Any:
+    # CatBoost keys eval results by metric name; the loss comes first.
+    return next(iter(by_metric.values()))
+
+
+class _ReportProgress:
+    """CatBoost callback reporting the validation loss to Tune and MLflow.
+
+    When the scheduler stops the trial, Tune exits from inside ``report``;
+    the callback turns that into a clean stop of the boosting loop instead.
+    """
+
+    def __init__(self, report_every: int, n_iter: int):
+        self.report_every = report_every
+        self.n_iter = n_iter
+        self.stopped = False
+
+    def after_iteration(self, info) -> bool:
+        iterations = info.iteration + 1
+        # The last iteration is reported with the final metrics instead.
+        if iterations % self.report_every or iterations >= self.n_iter:
+            return True
+        loss = _first(info.metrics["validation"])[-1]
+        mlflow.log_metric(METRIC, loss, step=iterations)
+        try:
+            tune.report({"iterations": iterations, METRIC: loss})
+        except SystemExit:
+            self.stopped = True
+        return not self.stopped
+
+
+def _run_trial(
+    config: Dict[str, Any],
+    train: SplitFrame,
+    validation: SplitFrame,
+    train_cfg: TrainConfig,
+    report_every: int,
+    thread_count: int,
+    parent_run_id: str,
+    tracking_uri: str,
+) -> None:
+    cfg = dataclasses.replace(train_cfg, **config)
+    trainer = PriceModel(cfg)
+    trainer.model.set_params(
+        thread_count=thread_count, allow_writing_files=False, verbose=False
+    )
+    train_set = train.to_pool(cfg.cat_features)
+    validation_set = validation.to_pool(cfg.cat_features)
+
+    mlflow.set_tracking_uri(tracking_uri)
+    with mlflow.start_run(
+        run_name=f"trial_{tune.get_context().get_trial_id()}",
+        parent_run_id=parent_run_id,
+        nested=True,
+        tags={RUN_KIND_TAG: TUNE_RUN_KIND},
+    ):
+        mlflow.log_params(config)
+        progress = _ReportProgress(report_every, cfg.n_iter)
+        trainer.model.fit(
+            train_set.pool, eval_set=validation_set.pool, callbacks=[progress]
+        )
+        if progress.stopped:
+            mlflow.end_run(status="KILLED")
+            return
+        y_true, y_pred = trainer._predict_split(validation_set)
+        metrics = {
+            METRIC: _first(trainer.model.get_best_score()["validation"]),
+            **trainer._evaluate_regression_metrics(
+                y_true, y_pred, MetricType.VALIDATION
+            ),
+        }
+        best_iteration = trainer.model.get_best_iteration()
+        mlflow.log_metrics({**metrics, "best_iteration": best_iteration})
+    # Outside the run: Tune exits the trial from here once it is complete.
+    tune.report({"iterations": cfg.n_iter, **metrics})
+
+
+def tune_train_config(
+    df: pd.DataFrame, train_cfg: TrainConfig, tune_cfg: TuneConfig
+) -> Tuple[TrainConfig, str]:
+    """Search ``tune_cfg``'s space on ``df``; the best TrainConfig and run id.
+
+    Trials are nested under a ``london_housing_tune`` run of their own. Both
+    are tagged ``run_kind=tune`` so serving never resolves one of them as the
+    latest finished run.
+    """
+    frames = PriceModel(train_cfg).split_frames(
+        df, (MetricType.TRAIN, MetricType.VALIDATION)
+    )
+    with mlflow.start_run(
+        run_name="london_housing_tune", tags={RUN_KIND_TAG: TUNE_RUN_KIND}
+    ) as run:
+        mlflow.log_params({f"tune_{k}": v for k, v in asdict(tune_cfg).items()})
+        ray.init(address=os.getenv("RAY_ADDRESS"), ignore_reinit_error=True)
+        try:
+            trainable = tune.with_resources(
+                # with_parameters puts each split in the object store once.
+                tune.with_parameters(
+                    _run_trial,
+                    train=frames[MetricType.TRAIN],
+                    validation=frames[MetricType.VALIDATION],
+                    train_cfg=train_cfg,
+                    report_every=tune_cfg.report_every,
+                    thread_count=tune_cfg.cpus_per_trial,
+                    parent_run_id=run.info.run_id,
+                    tracking_uri=mlflow.get_tracking_uri(),
+                ),
+                {"cpu": tune_cfg.cpus_per_trial},
+            )
+            del frames
+            best = _tuner(trainable, train_cfg, tune_cfg).fit().get_best_result()
+            best_config, best_loss = best.config or {}, (best.metrics or {})[METRIC]
+        finally:
+            ray.shutdown()
+
+        best_params = {k: best_config[k] for k in TUNED_FIELDS}
+        mlflow.log_params({f"best_{k}": v for k, v in best_params.items()})
+        mlflow.log_metric(f"best_{METRIC}", best_loss)
+    logger.info(
+        f"Best trial: {json.dumps(best_params)}",
+        extra={METRIC: best_loss},
+    )
+    return dataclasses.replace(train_cfg, **best_params), run.info.run_id
+
+
+def _tuner(trainable: Any, train_cfg: TrainConfig, tune_cfg: TuneConfig) -> tune.Tuner:
+    return tune.Tuner(
+        trainable,
+        param_space=search_space(tune_cfg),
+        tune_config=tune.TuneConfig(
+            metric=METRIC,
+            mode="min",
+            num_samples=tune_cfg.num_samples,
+            scheduler=ASHAScheduler(
+                time_attr="iterations",
+                max_t=train_cfg.n_iter,
+                grace_period=tune_cfg.grace_period,
+                reduction_factor=tune_cfg.reduction_factor,
+            ),
+        ),
+        run_config=tune.RunConfig(
+            name="price_model", storage_path=get_ray_results_dir()
+        ),
+    )
+
+
+def get_ray_results_dir() -> str:
+    default = get_project_root() / "data_lake" / "ray_results"
+    return os.path.abspath(os.getenv("RAY_RESULTS_DIR", str(default)))
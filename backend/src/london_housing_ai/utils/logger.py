@@ -1,16 +1,163 @@
+"""Process-wide logging setup.
+
+Loggers returned by ``get_logger`` only enqueue records; a single
+``QueueListener`` thread formats them and writes to stdout, so request threads
+and the event loop never block on log I/O.
+
+Environment:
+    LOG_LEVEL         level for package loggers (default ``INFO``)
+    LOG_FORMAT        ``json`` (default) for one JSON object per line, or ``text``
+    LOG_SAMPLE_RATES  per-logger sampling of DEBUG records, e.g.
+                      ``london_housing_ai.api.routers.predict=0.01``; the longest
+                      matching logger-name prefix wins; use ``should_sample``
+                      to skip building the payload of records it would drop
+"""
+
+import atexit
+import copy
+import datetime
+import json
 import logging
+import os
+import queue
+import random
 import sys
+import threading
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+
+TEXT_FORMAT = "%(asctime)s [%(levelname)s] %(name)s: %(message)s"
+TEXT_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Attributes every LogRecord has; anything else came in via ``extra=``.
+_RESERVED_ATTRS = set(logging.LogRecord("", 0, "", 0, "", None, None).__dict__) | {
+    "message",
+    "asctime",
+    "taskName",
+}
+
+_lock = threading.Lock()
+_listener: Optional[QueueListener] = None
+_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": datetime.datetime.fromtimestamp(
+                record.created, tz=datetime.timezone.utc
+            ).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED_ATTRS and not key.startswith("_"):
+                payload[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            payload["exc_info"] = record.exc_text
+        return json.dumps(payload, default=str)
+
+
+class _EnqueueHandler(QueueHandler):
+    """Hand records to the listener with as little work as possible.
+
+    Only the message and traceback are rendered here (they may reference
+    objects that change after the call); formatting happens on the listener.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+# ``extra`` key of DEBUG records already kept by ``should_sample``.
+PRESAMPLED = "_presampled"
+
+
+class SamplingFilter(logging.Filter):
+    """Keep a ``rate`` fraction of DEBUG records; higher levels always pass."""
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG or getattr(record, PRESAMPLED, False):
+            return True
+        return random.random() < self.rate
+
+
+def should_sample(logger: logging.Logger) -> bool:
+    """Decide up front whether a DEBUG record from ``logger`` is kept.
+
+    Log the kept record with ``extra={PRESAMPLED: True, ...}`` so the
+    logger's SamplingFilter does not sample it a second time.
+    """
+    if not logger.isEnabledFor(logging.DEBUG):
+        return False
+    rates = [f.rate for f in logger.filters if isinstance(f, SamplingFilter)]
+    return not rates or random.random() < rates[0]
+
+
+def _parse_sample_rates(raw: Optional[str]) -> Dict[str, float]:
+    rates: Dict[str, float] = {}
+    for part in (raw or "").split(","):
+        name, sep, rate = part.partition("=")
+        if sep and name.strip():
+            rates[name.strip()] = float(rate)
+    return rates
+
+
+def _sample_rate_for(name: str) -> Optional[float]:
+    rates = _parse_sample_rates(os.getenv("LOG_SAMPLE_RATES"))
+    matches = [
+        prefix for prefix in rates if name == prefix or name.startswith(f"{prefix}.")
+    ]
+    return rates[max(matches, key=len)] if matches else None
+
+
+def _build_formatter() -> logging.Formatter:
+    if os.getenv("LOG_FORMAT", "json").lower() == "text":
+        return logging.Formatter(fmt=TEXT_FORMAT, datefmt=TEXT_DATE_FORMAT)
+    return JsonFormatter()
+
+
+def _ensure_listener() -> None:
+    global _listener
+    with _lock:
+        if _listener is not None:
+            return
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(_build_formatter())
+        _listener = QueueListener(_queue, handler, respect_handler_level=True)
+        _listener.start()
+        atexit.register(shutdown_logging)
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the listener thread."""
+    global _listener
+    with _lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
 
 
 def get_logger(name: str = __name__) -> logging.Logger:
     logger = logging.getLogger(name)
     if not logger.handlers:
-        handler = logging.StreamHandler(sys.stdout)
-        formatter = logging.Formatter(
-            fmt="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
-            datefmt="%Y-%m-%d %H:%M:%S",
-        )
-        handler.setFormatter(formatter)
-        logger.addHandler(handler)
-        logger.setLevel(logging.INFO)
+        _ensure_listener()
+        logger.addHandler(_EnqueueHandler(_queue))
+        logger.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
+        rate = _sample_rate_for(name)
+        if rate is not None:
+            logger.addFilter(SamplingFilter(rate))
     return logger
@@ -0,0 +1,118 @@
+"""Prometheus metrics for the serving path.
+
+Metrics live in the default ``prometheus_client`` registry and are exposed by
+the API's ``/metrics`` endpoint. ``StageTimer`` records per-stage latencies of
+one request into ``PREDICT_STAGE_SECONDS`` and renders them as a
+``Server-Timing`` header.
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Iterator, List, Tuple
+
+from prometheus_client import Counter, Gauge, Histogram
+
+# Sub-millisecond resolution for in-process stages, seconds for upstream calls.
+LATENCY_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+PREDICT_STAGE_SECONDS = Histogram(
+    "predict_stage_seconds",
+    "Latency of each /predict stage.",
+    ["stage"],
+    buckets=LATENCY_BUCKETS,
+)
+POSTCODE_RESOLUTION_SECONDS = Histogram(
+    "postcode_resolution_seconds",
+    "Latency of postcode to district resolution, split by cache outcome.",
+    ["cache"],
+    buckets=LATENCY_BUCKETS,
+)
+POSTCODE_CACHE_REQUESTS = Counter(
+    "postcode_cache_requests",
+    "Postcode cache lookups by outcome (hit or miss).",
+    ["result"],
+)
+POSTCODE_UPSTREAM_ERRORS = Counter(
+    "postcode_upstream_errors",
+    "Failed postcodes.io lookups by reason.",
+    ["reason"],
+)
+ARTIFACT_RELOADS = Counter(
+    "artifact_reloads",
+    "Model/transformer loads caused by a cache miss or run change.",
+    ["component"],
+)
+ADMISSION_IN_FLIGHT = Gauge(
+    "admission_in_flight_requests",
+    "Admitted /predict requests currently executing in this worker.",
+)
+ADMISSION_QUEUE_DEPTH = Gauge(
+    "admission_queue_depth",
+    "/predict requests waiting for an execution slot in this worker.",
+)
+ADMISSION_QUEUE_WAIT_SECONDS = Histogram(
+    "admission_queue_wait_seconds",
+    "Time queued /predict requests waited before being admitted.",
+    buckets=LATENCY_BUCKETS,
+)
+ADMISSION_SHED = Counter(
+    "admission_shed_requests",
+    "/predict requests rejected with 503 by admission control, by reason.",
+    ["reason"],
+)
+PREDICTION_LOG_RECORDS = Counter(
+    "prediction_log_records",
+    "Prediction log records by outcome (buffered, dropped, written, failed).",
+    ["outcome"],
+)
+DRIFT_PSI = Gauge(
+    "drift_psi",
+    "Population stability index of recent /predict traffic vs the training data.",
+    ["feature"],
+)
+DRIFT_KS = Gauge(
+    "drift_ks",
+    "Kolmogorov-Smirnov distance of recent /predict traffic vs the training data.",
+    ["feature"],
+)
+DRIFT_OBSERVATIONS = Gauge(
+    "drift_observations",
+    "Decayed number of /predict requests behind the drift gauges.",
+)
+
+
+class StageTimer:
+    """Time named stages of one request."""
+
+    def __init__(self) -> None:
+        self.stages: List[Tuple[str, float]] = []
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            PREDICT_STAGE_SECONDS.labels(stage=name).observe(elapsed)
+            self.stages.append((name, elapsed))
+
+    def server_timing(self) -> str:
+        return ", ".join(
+            f"{name};dur={elapsed * 1000:.3f}" for name, elapsed in self.stages
+        )
@@ -0,0 +1,96 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from london_housing_ai.api.app import create_app
+from london_housing_ai.api.services import admission
+from london_housing_ai.api.services.admission import AdmissionController
+
+
+def _shed_count(reason: str) -> float:
+    return (
+        REGISTRY.get_sample_value("admission_shed_requests_total", {"reason": reason})
+        or 0.0
+    )
+
+
+async def _hold(controller: AdmissionController, release: asyncio.Event) -> None:
+    async with controller.admit():
+        await release.wait()
+
+
+def test_requests_beyond_queue_are_shed() -> None:
+    async def scenario():
+        controller = AdmissionController(
+            max_concurrency=1, max_queue=1, queue_timeout_seconds=5
+        )
+        release = asyncio.Event()
+        running = asyncio.create_task(_hold(controller, release))
+        queued = asyncio.create_task(_hold(controller, release))
+        while controller._waiting < 1:
+            await asyncio.sleep(0)
+
+        with pytest.raises(HTTPException) as excinfo:
+            async with controller.admit():
+                pass
+
+        release.set()
+        await asyncio.gather(running, queued)
+        return excinfo.value
+
+    before = _shed_count("queue_full")
+    error = asyncio.run(scenario())
+
+    assert error.status_code == 503
+    assert error.headers == {"Retry-After": "1"}
+    assert _shed_count("queue_full") == before + 1
+
+
+def test_queued_requests_time_out() -> None:
+    async def scenario():
+        controller = AdmissionController(
+            max_concurrency=1, max_queue=10, queue_timeout_seconds=0.01
+        )
+        release = asyncio.Event()
+        running = asyncio.create_task(_hold(controller, release))
+        await asyncio.sleep(0)
+
+        with pytest.raises(HTTPException) as excinfo:
+            async with controller.admit():
+                pass
+
+        release.set()
+        await running
+        # The slot is free again once the holder finishes.
+        async with controller.admit():
+            pass
+        return excinfo.value
+
+    before = _shed_count("queue_timeout")
+    error = asyncio.run(scenario())
+
+    assert error.status_code == 503
+    assert _shed_count("queue_timeout") == before + 1
+
+
+def test_predict_is_shed_with_retry_after(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(
+        admission,
+        "_controller",
+        AdmissionController(
+            max_concurrency=0,
+            max_queue=0,
+            queue_timeout_seconds=1,
+            retry_after_seconds=3,
+        ),
+    )
+    client = TestClient(create_app())
+
+    resp = client.post("/predict", json={"postcode": "N19GU", "property_type": "F"})
+
+    assert resp.status_code == 503
+    assert resp.headers["retry-after"] == "3"
+    assert "admission_queue_depth" in client.get("/metrics").text
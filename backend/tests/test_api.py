@@ -1,9 +1,12 @@
+import asyncio
 import datetime as dt
+from types import SimpleNamespace
 
 import numpy as np
 import pandas as pd
 import pytest
 from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
 
 from london_housing_ai.api.app import create_app
 from london_housing_ai.api.schemas import ArtifactSummary
@@ -13,6 +16,7 @@ from london_housing_ai.api.services import mlflow_service
 @pytest.fixture()
 def client(monkeypatch: pytest.MonkeyPatch) -> TestClient:
     monkeypatch.setenv("CORS_ALLOW_ORIGINS", "http://example.com")
+    mlflow_service.reset_serving_run()
     app = create_app()
     return TestClient(app)
 
@@ -98,6 +102,62 @@ def test_health_ok_when_latest_run_exists(
     assert payload["transformer_loaded"] is True
 
 
+def test_livez_is_always_alive(client: TestClient) -> None:
+    resp = client.get("/livez")
+    assert resp.status_code == 200
+    assert resp.json() == {"status": "alive"}
+
+
+def test_readyz_follows_cache_loads_without_io(
+    monkeypatch: pytest.MonkeyPatch, client: TestClient
+) -> None:
+    from london_housing_ai.api.services import (
+        model_cache,
+        readiness,
+        transformer_cache,
+    )
+
+    def no_io(*args, **kwargs):
+        raise AssertionError("readiness probe must not call MLflow")
+
+    monkeypatch.setattr(mlflow_service, "get_latest_finished_run_id", no_io)
+    monkeypatch.setattr(model_cache, "_cached_model", None)
+    monkeypatch.setattr(transformer_cache, "_cached_transformer", None)
+    monkeypatch.setattr(model_cache, "load_model_for_run", lambda run_id: object())
+    monkeypatch.setattr(
+        transformer_cache, "_download_lookup_table", lambda run_id: "lookup.bin"
+    )
+    monkeypatch.setattr(
+        transformer_cache, "ServingTransformer", lambda lookup_path: object()
+    )
+    readiness.reset()
+
+    resp = client.get("/readyz")
+    assert resp.status_code == 503
+    assert resp.json()["status"] == "not_ready"
+
+    model_cache.get_or_load_model("run123")
+    assert client.get("/readyz").status_code == 503
+
+    transformer_cache.get_or_load_transformer("run123")
+    resp = client.get("/readyz")
+    assert resp.status_code == 200
+    payload = resp.json()
+    assert payload["status"] == "ready"
+    assert payload["model_run_id"] == "run123"
+    assert payload["transformer_run_id"] == "run123"
+
+    def failing_load(run_id):
+        raise RuntimeError("artifact store down")
+
+    monkeypatch.setattr(model_cache, "load_model_for_run", failing_load)
+    with pytest.raises(RuntimeError):
+        model_cache.get_or_load_model("run456")
+    resp = client.get("/readyz")
+    assert resp.status_code == 200
+    assert "artifact store down" in resp.json()["detail"]
+
+
 def test_predict_success(monkeypatch: pytest.MonkeyPatch, client: TestClient) -> None:
     import london_housing_ai.api.routers.predict as predict_router
 
@@ -144,40 +204,264 @@ def test_predict_success(monkeypatch: pytest.MonkeyPatch, client: TestClient) ->
     assert "defaulted" in payload["features_used"]
 
 
-def test_mlflow_runs_endpoint(
+def test_predict_reports_stage_timings(
     monkeypatch: pytest.MonkeyPatch, client: TestClient
 ) -> None:
-    runs = [
-        {
-            "data": {
-                "metrics": {"validation_rmse": 123.45},
-                "params": {"model_class": "CatBoostRegressor"},
-                "tags": {"mlflow.runName": "run-1"},
-            },
-            "info": {
-                "artifact_uri": "mlflow-artifacts:/0/run1/artifacts",
-                "end_time": 1735689900000,
-                "experiment_id": "0",
-                "lifecycle_stage": "active",
-                "run_id": "run1",
-                "run_uuid": "run1",
-                "start_time": 1735689600000,
-                "status": "FINISHED",
-                "user_id": "tester",
-            },
-        }
+    import london_housing_ai.api.routers.predict as predict_router
+
+    class DummyModel:
+        def predict(self, features):
+            return np.array([np.log1p(1000.0)])
+
+    class DummyTransformer:
+        def transform(self, user_input):
+            return pd.DataFrame([user_input])
+
+    async def fake_resolve_district(postcode: str):
+        return "Camden"
+
+    monkeypatch.setattr(mlflow_service, "get_latest_finished_run_id", lambda: "run123")
+    monkeypatch.setattr(
+        mlflow_service, "run_uses_log_target", lambda run_id, default=True: True
+    )
+    monkeypatch.setattr(
+        predict_router, "get_or_load_model", lambda run_id: DummyModel()
+    )
+    monkeypatch.setattr(
+        predict_router, "get_or_load_transformer", lambda run_id: DummyTransformer()
+    )
+    monkeypatch.setattr(predict_router, "resolve_district", fake_resolve_district)
+
+    def inference_count() -> float:
+        return (
+            REGISTRY.get_sample_value(
+                "predict_stage_seconds_count", {"stage": "inference"}
+            )
+            or 0.0
+        )
+
+    before = inference_count()
+    resp = client.post("/predict", json={"postcode": "EC1A1BB", "property_type": "F"})
+    assert resp.status_code == 200
+    stages = [part.split(";")[0] for part in resp.headers["server-timing"].split(", ")]
+    assert stages == [
+        "postcode",
+        "run_resolution",
+        "artifact_load",
+        "transform",
+        "inference",
     ]
+    assert inference_count() == before + 1
+
+    metrics = client.get("/metrics")
+    assert metrics.status_code == 200
+    assert 'predict_stage_seconds_bucket{le="0.001",stage="inference"}' in metrics.text
+
+
+def test_predict_resolves_run_once_and_sheds_slow_loads(
+    monkeypatch: pytest.MonkeyPatch, client: TestClient
+) -> None:
+    import time
+
+    import london_housing_ai.api.routers.predict as predict_router
+
+    class DummyModel:
+        def predict(self, features):
+            return np.array([1000.0])
+
+    class DummyTransformer:
+        def transform(self, user_input):
+            return pd.DataFrame([user_input])
+
+    async def fake_resolve_district(postcode: str):
+        return "Camden"
+
+    lookups = []
+
+    def latest_run_id():
+        lookups.append("search")
+        return "run123"
+
+    def slow_model(run_id):
+        time.sleep(0.5)
+        return DummyModel()
+
+    monkeypatch.setattr(mlflow_service, "get_latest_finished_run_id", latest_run_id)
     monkeypatch.setattr(
-        mlflow_service, "list_runs_payload", lambda limit=30: runs[:limit]
+        mlflow_service, "run_uses_log_target", lambda run_id, default=True: False
+    )
+    monkeypatch.setattr(predict_router, "get_or_load_model", slow_model)
+    monkeypatch.setattr(
+        predict_router, "get_or_load_transformer", lambda run_id: DummyTransformer()
+    )
+    monkeypatch.setattr(predict_router, "resolve_district", fake_resolve_district)
+    monkeypatch.setenv("PREDICT_LOAD_TIMEOUT_SECONDS", "0.05")
+    body = {"postcode": "EC1A1BB", "property_type": "F"}
+
+    resp = client.post("/predict", json=body)
+    assert resp.status_code == 503
+    assert "retry-after" in resp.headers
+
+    monkeypatch.setattr(
+        predict_router, "get_or_load_model", lambda run_id: DummyModel()
+    )
+    for _ in range(3):
+        resp = client.post("/predict", json=body)
+        assert resp.status_code == 200
+        assert resp.json()["predicted_price"] == 1000.0
+    assert lookups == ["search"]
+
+
+def test_postcode_resolution_counts_cache_hits_and_upstream_errors(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    from london_housing_ai.services import postcode_service
+
+    class TimingOutSession:
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+        def get(self, url):
+            raise asyncio.TimeoutError()
+
+    def sample(name: str, labels: dict) -> float:
+        return REGISTRY.get_sample_value(name, labels) or 0.0
+
+    monkeypatch.setattr(postcode_service, "_cache", {"EC1A1BB": "Camden"})
+    monkeypatch.setattr(postcode_service, "get_session", lambda: TimingOutSession())
+    hits = sample("postcode_cache_requests_total", {"result": "hit"})
+    misses = sample("postcode_cache_requests_total", {"result": "miss"})
+    timeouts = sample("postcode_upstream_errors_total", {"reason": "timeout"})
+
+    assert asyncio.run(postcode_service.resolve_district("ec1a 1bb")) == "Camden"
+    assert asyncio.run(postcode_service.resolve_district("N1 9GU")) is None
+
+    assert sample("postcode_cache_requests_total", {"result": "hit"}) == hits + 1
+    assert sample("postcode_cache_requests_total", {"result": "miss"}) == misses + 1
+    assert (
+        sample("postcode_upstream_errors_total", {"reason": "timeout"}) == timeouts + 1
+    )
+
+
+def _fake_run(run_id: str, start_time: int, rmse: float) -> SimpleNamespace:
+    return SimpleNamespace(
+        info=SimpleNamespace(
+            artifact_uri=f"mlflow-artifacts:/0/{run_id}/artifacts",
+            end_time=start_time + 300_000,
+            experiment_id="0",
+            lifecycle_stage="active",
+            run_id=run_id,
+            run_uuid=run_id,
+            start_time=start_time,
+            status="FINISHED",
+            user_id="tester",
+        ),
+        data=SimpleNamespace(
+            metrics={"test_rmse": rmse, "test_r2": 0.8, "validation_rmse": rmse},
+            params={"model_class": "CatBoostRegressor"},
+            tags={"mlflow.runName": run_id},
+        ),
+    )
+
+
+class FakeRunsClient:
+    def __init__(self, runs) -> None:
+        self.runs = list(runs)
+        self.searches: list[str] = []
+
+    def get_experiment_by_name(self, name: str):
+        return SimpleNamespace(experiment_id="0")
+
+    def search_runs(self, experiment_ids, filter_string, order_by, **kwargs):
+        self.searches.append(filter_string)
+        since = None
+        if "end_time >=" in filter_string:
+            since = int(filter_string.rsplit(" ", 1)[1])
+        return [
+            run
+            for run in sorted(self.runs, key=lambda r: -r.info.start_time)
+            if since is None or run.info.end_time >= since
+        ]
+
+
+@pytest.fixture()
+def runs_client(monkeypatch: pytest.MonkeyPatch) -> FakeRunsClient:
+    fake = FakeRunsClient(
+        _fake_run(f"run{i}", 1735689600000 + i * 1000, 100.0 + i) for i in range(5)
     )
+    monkeypatch.setattr(mlflow_service, "get_client", lambda: fake)
+    monkeypatch.setattr(mlflow_service, "_run_records", {})
+    monkeypatch.setattr(mlflow_service, "_run_keys", [])
+    monkeypatch.setattr(mlflow_service, "_runs_experiment_id", None)
+    monkeypatch.setattr(mlflow_service, "_runs_max_end_time", None)
+    monkeypatch.setenv("MLFLOW_RUNS_CACHE_TTL_SECONDS", "0")
+    return fake
 
+
+def test_mlflow_runs_endpoint(runs_client: FakeRunsClient, client: TestClient) -> None:
     resp = client.get("/mlflow/runs?limit=1")
     assert resp.status_code == 200
     payload = resp.json()
-    assert payload[0]["info"]["run_id"] == "run1"
+    assert payload[0]["info"]["run_id"] == "run4"
     assert payload[0]["data"]["params"]["model_class"] == "CatBoostRegressor"
 
 
+def test_mlflow_runs_paginates_with_cursor(
+    runs_client: FakeRunsClient, client: TestClient
+) -> None:
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        resp = client.get("/mlflow/runs", params=params)
+        assert resp.status_code == 200
+        seen.extend(record["info"]["run_id"] for record in resp.json())
+        cursor = resp.headers.get("x-next-cursor")
+        if cursor is None:
+            break
+
+    assert seen == ["run4", "run3", "run2", "run1", "run0"]
+    assert client.get("/mlflow/runs?cursor=not-a-cursor").status_code == 400
+
+
+def test_mlflow_runs_projects_fields(
+    runs_client: FakeRunsClient, client: TestClient
+) -> None:
+    resp = client.get("/mlflow/runs?limit=1&fields=metrics.test_r2,metrics.test_rmse")
+    assert resp.status_code == 200
+    data = resp.json()[0]["data"]
+    assert data == {
+        "metrics": {"test_r2": 0.8, "test_rmse": 104.0},
+        "params": {},
+        "tags": {},
+    }
+    assert client.get("/mlflow/runs?fields=bogus.x").status_code == 400
+
+
+def test_mlflow_runs_etag_and_incremental_refresh(
+    runs_client: FakeRunsClient, client: TestClient
+) -> None:
+    first = client.get("/mlflow/runs")
+    etag = first.headers["etag"]
+
+    unchanged = client.get("/mlflow/runs", headers={"If-None-Match": etag})
+    assert unchanged.status_code == 304
+    assert unchanged.content == b""
+    # Only the initial full search is unfiltered; refreshes ask for new runs.
+    assert "end_time" not in runs_client.searches[0]
+    assert all("end_time >=" in search for search in runs_client.searches[1:])
+
+    runs_client.runs.append(_fake_run("run5", 1735689600000 + 10_000, 99.0))
+    changed = client.get("/mlflow/runs", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+    assert changed.json()[0]["info"]["run_id"] == "run5"
+    assert len(changed.json()) == 6
+
+
 def test_mlflow_artifacts_endpoint(
     monkeypatch: pytest.MonkeyPatch, client: TestClient
 ) -> None:
@@ -0,0 +1,112 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from london_housing_ai.api.services import artifact_cache
+
+
+@pytest.fixture()
+def cache_dir(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> Path:
+    path = tmp_path / "cache"
+    monkeypatch.setenv("ARTIFACT_CACHE_DIR", str(path))
+    return path
+
+
+class FakeDownloader:
+    def __init__(self, payload: bytes = b'{"a": 1}') -> None:
+        self.payload = payload
+        self.calls = 0
+
+    def file(self, dst: str) -> str:
+        self.calls += 1
+        path = Path(dst) / "lookup_tables.json"
+        path.write_bytes(self.payload)
+        return str(path)
+
+    def directory(self, dst: str) -> str:
+        self.calls += 1
+        model_dir = Path(dst) / "catboost_model"
+        model_dir.mkdir()
+        (model_dir / "MLmodel").write_text("run_id: run1\n")
+        (model_dir / "model.cb").write_bytes(self.payload)
+        return str(model_dir)
+
+
+def test_artifact_is_downloaded_once(cache_dir: Path) -> None:
+    downloader = FakeDownloader()
+
+    first = artifact_cache.get_cached_artifact(
+        "run1", "lookup_tables.json", downloader.file
+    )
+    second = artifact_cache.get_cached_artifact(
+        "run1", "lookup_tables.json", downloader.file
+    )
+
+    assert first == second
+    assert Path(first).read_bytes() == downloader.payload
+    assert downloader.calls == 1
+    assert not [p for p in cache_dir.iterdir() if p.name.startswith(".tmp-")]
+
+
+def test_directory_artifacts_are_cached(cache_dir: Path) -> None:
+    downloader = FakeDownloader()
+
+    model_dir = artifact_cache.get_cached_artifact(
+        "run1", "catboost_model", downloader.directory
+    )
+    artifact_cache.get_cached_artifact("run1", "catboost_model", downloader.directory)
+
+    assert Path(model_dir, "model.cb").read_bytes() == downloader.payload
+    assert Path(model_dir, "MLmodel").exists()
+    assert downloader.calls == 1
+
+
+def test_corrupt_entry_is_downloaded_again(
+    monkeypatch: pytest.MonkeyPatch, cache_dir: Path
+) -> None:
+    downloader = FakeDownloader()
+    path = Path(
+        artifact_cache.get_cached_artifact(
+            "run1", "lookup_tables.json", downloader.file
+        )
+    )
+
+    path.write_bytes(b"truncated")
+    artifact_cache.get_cached_artifact("run1", "lookup_tables.json", downloader.file)
+    assert downloader.calls == 2
+    assert path.read_bytes() == downloader.payload
+
+    # Same size, different bytes: only caught when checksums are verified.
+    path.write_bytes(b"X" * len(downloader.payload))
+    artifact_cache.get_cached_artifact("run1", "lookup_tables.json", downloader.file)
+    assert downloader.calls == 2
+    monkeypatch.setenv("ARTIFACT_CACHE_VERIFY", "sha256")
+    artifact_cache.get_cached_artifact("run1", "lookup_tables.json", downloader.file)
+    assert downloader.calls == 3
+    assert path.read_bytes() == downloader.payload
+
+
+def test_least_recently_used_entries_are_evicted(
+    monkeypatch: pytest.MonkeyPatch, cache_dir: Path
+) -> None:
+    downloader = FakeDownloader(payload=b"x" * 100)
+    monkeypatch.setenv("ARTIFACT_CACHE_MAX_BYTES", "250")
+
+    paths = {}
+    for i, run_id in enumerate(["run1", "run2"]):
+        paths[run_id] = Path(
+            artifact_cache.get_cached_artifact(run_id, "lookup.json", downloader.file)
+        )
+        manifest = paths[run_id].parent / artifact_cache.MANIFEST_FILE
+        os.utime(manifest, (1000 + i, 1000 + i))
+
+    # Touch run1 so run2 becomes the least recently used entry.
+    artifact_cache.get_cached_artifact("run1", "lookup.json", downloader.file)
+    paths["run3"] = Path(
+        artifact_cache.get_cached_artifact("run3", "lookup.json", downloader.file)
+    )
+
+    assert paths["run1"].exists()
+    assert not paths["run2"].exists()
+    assert paths["run3"].exists()
@@ -0,0 +1,124 @@
+import json
+import random
+from pathlib import Path
+
+import pytest
+from prometheus_client import REGISTRY
+
+from london_housing_ai.api.schemas import ArtifactSummary
+from london_housing_ai.api.services import drift_monitor, mlflow_service
+from london_housing_ai.api.services.drift_monitor import DriftMonitor, TrainingProfile
+
+REPORT = {
+    "numeric_stats": [
+        {"price": 1000.0},
+        {"price": 500000.0},
+        {"price": 200000.0},
+        {"price": 100000.0},
+        {"price": 300000.0},
+        {"price": 450000.0},
+        {"price": 650000.0},
+        {"price": 2000000.0},
+    ],
+    "category_distribution": {
+        "property_type": {"F": 0.5, "T": 0.3, "S": 0.1, "D": 0.1},
+        "old/new": {"N": 0.9, "Y": 0.1},
+        "duration": {"L": 0.5, "F": 0.5},
+        "postcode": {"N1 9GU": 1.0},
+    },
+}
+
+
+def _request(property_type: str) -> dict:
+    return {
+        "district": "Camden",
+        "property_type": property_type,
+        "is_new_build": "N",
+        "is_leasehold": "Y" if property_type == "F" else "N",
+    }
+
+
+def _sample_training_like(rng: random.Random) -> tuple:
+    property_type = rng.choices(["F", "T", "S", "D"], [0.5, 0.3, 0.1, 0.1])[0]
+    # Uniform within the training quartiles.
+    bounds = [(100000, 300000), (300000, 450000), (450000, 650000), (650000, 2e6)]
+    price = rng.uniform(*bounds[rng.randrange(4)])
+    return _request(property_type), price
+
+
+def test_profile_reads_data_quality_report() -> None:
+    profile = TrainingProfile.from_report(REPORT)
+
+    assert set(profile.categories) == {"property_type", "is_new_build", "is_leasehold"}
+    assert profile.price_cdf(450000.0) == pytest.approx(0.5)
+
+
+def test_matching_traffic_reports_low_drift() -> None:
+    monitor = DriftMonitor()
+    monitor.set_profile("run1", TrainingProfile.from_report(REPORT))
+    rng = random.Random(0)
+    for _ in range(4000):
+        monitor.observe(*_sample_training_like(rng))
+
+    results = monitor.evaluate()
+
+    assert results["psi_property_type"] < 0.02
+    assert results["psi_predicted_price"] < 0.02
+    assert results["ks_predicted_price"] < 0.05
+
+
+def test_shifted_traffic_reports_drift_on_metrics() -> None:
+    monitor = DriftMonitor()
+    monitor.set_profile("run1", TrainingProfile.from_report(REPORT))
+    for _ in range(500):
+        monitor.observe(_request("D"), 3_000_000.0)
+
+    results = monitor.evaluate()
+
+    assert results["psi_property_type"] > 1.0
+    assert results["ks_predicted_price"] > 0.9
+    assert (
+        REGISTRY.get_sample_value("drift_psi", {"feature": "property_type"})
+        == results["psi_property_type"]
+    )
+
+
+def test_memory_is_bounded_and_counts_decay() -> None:
+    monitor = DriftMonitor(max_categories=3, decay=0.5)
+    for i in range(10):
+        monitor.observe({"district": f"district-{i}"}, 100000.0)
+
+    assert len(monitor._counts["district"]) == 4
+    assert monitor._counts["district"][drift_monitor.OTHER_CATEGORY] == 7
+
+    assert monitor.evaluate(min_observations=20) == {}
+    assert monitor._observations == 10
+    monitor.set_profile("run1", TrainingProfile.from_report(REPORT))
+    monitor.evaluate(min_observations=1)
+    assert monitor._observations == 5
+
+
+def test_load_training_profile_picks_newest_report(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("ARTIFACT_CACHE_DIR", str(tmp_path / "cache"))
+    artifacts = [
+        ArtifactSummary(path="data_quality_abc_2026-01-01.json", is_dir=False),
+        ArtifactSummary(path="data_quality_abc_2026-02-01.json", is_dir=False),
+        ArtifactSummary(path="catboost_model", is_dir=True),
+    ]
+    downloaded = []
+
+    def fake_download(run_id, artifact_path, dst_path=None):
+        downloaded.append(artifact_path)
+        path = Path(dst_path) / artifact_path
+        path.write_text(json.dumps(REPORT))
+        return str(path)
+
+    monkeypatch.setattr(mlflow_service, "list_artifacts", lambda run_id: artifacts)
+    monkeypatch.setattr(mlflow_service, "download_artifact_for_run", fake_download)
+
+    profile = drift_monitor.load_training_profile("run1")
+
+    assert downloaded == ["data_quality_abc_2026-02-01.json"]
+    assert profile.price_quantiles is not None
@@ -0,0 +1,89 @@
+import json
+from argparse import Namespace
+from contextlib import contextmanager
+from pathlib import Path
+
+import pytest
+from mlflow.tracking import MlflowClient
+
+from london_housing_ai.api.services import mlflow_service
+from london_housing_ai.lookup_tables import LookupTables
+from london_housing_ai.run_kinds import RUN_KIND_TAG, TUNE_RUN_KIND
+from london_housing_ai.scripts import export_lookup_tables
+from london_housing_ai.utils import create_files
+
+
+class FakeResult(list):
+    def scalar_one_or_none(self):
+        return self[0][0] if self else None
+
+
+class FakeConnection:
+    """Answers the export queries with canned, already-aggregated rows."""
+
+    def __init__(self):
+        self.queries = []
+
+    def execute(self, stmt, params=None):
+        sql = str(stmt)
+        self.queries.append((sql, params))
+        if "dataset_hashes" in sql:
+            return FakeResult([("london_housing_abc",)])
+        if "sold_year" in sql:
+            return FakeResult([("Camden", 2023, 700_000.0), ("Hackney", 2024, 1.5)])
+        if "interval" in sql:
+            return FakeResult([("Camden", 650_000.0)])
+        return FakeResult([("Camden", 710_000.0), ("Hackney", 590_000.0)])
+
+
+class FakeEngine:
+    def __init__(self):
+        self.conn = FakeConnection()
+
+    @contextmanager
+    def connect(self):
+        yield self.conn
+
+
+def test_main_writes_lookup_tables_from_aggregated_rows(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    engine = FakeEngine()
+    monkeypatch.setattr(export_lookup_tables, "get_engine", lambda: engine)
+    monkeypatch.setattr(create_files, "ARTIFACT_DIR", tmp_path)
+
+    export_lookup_tables.main(Namespace(table=None, run_id=None, no_log=True))
+
+    payload = json.loads((tmp_path / "lookup_tables.json").read_text())
+    assert payload == {
+        "borough_price_trend": {"Camden": 710_000.0, "Hackney": 590_000.0},
+        "district_yearly_medians": {"Camden_2023": 700_000.0, "Hackney_2024": 1.5},
+        "avg_price_last_half": {"Camden": 650_000.0},
+    }
+    tables = LookupTables.load(tmp_path / "lookup_tables.bin")
+    assert tables.yearly_median("Camden", 2023) == 700_000.0
+
+    aggregations = [(sql, p) for sql, p in engine.conn.queries if "percentile" in sql]
+    assert len(aggregations) == 3
+    assert all('FROM "london_housing_abc"' in sql for sql, _ in aggregations)
+    assert aggregations[-1][1] == {"window": "6 months"}
+
+
+def test_lookup_tables_are_never_logged_to_a_tuning_run(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    client = MlflowClient(f"file://{tmp_path / 'mlruns'}")
+    experiment_id = client.create_experiment("export")
+    model_run = client.create_run(experiment_id, run_name="london_housing_run")
+    client.set_terminated(model_run.info.run_id)
+    tune_run = client.create_run(
+        experiment_id,
+        run_name="london_housing_tune",
+        tags={RUN_KIND_TAG: TUNE_RUN_KIND},
+    )
+    client.set_terminated(tune_run.info.run_id)
+    monkeypatch.setattr(mlflow_service, "get_client", lambda: client)
+
+    run_id = export_lookup_tables._latest_finished_run_id("export")
+
+    assert run_id == model_run.info.run_id
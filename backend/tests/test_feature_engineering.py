@@ -1,7 +1,12 @@
 import pandas as pd
 from pandas.testing import assert_frame_equal
 
-from london_housing_ai.feature_engineering import extract_interaction_features
+from london_housing_ai.feature_engineering import (
+    build_lookup_tables,
+    extract_interaction_features,
+    extract_yearly_district_price_trend,
+)
+from london_housing_ai.lookup_tables import LookupTables
 
 
 def test_extract_interaction_features():
@@ -15,3 +20,33 @@ def test_extract_interaction_features():
     actual = extract_interaction_features(df, "combi", "is_animal", "is_plant")
 
     assert_frame_equal(actual, expected)
+
+
+def test_build_lookup_tables_matches_training_aggregations():
+    df = pd.DataFrame(
+        {
+            "district": pd.Categorical(
+                ["Camden", "Camden", "Camden", "Hackney", "Hackney"],
+                categories=["Camden", "Hackney", "Unseen"],
+            ),
+            "sold_year": [2019, 2020, 2020, 2019, 2019],
+            "date": pd.to_datetime(
+                ["2019-05-01", "2020-02-01", "2020-06-01", "2019-01-01", "2019-02-01"]
+            ),
+            "price": [500_000.0, 700_000.0, 900_000.0, 400_000.0, 600_000.0],
+        }
+    )
+
+    tables = build_lookup_tables(df)
+
+    assert tables["borough_price_trend"] == {"Camden": 700_000.0, "Hackney": 500_000.0}
+    # Same medians the district_yearly_medians training feature was built from.
+    features = extract_yearly_district_price_trend(
+        df.copy(), "district", "sold_year", "district_yearly_medians"
+    )
+    for row in features.itertuples():
+        key = f"{row.district}_{row.sold_year}"
+        assert tables["district_yearly_medians"][key] == row.district_yearly_medians
+    # Only sales within six months of the last one (2020-06-01) count.
+    assert tables["avg_price_last_half"] == {"Camden": 800_000.0}
+    assert LookupTables.from_dict(tables).yearly_median("Camden", 2020) == 800_000.0
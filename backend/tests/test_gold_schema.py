@@ -0,0 +1,83 @@
+import pandas as pd
+
+from london_housing_ai.gold_schema import (
+    MAX_POSTGRES_IDENTIFIER_LENGTH,
+    index_name,
+    partition_name,
+    partition_suffix,
+    plan_gold_table,
+)
+
+
+def _gold_frame() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "price": [250_000.0, 410_000.0, 980_000.0],
+            "date": pd.to_datetime(["2019-03-01", "2020-07-15", "2020-11-30"]),
+            "sold_year": [2019, 2020, 2020],
+            "district": ["Camden", "King's Lynn", "Camden"],
+            "is_new_build": ["N", "Y", None],
+            "floor_area": [55, 80, 120],
+            "property_type_and_district": ["F_" + "x" * 70, "D_Camden", "T_Camden"],
+        }
+    )
+
+
+def test_plan_uses_declared_types_and_enum_coded_categoricals() -> None:
+    layout = plan_gold_table(_gold_frame(), "london_housing_stg_abc")
+
+    types = layout.column_types
+    assert (types["price"], types["date"], types["sold_year"]) == (
+        "DOUBLE PRECISION",
+        "DATE",
+        "SMALLINT",
+    )
+    # Undeclared columns and labels too long for an enum keep inferred types.
+    assert types["floor_area"] == "BIGINT"
+    assert types["property_type_and_district"] == "TEXT"
+    assert sorted(layout.enum_labels.values()) == [
+        ["Camden", "King's Lynn"],
+        ["N", "Y"],
+    ]
+    enum_types = {f'"{name}"' for name in layout.enum_labels}
+    assert {types["district"], types["is_new_build"]} == enum_types
+
+    statements = layout.create_statements()
+    assert "'King''s Lynn'" in statements[0] + statements[1]
+    assert statements[2].endswith('PARTITION BY RANGE ("sold_year")')
+    assert statements[3:] == [
+        'CREATE UNLOGGED TABLE "london_housing_stg_abc_p2019" PARTITION OF '
+        '"london_housing_stg_abc" FOR VALUES FROM (2019) TO (2020)',
+        'CREATE UNLOGGED TABLE "london_housing_stg_abc_p2020" PARTITION OF '
+        '"london_housing_stg_abc" FOR VALUES FROM (2020) TO (2021)',
+        'CREATE UNLOGGED TABLE "london_housing_stg_abc_pdefault" PARTITION OF '
+        '"london_housing_stg_abc" DEFAULT',
+    ]
+    assert layout.index_statements() == [
+        'CREATE INDEX ON "london_housing_stg_abc" ("district", "date")'
+    ]
+
+
+def test_frames_without_gold_columns_get_a_plain_table() -> None:
+    df = pd.DataFrame({"area_in_sqft": [500.5], "location": ["Soho"]})
+
+    layout = plan_gold_table(df, "london_housing_abc")
+
+    assert not layout.partitioned and not layout.index_statements()
+    assert layout.create_statements(unlogged=False) == [
+        'CREATE TABLE "london_housing_abc" '
+        '("area_in_sqft" DOUBLE PRECISION, "location" TEXT)'
+    ]
+
+
+def test_partition_names_fit_postgres_identifiers() -> None:
+    table_name = "london_housing_" + "a" * 48
+
+    name = partition_name(table_name, 2024)
+
+    assert len(name) == MAX_POSTGRES_IDENTIFIER_LENGTH
+    assert name.endswith("_p2024")
+
+    indexes = {index_name(table_name, partition_suffix(y)) for y in (2023, 2024)}
+    assert len(indexes) == 2
+    assert all(len(i) == MAX_POSTGRES_IDENTIFIER_LENGTH for i in indexes)
@@ -0,0 +1,221 @@
+import asyncio
+import io
+import time
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+from starlette.requests import ClientDisconnect
+
+from london_housing_ai import score
+from london_housing_ai.api.app import create_app
+from london_housing_ai.api.services import jobs, mlflow_service, warmup
+from london_housing_ai.serve_transformer import ServingTransformer
+
+ARTIFACTS = Path(__file__).resolve().parents[1] / "artifacts"
+DISTRICTS = ServingTransformer(str(ARTIFACTS / "lookup_tables.json")).districts
+
+
+@pytest.fixture()
+def client(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    import mlflow.catboost as mlflow_catboost
+
+    model = mlflow_catboost.load_model(str(ARTIFACTS / "model"))
+    transformer = ServingTransformer(str(ARTIFACTS / "lookup_tables.json"))
+
+    async def no_warmup():
+        return None
+
+    async def fake_geocoder(df, postcode_col, district_col):
+        df = df.loc[df[postcode_col].str.startswith("P")].copy()
+        df[district_col] = [DISTRICTS[int(pc[1:]) % 5] for pc in df[postcode_col]]
+        return df
+
+    monkeypatch.setenv("JOBS_DIR", str(tmp_path / "jobs"))
+    monkeypatch.setenv("JOBS_CHUNK_SIZE", "4")
+    monkeypatch.setattr(warmup, "run_warmup", no_warmup)
+    monkeypatch.setattr(score, "get_district_from_postcode", fake_geocoder)
+    monkeypatch.setattr(mlflow_service, "get_latest_finished_run_id", lambda: "run1")
+    monkeypatch.setattr(
+        mlflow_service, "run_uses_log_target", lambda run_id, default=True: True
+    )
+    monkeypatch.setattr(jobs, "get_or_load_model", lambda run_id: model)
+    monkeypatch.setattr(jobs, "get_or_load_transformer", lambda run_id: transformer)
+
+    with TestClient(create_app()) as test_client:
+        yield test_client
+
+
+def _properties(n_rows: int) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "id": [f"row{i}" for i in range(n_rows)],
+            "postcode": [f"P{i}" if i % 5 else f"X{i}" for i in range(n_rows)],
+            "property_type": ["F", "T", "S", "D"] * (n_rows // 4),
+        }
+    )
+
+
+def _wait_for(client: TestClient, job_id: str) -> dict:
+    for _ in range(500):
+        status = client.get(f"/jobs/{job_id}").json()
+        if status["status"] in {"succeeded", "failed", "cancelled"}:
+            return status
+        time.sleep(0.01)
+    raise AssertionError(f"job {job_id} did not finish: {status}")
+
+
+def test_uploaded_csv_is_scored_in_chunks(client: TestClient) -> None:
+    properties = _properties(12)
+
+    resp = client.post(
+        "/jobs/score",
+        content=properties.to_csv(index=False).encode(),
+        headers={"Content-Type": "text/csv"},
+    )
+    assert resp.status_code == 202
+    job_id = resp.json()["job_id"]
+    assert resp.headers["location"] == f"/jobs/{job_id}"
+
+    status = _wait_for(client, job_id)
+    assert status["status"] == "succeeded", status
+    assert status["chunks_done"] == 3
+    assert (status["rows_done"], status["rows_scored"]) == (12, 9)
+    assert status["run_id"] == "run1"
+
+    result = client.get(status["result_url"])
+    assert result.status_code == 200
+    scored = pd.read_parquet(io.BytesIO(result.content))
+    assert scored["id"].tolist() == properties["id"].tolist()
+    assert scored["predicted_price"].isna().tolist() == [i % 5 == 0 for i in range(12)]
+
+
+def test_server_side_parquet_reports_progress(
+    client: TestClient, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    inputs = tmp_path / "inputs"
+    inputs.mkdir()
+    _properties(8).to_parquet(inputs / "props.parquet", index=False)
+    monkeypatch.setenv("JOBS_INPUT_DIR", str(inputs))
+
+    resp = client.post("/jobs/score", json={"path": "props.parquet"})
+    status = _wait_for(client, resp.json()["job_id"])
+
+    assert status["status"] == "succeeded"
+    assert (status["total_rows"], status["progress"]) == (8, 1.0)
+
+    outside = client.post("/jobs/score", json={"path": "../jobs"})
+    assert outside.status_code == 403
+
+
+def test_cancel_and_unknown_jobs(client: TestClient) -> None:
+    manager = jobs.get_manager()
+    job_id, job_dir = manager.new_job_dir()
+    job = manager.create(job_id, job_dir / "input.csv")
+
+    resp = client.delete(f"/jobs/{job.job_id}")
+    assert resp.json()["status"] == "cancelled"
+    assert client.get(f"/jobs/{job.job_id}/result").status_code == 409
+    assert client.get("/jobs/missing").status_code == 404
+    assert client.delete("/jobs/missing").status_code == 404
+
+    bad = client.post(
+        "/jobs/score",
+        content=b"\x00",
+        headers={"Content-Type": "application/octet-stream"},
+    )
+    assert bad.status_code == 415
+
+
+def test_failed_job_leaves_no_partial_result(client: TestClient) -> None:
+    resp = client.post(
+        "/jobs/score",
+        content=_properties(0).to_csv(index=False).encode(),
+        headers={"Content-Type": "text/csv"},
+    )
+    job_id = resp.json()["job_id"]
+
+    status = _wait_for(client, job_id)
+    assert status["status"] == "failed"
+    assert status["error"] == "Input file has no rows"
+    assert not list(jobs.get_manager().root.joinpath(job_id).glob("*.partial"))
+
+
+def test_cancel_of_an_evicted_job_is_not_found(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    manager = jobs.get_manager()
+    job_id, job_dir = manager.new_job_dir()
+    manager.create(job_id, job_dir / "input.csv")
+    # evicted by another request between lookup and cancel
+    monkeypatch.setattr(manager, "cancel", lambda job_id: None)
+
+    assert client.delete(f"/jobs/{job_id}").status_code == 404
+
+
+def _raw_upload(client: TestClient, messages: list[dict]) -> list[dict]:
+    # Drives the app directly so the body can arrive without a Content-Length.
+    incoming = iter(messages)
+    sent: list[dict] = []
+
+    async def receive():
+        return next(incoming)
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": "/jobs/score",
+        "raw_path": b"/jobs/score",
+        "query_string": b"",
+        "headers": [(b"content-type", b"text/csv")],
+        "client": ("test", 1),
+        "server": ("test", 80),
+    }
+    asyncio.run(client.app(scope, receive, send))
+    return sent
+
+
+def test_abandoned_upload_leaves_no_job_dir(client: TestClient, tmp_path: Path) -> None:
+    messages = [
+        {"type": "http.request", "body": b"id,postcode\n", "more_body": True},
+        {"type": "http.disconnect"},
+    ]
+    with pytest.raises(ClientDisconnect):
+        _raw_upload(client, messages)
+
+    assert list((tmp_path / "jobs").iterdir()) == []
+
+
+def test_oversized_upload_is_rejected_before_reading(
+    client: TestClient, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("JOBS_MAX_UPLOAD_BYTES", "16")
+    body = _properties(4).to_csv(index=False).encode()
+
+    r = client.post("/jobs/score", content=body, headers={"content-type": "text/csv"})
+
+    assert r.status_code == 413
+    assert not list((tmp_path / "jobs").glob("*"))
+
+
+def test_streamed_upload_stops_at_the_size_limit(
+    client: TestClient, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("JOBS_MAX_UPLOAD_BYTES", "16")
+    messages = [
+        {"type": "http.request", "body": b"id,postcode\n", "more_body": True},
+        {"type": "http.request", "body": b"row0,P1\n", "more_body": True},
+        {"type": "http.request", "body": b"row1,P2\n", "more_body": False},
+    ]
+
+    sent = _raw_upload(client, messages)
+
+    assert sent[0]["status"] == 413
+    assert list((tmp_path / "jobs").iterdir()) == []
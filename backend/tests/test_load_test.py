@@ -0,0 +1,63 @@
+import asyncio
+from argparse import Namespace
+
+import pytest
+
+from london_housing_ai.scripts import load_test
+from london_housing_ai.scripts.load_test import FakePostcodesIO
+from london_housing_ai.services import postcode_service
+
+
+def test_fake_postcodes_io_resolves_and_rate_limits(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(postcode_service, "_cache", {})
+
+    async def scenario():
+        fake = FakePostcodesIO(["Camden", "Hackney"], latency_seconds=0)
+        url = await fake.start()
+        monkeypatch.setattr(postcode_service, "POSTCODE_LOOKUP_URL", url)
+        try:
+            resolved = await postcode_service.resolve_district("LT1 1AA")
+            fake.rate_limited_share = 1.0
+            limited = await postcode_service.resolve_district("LT2 1AA")
+        finally:
+            await fake.stop()
+        return fake, resolved, limited
+
+    fake, resolved, limited = asyncio.run(scenario())
+
+    assert resolved == fake.district_for("LT11AA")
+    assert limited is None
+    assert (fake.requests, fake.rate_limited) == (2, 1)
+
+
+def test_summarize_reports_percentiles_and_error_rates() -> None:
+    results = [(0.010, 200)] * 90 + [(0.100, 503)] * 8 + [(1.0, 0)] * 2
+
+    report = load_test.summarize(results, elapsed=2.0, qps=50)
+
+    assert report["requests"] == 100
+    assert report["throughput_qps"] == 50.0
+    assert report["ok_qps"] == 45.0
+    assert report["status_counts"] == {"0": 2, "200": 90, "503": 8}
+    assert report["error_rate"] == 0.1
+    assert report["shed_rate"] == 0.08
+    assert report["latency_ms"]["p50"] == 10.0
+    assert report["latency_ms"]["max"] == 1000.0
+
+
+def test_temporary_workdir_is_removed(monkeypatch: pytest.MonkeyPatch) -> None:
+    used = []
+
+    async def run_in(workdir, args):
+        (workdir / "mlruns").mkdir()
+        used.append(workdir)
+        raise RuntimeError("api did not start")
+
+    monkeypatch.setattr(load_test, "_run_in", run_in)
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(load_test._run(Namespace(workdir=None)))
+
+    assert not used[0].exists()
@@ -12,6 +12,7 @@ from london_housing_ai.loaders import (
     load_cleaning_config,
     load_dataset,
     load_train_config,
+    load_tune_config,
 )
 
 
@@ -125,6 +126,14 @@ def test_load_train_config():
     assert config.early_stop == 200
 
 
+def test_load_tune_config_defaults_without_section():
+    path = _get_dir_path() / "test_resources/test_train_config.yaml"
+    config = load_tune_config(path)
+    assert config.num_samples == 16
+    assert config.depth == [6, 8, 10]
+    assert config.cpus_per_trial == 2
+
+
 def _save_csv_file(file_path: Path, data_to_save: List[List[Any]]):
     """
     write data as csv as a file name in current dir
@@ -0,0 +1,119 @@
+import json
+import logging
+import os
+import subprocess
+import sys
+from logging.handlers import QueueHandler
+from pathlib import Path
+
+import pytest
+
+from london_housing_ai.utils import logger as logger_module
+from london_housing_ai.utils.logger import (
+    PRESAMPLED,
+    JsonFormatter,
+    SamplingFilter,
+    get_logger,
+    should_sample,
+)
+
+
+def test_get_logger_only_enqueues() -> None:
+    logger = get_logger("london_housing_ai.tests.enqueue_only")
+
+    assert len(logger.handlers) == 1
+    assert isinstance(logger.handlers[0], QueueHandler)
+    assert not any(isinstance(h, logging.StreamHandler) for h in logger.handlers)
+
+
+def test_json_formatter_includes_extra_fields() -> None:
+    record = logging.LogRecord(
+        "london_housing_ai.x", logging.INFO, __file__, 1, "hello %s", ("world",), None
+    )
+    record.run_id = "run1"
+
+    payload = json.loads(JsonFormatter().format(record))
+
+    assert payload["message"] == "hello world"
+    assert payload["level"] == "INFO"
+    assert payload["logger"] == "london_housing_ai.x"
+    assert payload["run_id"] == "run1"
+
+
+def test_sampling_only_thins_debug_records() -> None:
+    never = SamplingFilter(rate=0.0)
+
+    def record(level: int) -> logging.LogRecord:
+        return logging.LogRecord("x", level, __file__, 1, "msg", None, None)
+
+    assert never.filter(record(logging.DEBUG)) is False
+    assert never.filter(record(logging.INFO)) is True
+    assert SamplingFilter(rate=1.0).filter(record(logging.DEBUG)) is True
+
+
+def test_should_sample_decides_before_the_payload_is_built() -> None:
+    logger = logging.getLogger("london_housing_ai.tests.presampled")
+    logger.setLevel(logging.DEBUG)
+    never = SamplingFilter(rate=0.0)
+    logger.addFilter(never)
+    try:
+        assert should_sample(logger) is False
+        never.rate = 1.0
+        assert should_sample(logger) is True
+
+        # A kept record is not sampled again by the filter.
+        record = logging.LogRecord("x", logging.DEBUG, __file__, 1, "msg", None, None)
+        setattr(record, PRESAMPLED, True)
+        never.rate = 0.0
+        assert never.filter(record) is True
+
+        logger.setLevel(logging.INFO)
+        never.rate = 1.0
+        assert should_sample(logger) is False
+    finally:
+        logger.removeFilter(never)
+
+
+def test_sample_rate_uses_longest_prefix(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv(
+        "LOG_SAMPLE_RATES",
+        "london_housing_ai=0.5,london_housing_ai.api.routers.predict=0.01",
+    )
+
+    assert (
+        logger_module._sample_rate_for("london_housing_ai.api.routers.predict") == 0.01
+    )
+    assert logger_module._sample_rate_for("london_housing_ai.models") == 0.5
+    assert logger_module._sample_rate_for("london_housing_ai_other") is None
+
+
+def test_records_are_written_as_json_lines_by_listener(
+    request: pytest.FixtureRequest,
+) -> None:
+    script = """
+from london_housing_ai.utils.logger import get_logger
+logger = get_logger("london_housing_ai.demo")
+logger.info("loaded %s", "model", extra={"run_id": "run1"})
+logger.debug("dropped by sampling")
+try:
+    1 / 0
+except ZeroDivisionError:
+    logger.exception("failed")
+"""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = str(Path(request.config.rootpath) / "src")
+    env["LOG_LEVEL"] = "DEBUG"
+    env["LOG_SAMPLE_RATES"] = "london_housing_ai.demo=0"
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        capture_output=True,
+        text=True,
+        timeout=60,
+        env=env,
+    )
+
+    assert result.returncode == 0, result.stderr
+    lines = [json.loads(line) for line in result.stdout.splitlines()]
+    assert [line["message"] for line in lines] == ["loaded model", "failed"]
+    assert lines[0]["run_id"] == "run1"
+    assert "ZeroDivisionError" in lines[1]["exc_info"]
@@ -0,0 +1,77 @@
+import datetime
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from london_housing_ai.lookup_tables import LookupTables, write_binary_lookup_tables
+from london_housing_ai.serve_transformer import ServingTransformer
+
+THIS_YEAR = datetime.date.today().year
+LOOKUP_TABLES = {
+    "borough_price_trend": {"Camden": 750000.0, "Hackney": 540000.0, "Bexley": 1.5},
+    "district_yearly_medians": {
+        f"Camden_{THIS_YEAR}": 740000.0,
+        f"Hackney_{THIS_YEAR - 1}": 530000.0,
+        "Kensington and Chelsea_1995": 210000.0,
+    },
+    "avg_price_last_half": {"Camden": 760000.0, "Hackney": 545000.0},
+}
+
+
+@pytest.fixture()
+def json_path(tmp_path: Path) -> Path:
+    path = tmp_path / "lookup_tables.json"
+    path.write_text(json.dumps(LOOKUP_TABLES))
+    return path
+
+
+@pytest.fixture()
+def binary_path(tmp_path: Path, json_path: Path) -> Path:
+    return write_binary_lookup_tables(json_path, tmp_path / "lookup_tables.bin")
+
+
+def test_binary_tables_match_json_lookups(json_path: Path, binary_path: Path) -> None:
+    from_json = LookupTables.load(json_path)
+    from_binary = LookupTables.load(binary_path)
+
+    assert isinstance(from_binary.borough_price_trend, np.memmap)
+    assert from_binary.districts == from_json.districts
+    assert from_binary.global_price_median == 540000.0
+    assert from_binary.borough_trend("Camden") == 750000.0
+    assert from_binary.recent_median("Bexley") is None
+    assert from_binary.yearly_median("Camden", THIS_YEAR) == 740000.0
+    assert from_binary.yearly_median("Camden", THIS_YEAR - 1) is None
+    assert from_binary.yearly_median("Kensington and Chelsea", 1995) == 210000.0
+    assert from_binary.yearly_median("Camden", 1900) is None
+    assert from_binary.borough_trend("Atlantis") is None
+
+
+def test_binary_tables_are_read_only(binary_path: Path) -> None:
+    tables = LookupTables.load(binary_path)
+
+    with pytest.raises(ValueError):
+        tables.borough_price_trend[0] = 1.0
+
+
+@pytest.mark.parametrize("district", ["Camden", "Hackney", "Bexley", "Atlantis"])
+def test_transformer_features_identical_for_both_formats(
+    json_path: Path, binary_path: Path, district: str
+) -> None:
+    user_input = {"district": district, "property_type": "F"}
+
+    pd.testing.assert_frame_equal(
+        ServingTransformer(str(binary_path)).transform(user_input),
+        ServingTransformer(str(json_path)).transform(user_input),
+    )
+
+
+def test_binary_loader_rejects_unknown_version(binary_path: Path) -> None:
+    raw = bytearray(binary_path.read_bytes())
+    raw[4] = 99
+    binary_path.write_bytes(bytes(raw))
+
+    with pytest.raises(RuntimeError, match="version"):
+        LookupTables.from_binary(binary_path)
@@ -0,0 +1,76 @@
+from pathlib import Path
+
+import pytest
+
+from london_housing_ai.api.services import mlflow_service, model_index
+from london_housing_ai.api.services.model_index import INDEX_FILE, RunModelIndex
+
+
+def _log_model(root: Path, model_id: str, run_id: str) -> Path:
+    artifacts_dir = root / "models" / model_id / "artifacts"
+    artifacts_dir.mkdir(parents=True)
+    (artifacts_dir / "MLmodel").write_text(
+        f"artifact_path: catboost_model\nrun_id: {run_id}\n", encoding="utf-8"
+    )
+    return artifacts_dir
+
+
+@pytest.fixture()
+def counted_reads(monkeypatch: pytest.MonkeyPatch) -> list:
+    reads: list = []
+    original = model_index._read_mlmodel_run_id
+
+    def counting(path: Path):
+        reads.append(path)
+        return original(path)
+
+    monkeypatch.setattr(model_index, "_read_mlmodel_run_id", counting)
+    return reads
+
+
+def test_index_resolves_runs_and_updates_incrementally(
+    tmp_path: Path, counted_reads: list
+) -> None:
+    for i in range(5):
+        _log_model(tmp_path, f"m-{i}", f"run{i}")
+    index = RunModelIndex(tmp_path)
+
+    assert index.lookup("run3") == tmp_path / "models" / "m-3" / "artifacts"
+    assert len(counted_reads) == 5
+
+    counted_reads.clear()
+    assert index.lookup("run1") == tmp_path / "models" / "m-1" / "artifacts"
+    assert counted_reads == []
+
+    new_dir = _log_model(tmp_path, "m-new", "run-new")
+    assert index.lookup("run-new") == new_dir
+    assert counted_reads == [new_dir / "MLmodel"]
+
+    counted_reads.clear()
+    assert index.lookup("missing") is None
+    assert counted_reads == []
+
+
+def test_index_is_persisted_under_tracking_root(
+    tmp_path: Path, counted_reads: list
+) -> None:
+    for i in range(3):
+        _log_model(tmp_path, f"m-{i}", f"run{i}")
+    RunModelIndex(tmp_path).lookup("run0")
+    assert (tmp_path / INDEX_FILE).exists()
+
+    counted_reads.clear()
+    reloaded = RunModelIndex(tmp_path)
+    assert reloaded.lookup("run2") == tmp_path / "models" / "m-2" / "artifacts"
+    assert counted_reads == []
+
+
+def test_mlflow_service_fallback_uses_index(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    artifacts_dir = _log_model(tmp_path, "m-1", "run1")
+    monkeypatch.setenv("MLFLOW_TRACKING_URI", f"file://{tmp_path}")
+    monkeypatch.setattr(model_index, "_indexes", {})
+
+    assert mlflow_service._model_artifacts_dir_for_run("run1") == artifacts_dir
+    assert mlflow_service._model_artifacts_dir_for_run("run2") is None
@@ -0,0 +1,75 @@
+import dataclasses
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from london_housing_ai import models
+from london_housing_ai.config_schemas.TrainConfig import TrainConfig
+from london_housing_ai.models import MetricType, PriceModel
+
+CFG = TrainConfig(
+    cat_features=["district"],
+    numeric_features=["date", "floor_area"],
+    label="price",
+    n_iter=50,
+    depth=3,
+    lr=0.2,
+)
+
+
+@pytest.fixture
+def frame() -> pd.DataFrame:
+    rng = np.random.default_rng(1)
+    n = 500
+    district = rng.choice(["SW1", "E14", "N1"], n)
+    floor_area = rng.uniform(30, 200, n)
+    return pd.DataFrame(
+        {
+            "district": pd.Categorical(district),
+            "date": pd.Timestamp("2020-01-01")
+            + pd.to_timedelta(rng.integers(0, 1000, n), unit="D"),
+            "floor_area": floor_area,
+            "price": floor_area * 5000 * np.where(district == "SW1", 3, 1),
+        }
+    )
+
+
+@pytest.fixture(autouse=True)
+def no_artifacts(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(models, "generate_artifact_from_df", lambda *a: None)
+
+
+def test_split_pools_partition_the_frame(frame: pd.DataFrame) -> None:
+    pools = PriceModel(CFG)._make_pools(frame)
+
+    sizes = {t: p.pool.num_row() for t, p in pools.items()}
+    assert sum(sizes.values()) == len(frame)
+    assert sizes[MetricType.TEST] == pytest.approx(0.15 * len(frame), abs=1)
+    train = pools[MetricType.TRAIN]
+    assert train.pool.get_feature_names() == ["district", "date", "floor_area"]
+    assert train.pool.get_cat_feature_indices() == [0]
+    # Metrics compare against the unclipped price, the label is clipped and logged.
+    labels = np.asarray(train.pool.get_label(), dtype=float)
+    clip = np.quantile(train.prices, CFG.clip_target_q)
+    np.testing.assert_allclose(labels, np.log1p(np.minimum(train.prices, clip)))
+
+
+def test_train_metrics_can_be_sampled(
+    frame: pd.DataFrame, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    scored = []
+    predict_split = PriceModel._predict_split
+
+    def counting(self, split, rows=None):
+        y_true, y_pred = predict_split(self, split, rows)
+        scored.append(len(y_true))
+        return y_true, y_pred
+
+    monkeypatch.setattr(PriceModel, "_predict_split", counting)
+    trainer = PriceModel(dataclasses.replace(CFG, train_metrics_sample=100))
+    trainer.train_and_evaluate(frame, "sha")
+
+    assert scored[0] == 100
+    assert sum(scored[1:]) == len(frame) - 350
+    assert trainer.log_data["metrics"]["test_r2"] > 0.5
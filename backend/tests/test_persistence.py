@@ -0,0 +1,163 @@
+import csv
+import io
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from london_housing_ai import persistence
+from london_housing_ai.gold_schema import index_name
+
+
+class FakeCursor:
+    def __init__(self):
+        self.copies = []
+
+    def copy_expert(self, sql, buffer):
+        self.copies.append((sql, buffer.read()))
+
+    def close(self):
+        pass
+
+
+class FakeEngine:
+    def __init__(self):
+        self.statements = []
+
+    @contextmanager
+    def begin(self):
+        yield self
+
+    def exec_driver_sql(self, stmt):
+        self.statements.append(stmt)
+
+
+def test_copy_dataframe_streams_csv_chunks_with_nulls() -> None:
+    df = pd.DataFrame(
+        {
+            "price": [100.0, np.nan, 300.5],
+            "old/new": ["Y", None, 'say "hi", ok'],
+            "date": pd.to_datetime(["2020-01-01", "2020-02-01", None]),
+        }
+    )
+    cursor = FakeCursor()
+
+    persistence.copy_dataframe(cursor, df, "london_housing_stg_abc", chunk_rows=2)
+
+    sqls = {sql for sql, _ in cursor.copies}
+    assert sqls == {
+        'COPY "london_housing_stg_abc" ("price", "old/new", "date") '
+        "FROM STDIN WITH (FORMAT csv, NULL '\\N')"
+    }
+    rows = [
+        row for _, payload in cursor.copies for row in csv.reader(io.StringIO(payload))
+    ]
+    assert len(cursor.copies) == 2
+    assert rows == [
+        ["100.0", "Y", "2020-01-01"],
+        ["\\N", "\\N", "2020-02-01"],
+        ["300.5", 'say "hi", ok', "\\N"],
+    ]
+
+
+def test_failed_load_drops_staging_table(monkeypatch: pytest.MonkeyPatch) -> None:
+    checksum = "a" * 64
+    engine = FakeEngine()
+
+    def broken_staging(conn, layout):
+        raise ValueError("COPY failed")
+
+    monkeypatch.setattr(persistence, "_create_staging_table", broken_staging)
+
+    with pytest.raises(RuntimeError, match="failed to persist"):
+        persistence.persist_dataset(
+            pd.DataFrame({"x": [1], "district": ["Camden"]}), engine, checksum
+        )
+
+    staging = persistence._staging_table_name(checksum)
+    assert len(staging) <= persistence.MAX_POSTGRES_IDENTIFIER_LENGTH
+    assert engine.statements[0] == f'DROP TABLE IF EXISTS "{staging}"'
+    # The district enum type created for this load is dropped too.
+    assert len(engine.statements) == 2
+    assert engine.statements[1].startswith('DROP TYPE IF EXISTS "london_housing_enum_')
+
+
+def test_swap_only_renames_after_the_load_is_logged(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    transactions = []
+
+    class Conn:
+        def __init__(self):
+            self.statements = []
+            self.connection = SimpleNamespace(cursor=lambda: FakeCursor())
+
+        def exec_driver_sql(self, stmt):
+            self.statements.append(stmt)
+
+        def execute(self, stmt, params):
+            index = f"{params['t']}_district_date_idx"
+            return SimpleNamespace(fetchall=lambda: [(index,)])
+
+    class Engine:
+        @contextmanager
+        def begin(self):
+            transactions.append(Conn())
+            yield transactions[-1]
+
+    monkeypatch.setattr(persistence, "_enum_types_of", lambda conn, table: [])
+    monkeypatch.setattr(persistence, "_upsert_checksum", lambda *args: None)
+    df = pd.DataFrame(
+        {
+            "price": [1.0, 2.0],
+            "date": pd.to_datetime(["2020-01-01", "2021-01-01"]),
+            "sold_year": [2020, 2021],
+            "district": ["Camden", "Soho"],
+        }
+    )
+
+    persistence.persist_dataset(df, Engine(), "b" * 64)
+
+    load, swap = (t.statements for t in transactions)
+    assert sum("SET LOGGED" in stmt for stmt in load) == 3
+    assert not any("SET LOGGED" in stmt for stmt in swap)
+    table = persistence._table_name_from_checksum("b" * 64)
+    renamed = [stmt.split(" RENAME TO ")[1] for stmt in swap if "ALTER INDEX" in stmt]
+    assert renamed == [
+        f'"{index_name(table, suffix)}"'
+        for suffix in ["_p2020", "_p2021", "_pdefault", ""]
+    ]
+    assert not any("stg_" in name for name in renamed)
+
+
+def test_read_copy_csv_restores_training_dtypes() -> None:
+    # What COPY ... TO STDOUT WITH (FORMAT csv) writes for a persisted frame.
+    payload = (
+        b'2020-01-01 00:00:00,3,"",Flat,t,2021-03-04\n'
+        b'2020-01-02 10:00:00.5,,E14,"Semi ""detached""",f,\n'
+    )
+    column_types = {
+        "date": "timestamp without time zone",
+        "sold_month": "bigint",
+        "district": "text",
+        "property_type": "text",
+        "is_new": "boolean",
+        "sold_on": "date",
+    }
+
+    df = persistence.restore_dtypes(
+        persistence.read_copy_csv(io.BytesIO(payload), column_types),
+        categorical=["property_type", "missing"],
+    )
+
+    assert df.columns.tolist() == list(column_types)
+    assert df["date"].dtype == "datetime64[ns]"
+    assert df.loc[1, "date"] == pd.Timestamp("2020-01-02 10:00:00.5")
+    assert df["sold_on"].dtype == "datetime64[ns]" and pd.isna(df.loc[1, "sold_on"])
+    assert np.isnan(df.loc[1, "sold_month"])
+    assert df["district"].tolist() == ["", "E14"]
+    assert df["is_new"].tolist() == [True, False]
+    assert isinstance(df["property_type"].dtype, pd.CategoricalDtype)
+    assert df["property_type"].tolist() == ["Flat", 'Semi "detached"']
@@ -0,0 +1,84 @@
+from pathlib import Path
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+from london_housing_ai.api.services import prediction_log
+from london_housing_ai.api.services.prediction_log import PredictionLogSink
+
+
+@pytest.fixture(autouse=True)
+def fresh_sink():
+    prediction_log.close()
+    yield
+    prediction_log.close()
+
+
+def _features(district: str) -> pd.DataFrame:
+    return pd.DataFrame([{"district": district, "sold_year": 2024}])
+
+
+def test_flush_writes_hour_partitioned_parquet(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    sink = PredictionLogSink(tmp_path, flush_interval_seconds=3600)
+    clock = iter([1_700_000_000.0, 1_700_000_100.0, 1_700_003_700.0])
+    monkeypatch.setattr(
+        prediction_log, "time", SimpleNamespace(time=lambda: next(clock))
+    )
+
+    for district in ["Camden", "Hackney", "Islington"]:
+        assert sink.record("run1", _features(district), 500000.0, 12.5) == 0
+    sink.close()
+
+    files = sorted(tmp_path.glob("date=*/hour=*/*.parquet"))
+    assert [f.parent.name for f in files] == ["hour=22", "hour=23"]
+    assert files[0].parent.parent.name == "date=2023-11-14"
+
+    frame = pd.read_parquet(tmp_path)
+    assert len(frame) == 3
+    assert {"timestamp", "run_id", "prediction", "latency_ms", "district"} <= set(
+        frame.columns
+    )
+    assert sorted(frame["district"]) == ["Camden", "Hackney", "Islington"]
+
+
+def test_oldest_records_dropped_when_over_byte_budget(tmp_path: Path) -> None:
+    record_bytes = int(_features("Camden").memory_usage(deep=True).sum())
+    sink = PredictionLogSink(
+        tmp_path, max_bytes=2 * record_bytes, flush_interval_seconds=3600
+    )
+
+    dropped = [
+        sink.record("run1", _features(district), 1.0, 1.0)
+        for district in ["Camden", "Hackney", "Islington"]
+    ]
+
+    assert dropped == [0, 0, 1]
+    assert sink.flush() == 2
+    assert sorted(pd.read_parquet(tmp_path)["district"]) == ["Hackney", "Islington"]
+    assert sink.record("run1", _features("Camden"), 1.0, 1.0) == 0
+    sink.close()
+
+
+def test_background_thread_flushes_periodically(tmp_path: Path) -> None:
+    sink = PredictionLogSink(tmp_path, flush_interval_seconds=0.01)
+    sink.record("run1", _features("Camden"), 1.0, 1.0)
+
+    for _ in range(500):
+        if list(tmp_path.rglob("*.parquet")):
+            break
+        sink._stop.wait(0.01)
+    assert len(list(tmp_path.rglob("*.parquet"))) == 1
+    sink.close()
+
+
+def test_sink_disabled_without_directory(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.delenv("PREDICTION_LOG_DIR", raising=False)
+    assert prediction_log.get_sink() is None
+
+    monkeypatch.setenv("PREDICTION_LOG_DIR", str(tmp_path))
+    assert prediction_log.get_sink() is prediction_log.get_sink()
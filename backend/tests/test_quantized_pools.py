@@ -0,0 +1,118 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from london_housing_ai import models, quantized_pools
+from london_housing_ai.config_schemas.TrainConfig import TrainConfig
+from london_housing_ai.models import PriceModel
+from london_housing_ai.quantized_pools import FrameSource, ParquetSource
+
+CFG = TrainConfig(
+    cat_features=["district", "property_type"],
+    numeric_features=["date", "sold_year"],
+    label="price",
+    n_iter=30,
+    depth=3,
+    quantized_pools=True,
+)
+
+
+@pytest.fixture
+def frame() -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    n = 600
+    dates = pd.Timestamp("2015-01-01") + pd.to_timedelta(
+        rng.integers(0, 3000, n), unit="D"
+    )
+    district = rng.choice(["SW1", "E14", "N1", "SE5"], n)
+    price = rng.lognormal(13, 0.6, n) * np.where(district == "SW1", 3, 1)
+    return pd.DataFrame(
+        {
+            "district": pd.Categorical(district),
+            "property_type": rng.choice(["F", "T", "D"], n),
+            "date": dates,
+            "sold_year": dates.year.astype("int16"),
+            "price": price,
+        }
+    )
+
+
+@pytest.fixture(autouse=True)
+def no_artifacts(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(models, "generate_artifact_from_df", lambda *a: None)
+
+
+def test_second_run_reuses_pools_and_borders(
+    frame: pd.DataFrame, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    first = PriceModel(CFG)
+    first.train_and_evaluate_quantized(FrameSource(frame, 128), "sha", tmp_path, "k")
+    metrics = first.log_data["metrics"]
+    assert {"train_r2", "validation_r2", "test_r2"} <= set(metrics)
+    assert metrics["train_r2"] > 0
+    assert len(list((tmp_path / "borders").glob("*.tsv"))) == 1
+
+    def no_quantize(*args, **kwargs):
+        raise AssertionError("pools should be reused")
+
+    monkeypatch.setattr(quantized_pools.Pool, "quantize", no_quantize)
+    second = PriceModel(CFG)
+    second.train_and_evaluate_quantized(FrameSource(frame, 128), "sha", tmp_path, "k")
+    assert second.log_data["metrics"] == pytest.approx(metrics)
+
+
+def test_splits_match_the_dataframe_path(frame: pd.DataFrame, tmp_path: Path):
+    trainer = PriceModel(CFG)
+    train_idx, test_idx, val_idx = trainer._split_indices(frame["price"])
+    train, test, val = (frame.iloc[i] for i in (train_idx, test_idx, val_idx))
+    path = tmp_path / "frame.parquet"
+    frame.to_parquet(path)
+
+    pools = quantized_pools.build_quantized_pools(
+        ParquetSource(path, 100),
+        CFG,
+        {"train": train.index, "validation": val.index, "test": test.index},
+        tmp_path / "pools",
+        "k",
+    )
+    train_pool, val_pool = pools.fit_pools()
+    for split, pool, expected in [
+        ("train", train_pool, train),
+        ("validation", val_pool, val),
+    ]:
+        assert sorted(pools.indices[split]) == sorted(expected.index)
+        assert pool.num_row() == len(expected)
+        label = np.log1p(expected["price"].clip(upper=expected["price"].quantile(0.99)))
+        np.testing.assert_allclose(
+            np.sort(np.asarray(pool.get_label(), dtype=float)),
+            np.sort(label),
+            rtol=1e-5,
+        )
+    assert sorted(pools.indices["test"]) == sorted(test.index)
+
+
+def test_new_border_count_is_not_overridden_by_saved_borders(
+    frame: pd.DataFrame, tmp_path: Path
+) -> None:
+    def numeric_borders(border_count: int) -> int:
+        pools = quantized_pools.build_quantized_pools(
+            FrameSource(frame, 128),
+            CFG,
+            {
+                "train": frame.index[:400],
+                "validation": frame.index[400:500],
+                "test": frame.index[500:],
+            },
+            tmp_path,
+            "k",
+            border_count=border_count,
+        )
+        saved = tmp_path / f"borders-{border_count}.tsv"
+        pools.fit_pools()[0].save_quantization_borders(str(saved))
+        rows = pd.read_csv(saved, sep="\t", header=None)
+        return int(rows[0].value_counts().max())
+
+    assert numeric_borders(8) <= 8
+    assert numeric_borders(64) > 8
@@ -0,0 +1,89 @@
+import asyncio
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from london_housing_ai import score
+from london_housing_ai.serve_transformer import ServingTransformer
+
+ARTIFACTS = Path(__file__).resolve().parents[1] / "artifacts"
+LOOKUP_FILE = ARTIFACTS / "lookup_tables.json"
+
+
+@pytest.fixture()
+def model_path(tmp_path: Path) -> str:
+    import mlflow.catboost as mlflow_catboost
+
+    path = tmp_path / "model.cbm"
+    mlflow_catboost.load_model(str(ARTIFACTS / "model")).save_model(str(path))
+    return str(path)
+
+
+def test_transform_batch_matches_single_row_transform() -> None:
+    transformer = ServingTransformer(str(LOOKUP_FILE))
+    requests = [
+        {
+            "district": district,
+            "property_type": property_type,
+            "is_new_build": "Y",
+            "is_leasehold": "N",
+        }
+        for district in transformer.districts[:3] + ["Atlantis"]
+        for property_type in ["D", "F"]
+    ]
+
+    expected = pd.concat(
+        [transformer.transform(r) for r in requests], ignore_index=True
+    )
+    batch = transformer.transform_batch(pd.DataFrame(requests))
+
+    pd.testing.assert_frame_equal(batch, expected)
+
+
+def test_score_file_streams_chunks_in_order(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, model_path: str
+) -> None:
+    districts = ServingTransformer(str(LOOKUP_FILE)).districts
+    geocoded = []
+
+    async def fake_geocoder(df, postcode_col, district_col):
+        geocoded.append(sorted(df[postcode_col]))
+        df = df.loc[~df[postcode_col].str.startswith("ZZ")].copy()
+        df[district_col] = [districts[int(pc[1:])] for pc in df[postcode_col]]
+        return df
+
+    monkeypatch.setattr(score, "get_district_from_postcode", fake_geocoder)
+    properties = pd.DataFrame(
+        {
+            "id": [f"p{i}" for i in range(7)],
+            "postcode": ["a1", "A2", "ZZ9", "a1", "A3", "a4", "a2"],
+            "property_type": ["F", "d", "T", "S", "F", "T", "D"],
+        }
+    )
+    input_path = tmp_path / "properties.csv"
+    properties.to_csv(input_path, index=False)
+    output_path = tmp_path / "scored.parquet"
+
+    summary = asyncio.run(
+        score.score_file(
+            input_path, output_path, model_path, str(LOOKUP_FILE), chunk_size=3
+        )
+    )
+
+    scored = pd.read_parquet(output_path)
+    assert summary["rows"] == 7 and summary["unresolved"] == 1
+    assert scored["id"].tolist() == properties["id"].tolist()
+    assert pd.isna(scored.loc[2, "predicted_price"])
+    assert pd.isna(scored.loc[2, "district"])
+    # Postcodes already resolved in an earlier chunk are not looked up again.
+    assert geocoded == [["A1", "A2", "ZZ9"], ["A3", "A4"]]
+
+    score._init_worker(model_path, str(LOOKUP_FILE), True, 1)
+    single = score._score_chunk(
+        pd.DataFrame(
+            [{"district": districts[2], "property_type": "D", "is_new_build": "N"}]
+        )
+    )
+    np.testing.assert_allclose(scored.loc[6, "predicted_price"], single[0])
@@ -0,0 +1,141 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from catboost import CatBoostRegressor
+
+from london_housing_ai.serve_transformer import ServingTransformer
+from london_housing_ai.serving_bundle import (
+    MANIFEST_FILE,
+    MODEL_FILE,
+    ServingBundle,
+    write_bundle,
+)
+
+LOOKUP_TABLES = {
+    "borough_price_trend": {"Camden": 750000.0, "Hackney": 540000.0},
+    "district_yearly_medians": {"Camden_2024": 740000.0, "Hackney_2024": 530000.0},
+    "avg_price_last_half": {"Camden": 760000.0, "Hackney": 545000.0},
+}
+
+
+@pytest.fixture()
+def lookup_path(tmp_path: Path) -> Path:
+    path = tmp_path / "lookup_tables.json"
+    path.write_text(json.dumps(LOOKUP_TABLES))
+    return path
+
+
+@pytest.fixture()
+def trained_model(lookup_path: Path) -> CatBoostRegressor:
+    transformer = ServingTransformer(str(lookup_path))
+    rows = [
+        transformer.transform(
+            {
+                "district": district,
+                "property_type": property_type,
+                "is_new_build": new_build,
+                "is_leasehold": leasehold,
+            }
+        )
+        for district in ("Camden", "Hackney")
+        for property_type in ("D", "S", "T", "F")
+        for new_build in ("Y", "N")
+        for leasehold in ("Y", "N")
+    ]
+    X = pd.concat(rows, ignore_index=True)
+    y = np.log1p(np.linspace(300_000, 900_000, len(X)))
+    model = CatBoostRegressor(iterations=20, depth=3, verbose=False)
+    model.fit(X, y, cat_features=list(range(8)))
+    return model
+
+
+def test_bundle_round_trip_preserves_predictions(
+    tmp_path: Path, trained_model: CatBoostRegressor, lookup_path: Path
+) -> None:
+    bundle_dir = write_bundle(
+        tmp_path / "bundle",
+        trained_model,
+        lookup_path,
+        run_id="run123",
+        params={"log_target": True, "depth": 3},
+    )
+    bundle = ServingBundle.load(bundle_dir)
+
+    assert bundle.run_id == "run123"
+    assert bundle.log_target is True
+    assert bundle.params["depth"] == "3"
+    assert bundle.feature_schema["columns"] == list(trained_model.feature_names_)
+    assert "district" in bundle.feature_schema["cat_features"]
+
+    features = bundle.load_transformer().transform(
+        {"district": "Camden", "property_type": "F"}
+    )
+    np.testing.assert_array_equal(
+        bundle.load_model().predict(features), trained_model.predict(features)
+    )
+
+
+def test_bundle_rejects_tampered_files(
+    tmp_path: Path, trained_model: CatBoostRegressor, lookup_path: Path
+) -> None:
+    bundle_dir = write_bundle(tmp_path / "bundle", trained_model, lookup_path, "r1")
+    with (bundle_dir / MODEL_FILE).open("ab") as f:
+        f.write(b"\0")
+
+    with pytest.raises(RuntimeError, match="mismatch"):
+        ServingBundle.load(bundle_dir)
+
+
+def test_bundle_rejects_unknown_format_version(
+    tmp_path: Path, trained_model: CatBoostRegressor, lookup_path: Path
+) -> None:
+    bundle_dir = write_bundle(tmp_path / "bundle", trained_model, lookup_path, "r1")
+    manifest = json.loads((bundle_dir / MANIFEST_FILE).read_text())
+    manifest["format_version"] = 999
+    (bundle_dir / MANIFEST_FILE).write_text(json.dumps(manifest))
+
+    with pytest.raises(RuntimeError, match="format_version"):
+        ServingBundle.load(bundle_dir)
+
+
+def test_bundle_serving_mode_never_imports_mlflow(
+    request: pytest.FixtureRequest,
+    tmp_path: Path,
+    trained_model: CatBoostRegressor,
+    lookup_path: Path,
+) -> None:
+    bundle_dir = write_bundle(tmp_path / "bundle", trained_model, lookup_path, "r1")
+    script = """
+import sys
+from london_housing_ai.api.app import create_app
+from london_housing_ai.api.services import mlflow_service
+from london_housing_ai.api.services.model_cache import get_or_load_model
+from london_housing_ai.api.services.transformer_cache import get_or_load_transformer
+
+create_app()
+run_id = mlflow_service.get_latest_finished_run_id()
+features = get_or_load_transformer(run_id).transform(
+    {"district": "Camden", "property_type": "F"}
+)
+get_or_load_model(run_id).predict(features)
+assert run_id == "r1", run_id
+assert mlflow_service.run_uses_log_target(run_id) is True
+assert "mlflow" not in sys.modules, "mlflow was imported"
+"""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = str(Path(request.config.rootpath) / "src")
+    env["SERVING_BUNDLE_DIR"] = str(bundle_dir)
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        capture_output=True,
+        text=True,
+        timeout=120,
+        env=env,
+    )
+    assert result.returncode == 0, result.stderr
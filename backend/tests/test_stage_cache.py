@@ -0,0 +1,121 @@
+import dataclasses
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from london_housing_ai import stage_cache
+from london_housing_ai.config_schemas.CleaningConfig import CleaningConfig
+from london_housing_ai.config_schemas.FeatureConfig import FeatureConfig
+from london_housing_ai.stage_cache import StageCache, pipeline_keys
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+CLEANING = CleaningConfig(
+    postcode_col="postcode",
+    loading_cols=["price", "date", "postcode"],
+    required_cols=["price", "date", "postcode"],
+    rename_cols={},
+    dtype_map={"price": "float", "date": "datetime", "postcode": "string"},
+    col_headers=["price", "date", "postcode"],
+)
+FEATURES = FeatureConfig(use_district=True)
+TRAIN_COLUMNS = ["district", "price"]
+
+
+def test_keys_only_change_downstream_of_the_edited_config() -> None:
+    base = pipeline_keys("raw", CLEANING, FEATURES, TRAIN_COLUMNS)
+    new_features = pipeline_keys(
+        "raw",
+        CLEANING,
+        dataclasses.replace(FEATURES, timestamp_col="sold_on"),
+        TRAIN_COLUMNS,
+    )
+    new_training = pipeline_keys(
+        "raw", CLEANING, FEATURES, ["district", "date", "price"]
+    )
+    augmented = pipeline_keys(
+        "raw", CLEANING, FEATURES, TRAIN_COLUMNS, augment=("cfg", "aug-sha")
+    )
+
+    assert base == pipeline_keys("raw", CLEANING, FEATURES, TRAIN_COLUMNS)
+    assert base["gold"] == base["features"]
+    # A feature-only setting keeps the (expensive) geocoding output.
+    assert new_features["geocode"] == base["geocode"]
+    assert new_features["features"] != base["features"]
+    assert new_training["gold"] == base["gold"]
+    assert new_training["train_frame"] != base["train_frame"]
+    assert augmented["gold"] == augmented["augment"] != base["gold"]
+    assert pipeline_keys("edited", CLEANING, FEATURES, TRAIN_COLUMNS)["clean"] != (
+        base["clean"]
+    )
+
+
+def test_code_changes_invalidate_the_stage(monkeypatch: pytest.MonkeyPatch) -> None:
+    before = pipeline_keys("raw", CLEANING, FEATURES, TRAIN_COLUMNS)
+
+    def extract_features(df, fe_cfg):
+        return df
+
+    monkeypatch.setitem(stage_cache.STAGE_CODE, "features", (extract_features,))
+    after = pipeline_keys("raw", CLEANING, FEATURES, TRAIN_COLUMNS)
+
+    assert after["geocode"] == before["geocode"]
+    assert after["features"] != before["features"]
+    assert after["train_frame"] != before["train_frame"]
+
+
+def test_get_or_compute_round_trips_frames(tmp_path: Path) -> None:
+    cache = StageCache(tmp_path)
+    df = pd.DataFrame(
+        {
+            "district": pd.Categorical(["Camden", None]),
+            "date": pd.to_datetime(["2020-01-01", "2021-06-30"]),
+            "price": [1.5, 2.5],
+        },
+        index=[7, 3],
+    )
+    calls = []
+
+    def compute() -> pd.DataFrame:
+        calls.append(1)
+        return df
+
+    cache.get_or_compute("features", "k1", compute)
+    cached = cache.get_or_compute("features", "k1", compute)
+
+    assert len(calls) == 1
+    pd.testing.assert_frame_equal(cached, df)
+    assert StageCache(tmp_path, enabled=False).load("features", "k1") is None
+
+
+def test_prune_and_cli(tmp_path: Path) -> None:
+    cache = StageCache(tmp_path)
+    frame = pd.DataFrame({"price": [1.0, 2.0, 3.0]})
+    for age, key in enumerate(["new", "mid", "old"]):
+        cache.save("clean", key, frame)
+        stamp = 1_700_000_000 - age * 86400
+        os.utime(cache.path("clean", key), (stamp, stamp))
+    cache.save("geocode", "g1", frame.head(1))
+
+    dry = cache.prune(stage="clean", keep_latest=1, dry_run=True)
+    assert sorted(e.key for e in dry) == ["mid", "old"]
+    assert len(cache.entries()) == 4
+
+    result = subprocess.run(
+        [sys.executable, "-m", "london_housing_ai.stage_cache", "list"],
+        env={**os.environ, "PYTHONPATH": str(SRC), "STAGE_CACHE_DIR": str(tmp_path)},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    listed = [
+        line for line in result.stdout.splitlines() if line.startswith('{"stage"')
+    ]
+    assert len(listed) == 4 and '"rows": 3' in listed[0]
+
+    pruned = cache.prune(keep_latest=1)
+    assert sorted(e.key for e in pruned) == ["mid", "old"]
+    assert [e.key for e in cache.entries()] == ["new", "g1"]
@@ -78,6 +78,7 @@ def test_train_main_e2e_local(request: pytest.FixtureRequest, caplog):
             csv=str(csv_file),
             aug=None,
             cleanup_local=False,
+            tune=False,
         )
         main(args)
 
@@ -0,0 +1,135 @@
+import itertools
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from catboost import CatBoostRegressor
+
+from london_housing_ai.serve_transformer import ServingTransformer
+from london_housing_ai.tree_compiler import compile_catboost_model
+
+DISTRICTS = ["Camden", "Hackney", "Islington", "Westminster", "Lambeth", "Bexley"]
+
+
+def _housing_frame(n_rows: int, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    district = rng.choice(DISTRICTS, n_rows)
+    property_type = rng.choice(["D", "S", "T", "F"], n_rows)
+    is_new_build = rng.choice(["Y", "N"], n_rows)
+    is_leasehold = rng.choice(["L", "F"], n_rows)
+    sold_year = rng.integers(1995, 2026, n_rows)
+    sold_month = rng.integers(1, 13, n_rows)
+    return pd.DataFrame(
+        {
+            "property_type": property_type,
+            "is_new_build": is_new_build,
+            "is_leasehold": is_leasehold,
+            "district": district,
+            "sold_month": sold_month,
+            "advanced_property_type": np.char.add(
+                np.char.add(is_new_build, "_"), property_type
+            ),
+            "property_type_and_tenure": np.char.add(
+                np.char.add(is_leasehold, "_"), property_type
+            ),
+            "property_type_and_district": np.char.add(
+                np.char.add(district, "_"), property_type
+            ),
+            "date": pd.to_datetime({"year": sold_year, "month": sold_month, "day": 1}),
+            "sold_year": sold_year,
+            "borough_price_trend": rng.normal(500_000, 150_000, n_rows),
+            "district_yearly_medians": rng.normal(450_000, 120_000, n_rows),
+            "avg_price_last_half": rng.normal(520_000, 100_000, n_rows),
+        }
+    )
+
+
+@pytest.fixture(scope="module")
+def training_frame() -> pd.DataFrame:
+    return _housing_frame(1500, seed=0)
+
+
+@pytest.fixture(scope="module")
+def fitted_model(training_frame: pd.DataFrame) -> CatBoostRegressor:
+    rng = np.random.default_rng(1)
+    y = np.log1p(
+        training_frame["borough_price_trend"].clip(lower=50_000)
+        * (1 + 0.1 * (training_frame["property_type"] == "D"))
+        * rng.uniform(0.8, 1.2, len(training_frame))
+    )
+    model = CatBoostRegressor(
+        iterations=80, depth=6, loss_function="MAE", random_seed=42, verbose=False
+    )
+    model.fit(training_frame, y, cat_features=list(range(8)))
+    return model
+
+
+def test_compiled_model_matches_catboost_bit_for_bit(
+    fitted_model: CatBoostRegressor, training_frame: pd.DataFrame
+) -> None:
+    compiled = compile_catboost_model(fitted_model, training_frame)
+    unseen_rows = _housing_frame(400, seed=7)
+
+    for frame in (training_frame, unseen_rows):
+        np.testing.assert_array_equal(
+            compiled.predict(frame), fitted_model.predict(frame)
+        )
+
+
+def test_compiled_model_single_rows_match_batch(
+    fitted_model: CatBoostRegressor, training_frame: pd.DataFrame
+) -> None:
+    compiled = compile_catboost_model(fitted_model, training_frame)
+    sample = training_frame.iloc[:25]
+
+    batch = compiled.predict(sample)
+    singles = [compiled.predict(sample.iloc[[i]])[0] for i in range(len(sample))]
+
+    np.testing.assert_array_equal(batch, np.array(singles))
+    np.testing.assert_array_equal(batch, fitted_model.predict(sample))
+
+
+def test_compiled_model_handles_unknown_categories(
+    fitted_model: CatBoostRegressor, training_frame: pd.DataFrame
+) -> None:
+    compiled = compile_catboost_model(fitted_model, training_frame)
+    row = training_frame.iloc[[0]].copy()
+    row["district"] = "Atlantis"
+    row["property_type_and_district"] = "Atlantis_F"
+
+    assert np.isfinite(compiled.predict(row)).all()
+
+
+def test_compiled_model_matches_shipped_model(request: pytest.FixtureRequest) -> None:
+    artifacts = Path(request.config.rootpath) / "artifacts"
+    model_path = artifacts / "model" / "model.cb"
+    lookup_path = artifacts / "lookup_tables.json"
+    if not model_path.exists() or not lookup_path.exists():
+        pytest.skip("shipped model artifacts are not available")
+
+    model = CatBoostRegressor()
+    model.load_model(str(model_path))
+    transformer = ServingTransformer(str(lookup_path))
+    districts = json.loads(lookup_path.read_text())["borough_price_trend"]
+    rows = pd.concat(
+        [
+            transformer.transform(
+                {
+                    "district": district,
+                    "property_type": property_type,
+                    "is_new_build": new_build,
+                    "is_leasehold": leasehold,
+                }
+            )
+            for district, property_type, new_build, leasehold in itertools.product(
+                districts, "DSTF", "YN", "YN"
+            )
+        ],
+        ignore_index=True,
+    )
+
+    compiled = compile_catboost_model(model, rows)
+
+    np.testing.assert_array_equal(compiled.predict(rows), model.predict(rows))
@@ -0,0 +1,114 @@
+import dataclasses
+from pathlib import Path
+
+import mlflow
+import numpy as np
+import pandas as pd
+import pytest
+from catboost import CatBoostRegressor
+from fastapi.testclient import TestClient
+from mlflow.tracking import MlflowClient
+
+from london_housing_ai import tuning
+from london_housing_ai.api.app import create_app
+from london_housing_ai.api.services import mlflow_service
+from london_housing_ai.config_schemas.TrainConfig import TrainConfig
+from london_housing_ai.config_schemas.TuneConfig import TuneConfig
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+CFG = TrainConfig(
+    cat_features=["district"],
+    numeric_features=["floor_area"],
+    label="price",
+    n_iter=60,
+)
+
+
+@pytest.fixture
+def frame() -> pd.DataFrame:
+    rng = np.random.default_rng(2)
+    n = 400
+    district = rng.choice(["SW1", "E14", "N1"], n)
+    floor_area = rng.uniform(30, 200, n)
+    return pd.DataFrame(
+        {
+            "district": district,
+            "floor_area": floor_area,
+            "price": floor_area * 5000 * np.where(district == "SW1", 3, 1),
+        }
+    )
+
+
+def test_stopped_trial_ends_boosting_cleanly(
+    frame: pd.DataFrame, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    reports = []
+
+    def report(metrics):
+        reports.append(metrics)
+        if len(reports) == 2:
+            raise SystemExit(0)  # what Tune does when the scheduler stops a trial
+
+    monkeypatch.setattr(tuning.tune, "report", report)
+    monkeypatch.setattr(tuning.mlflow, "log_metric", lambda *a, **k: None)
+    progress = tuning._ReportProgress(report_every=10, n_iter=100)
+    model = CatBoostRegressor(iterations=100, verbose=False, allow_writing_files=False)
+    model.fit(
+        frame[["district", "floor_area"]],
+        frame["price"],
+        cat_features=["district"],
+        eval_set=(frame[["district", "floor_area"]], frame["price"]),
+        callbacks=[progress],
+    )
+
+    assert progress.stopped
+    assert [r["iterations"] for r in reports] == [10, 20]
+    assert model.tree_count_ <= 20
+
+
+def test_trials_are_nested_under_the_tune_run(
+    frame: pd.DataFrame, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("RAY_RESULTS_DIR", str(tmp_path / "ray"))
+    # Ray workers import the trial function by module, as with PYTHONPATH in
+    # the image.
+    monkeypatch.setenv("PYTHONPATH", str(SRC))
+    tracking_uri = f"file://{tmp_path / 'mlruns'}"
+    mlflow.set_tracking_uri(tracking_uri)
+    experiment_id = mlflow.set_experiment("tuning").experiment_id
+    with mlflow.start_run(run_name="london_housing_run") as model_run:
+        pass
+    tune_cfg = TuneConfig(
+        num_samples=2, depth=[2, 3], cpus_per_trial=1, report_every=20, grace_period=20
+    )
+
+    best, run_id = tuning.tune_train_config(frame, CFG, tune_cfg)
+
+    assert best.depth in (2, 3)
+    assert dataclasses.replace(best, depth=CFG.depth, lr=CFG.lr) == (
+        dataclasses.replace(CFG, l2_leaf_reg=best.l2_leaf_reg)
+    )
+    runs = mlflow.search_runs([experiment_id], output_format="list")
+    trials = [r for r in runs if r.info.run_id not in (run_id, model_run.info.run_id)]
+    assert len(trials) == 2
+    assert {r.data.tags["mlflow.parentRunId"] for r in trials} == {run_id}
+    parent = next(r for r in runs if r.info.run_id == run_id)
+    assert parent.data.params["best_depth"] == str(best.depth)
+
+    # The search runs finished last, but serving still resolves the model run.
+    assert all(mlflow_service.is_tune_run(r) for r in [parent, *trials])
+    monkeypatch.delenv("SERVING_BUNDLE_DIR", raising=False)
+    monkeypatch.delenv("MLFLOW_RUN_ID", raising=False)
+    monkeypatch.setenv("MLFLOW_EXPERIMENT_NAME", "tuning")
+    monkeypatch.setattr(
+        mlflow_service, "get_client", lambda: MlflowClient(tracking_uri)
+    )
+    assert mlflow_service.get_latest_finished_run_id() == model_run.info.run_id
+
+    # /mlflow/runs, which the frontend compares models from, skips them too.
+    monkeypatch.setattr(mlflow_service, "_run_records", {})
+    monkeypatch.setattr(mlflow_service, "_run_keys", [])
+    monkeypatch.setattr(mlflow_service, "_runs_experiment_id", None)
+    monkeypatch.setattr(mlflow_service, "_runs_max_end_time", None)
+    resp = TestClient(create_app()).get("/mlflow/runs")
+    assert [r["info"]["run_id"] for r in resp.json()] == [model_run.info.run_id]
@@ -0,0 +1,121 @@
+import asyncio
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from london_housing_ai.api.app import create_app
+from london_housing_ai.api.services import mlflow_service, readiness, warmup
+
+
+@pytest.fixture(autouse=True)
+def fresh_readiness():
+    readiness.reset()
+    mlflow_service.reset_serving_run()
+    yield
+    readiness.reset()
+    mlflow_service.reset_serving_run()
+
+
+def test_warm_up_once_pretouches_inference_path(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    predicted = []
+
+    class DummyModel:
+        def predict(self, features):
+            predicted.append(features)
+            return np.array([0.0])
+
+    class DummyTransformer:
+        districts = ["Camden"]
+
+        def transform(self, user_input):
+            return pd.DataFrame([user_input])
+
+    monkeypatch.setattr(mlflow_service, "get_latest_finished_run_id", lambda: "run1")
+    monkeypatch.setattr(
+        mlflow_service, "run_uses_log_target", lambda run_id, default=True: True
+    )
+    monkeypatch.setattr(warmup, "get_or_load_model", lambda run_id: DummyModel())
+    monkeypatch.setattr(
+        warmup, "get_or_load_transformer", lambda run_id: DummyTransformer()
+    )
+
+    assert warmup.warm_up_once() == "run1"
+    assert predicted[0]["district"].tolist() == ["Camden"]
+
+
+def test_run_warmup_retries_with_backoff(monkeypatch: pytest.MonkeyPatch) -> None:
+    attempts = []
+    sleeps = []
+
+    def flaky_warm_up():
+        attempts.append(readiness.get_snapshot().status)
+        if len(attempts) < 3:
+            raise RuntimeError("mlflow unavailable")
+        readiness.mark_model_loaded("run1")
+        readiness.mark_transformer_loaded("run1")
+        return "run1"
+
+    async def fake_sleep(delay):
+        sleeps.append(delay)
+
+    monkeypatch.setattr(warmup, "warm_up_once", flaky_warm_up)
+    monkeypatch.setattr(warmup.asyncio, "sleep", fake_sleep)
+    monkeypatch.setenv("WARMUP_INITIAL_BACKOFF_SECONDS", "1")
+
+    asyncio.run(warmup.run_warmup())
+
+    assert attempts == ["warming", "warming", "warming"]
+    assert len(sleeps) == 2 and sleeps[1] > sleeps[0] / 2
+    assert readiness.get_snapshot().status == "ready"
+
+
+def test_run_warmup_gives_up_after_max_attempts(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    def failing_warm_up():
+        raise RuntimeError("mlflow unavailable")
+
+    monkeypatch.setattr(warmup, "warm_up_once", failing_warm_up)
+    monkeypatch.setenv("WARMUP_MAX_ATTEMPTS", "2")
+    monkeypatch.setenv("WARMUP_INITIAL_BACKOFF_SECONDS", "0")
+
+    asyncio.run(warmup.run_warmup())
+
+    snapshot = readiness.get_snapshot()
+    assert snapshot.status == "not_ready"
+    assert "attempt 2 failed" in (snapshot.detail or "")
+
+
+def test_requests_rejected_while_warming(monkeypatch: pytest.MonkeyPatch) -> None:
+    release = False
+
+    def slow_warm_up():
+        while not release:
+            time.sleep(0.01)
+        readiness.mark_model_loaded("run1")
+        readiness.mark_transformer_loaded("run1")
+        return "run1"
+
+    monkeypatch.setattr(warmup, "warm_up_once", slow_warm_up)
+
+    with TestClient(create_app()) as client:
+        assert client.get("/livez").status_code == 200
+        ready = client.get("/readyz")
+        assert ready.status_code == 503
+        assert ready.json()["status"] == "warming"
+
+        resp = client.post("/predict", json={"postcode": "N19GU", "property_type": "F"})
+        assert resp.status_code == 503
+        assert resp.headers["retry-after"] == "5"
+
+        release = True
+        for _ in range(200):
+            if client.get("/readyz").status_code == 200:
+                break
+            time.sleep(0.01)
+        assert client.get("/readyz").json()["status"] == "ready"